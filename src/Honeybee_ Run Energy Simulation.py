@@ -62,11 +62,11 @@ Provided by Honeybee 0.0.66
 """
 ghenv.Component.Name = "Honeybee_ Run Energy Simulation"
 ghenv.Component.NickName = 'runEnergySimulation'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
-#compatibleHBVersion = VER 0.0.63\nMAR_01_2018
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nJUL_24_2015
 ghenv.Component.AdditionalHelpFromDocStrings = "1"
 
@@ -1569,6 +1569,15 @@ class RunIDF(object):
         if not workingDir.EndsWith('\\'): workingDir = workingDir + '\\'
         
         fullPath = workingDir + shIdfFileName
+        
+        # copy the results of an identical simulation instead of running it again
+        hb_simulationCache = sc.sticky["honeybee_EPSimulationCache"]()
+        cacheKey = hb_simulationCache.key(fullPath + '.idf', epwFileAddress, EPDirectory)
+        if hb_simulationCache.restore(cacheKey, fullPath):
+            print "The results of an identical simulation are copied from the simulation cache."
+            print hb_simulationCache.report()
+            return
+        
         folderName = workingDir.replace( (workingDrive + '\\'), '')
         batchStr = workingDrive + '\ncd\\' +  folderName + '\n"' + EPDirectory + \
                 '\\Epl-run" ' + fullPath + ' ' + fullPath + ' idf ' + epwFileAddress + ' EP N nolimit N N 0 Y'
@@ -1583,6 +1592,9 @@ class RunIDF(object):
             self.runCmd(batchFileAddress)		
         else:		
             os.system(batchFileAddress)		
+        
+        hb_simulationCache.store(cacheKey, fullPath)
+        print hb_simulationCache.report()
     
     def runCmd(self, batchFileAddress, shellKey = True):
         batchFileAddress.replace("\\", "/")		
@@ -1590,6 +1602,77 @@ class RunIDF(object):
         out, err = p.communicate()
 
 
+class ZoneIDFCache(object):
+    """Keep the evaluated zones and their idf strings between runs of the same idf file.
+
+    Honeybee objects get a new ID every time they are added to the hive so a zone
+    hasn't changed as long as its Honeybee ID is the same. If the IDs of all the
+    zones and the settings that are used to evaluate them are the same as the last
+    run the evaluated zones are reused, and calling the zones from the hive and
+    evaluating them is skipped.
+
+    The geometry and load strings of each zone are kept with the Honeybee ID of the
+    zone and the names that evaluateZones can change to avoid duplicates, so zones
+    that haven't changed are not written again even if other zones have changed.
+    Zones that are not part of the current run are dropped from the cache.
+    """
+
+    def __init__(self, idfFileFullName, HBIDs, meshSettings, epVerNum):
+        caches = sc.sticky.setdefault("honeybee_IDFZoneCache", {})
+        previous = caches.get(idfFileFullName.upper())
+        
+        self.HBIDs = HBIDs
+        self.meshSettings = meshSettings
+        # tolerance is part of the key since checkCoordinates uses it to remove vertices
+        self.settings = (epVerNum, sc.doc.ModelAbsoluteTolerance, sc.sticky["honeybee_ConversionFactor"])
+        self.evaluatedZones = None
+        self.previousZoneStrs = {}
+        self.zoneStrs = {}
+        self.zoneKeys = {}
+        self.reusedCount = {}
+        
+        if previous != None and previous.settings == self.settings and \
+            previous.meshSettings is meshSettings:
+            self.previousZoneStrs = previous.zoneStrs
+            if previous.HBIDs == HBIDs:
+                self.evaluatedZones = previous.evaluatedZones
+        
+        caches[idfFileFullName.upper()] = self
+
+    @staticmethod
+    def namesKey(zone):
+        names = [zone.name]
+        for srf in zone.surfaces:
+            names.append((srf.name, srf.BCObject.name))
+            if srf.hasChild:
+                for childSrf in srf.childSrfs:
+                    names.append((childSrf.name, childSrf.BCObject.name))
+        
+        return tuple(names)
+
+    def setZones(self, evaluatedZones):
+        self.evaluatedZones = evaluatedZones
+        for HBID, zone in zip(self.HBIDs, evaluatedZones):
+            self.zoneKeys[zone.name] = (HBID, self.namesKey(zone))
+
+    def getZoneStr(self, zone, section):
+        key = self.zoneKeys[zone.name]
+        try: zoneStr = self.previousZoneStrs[key][section]
+        except KeyError: return None
+        
+        self.zoneStrs.setdefault(key, {})[section] = zoneStr
+        self.reusedCount[section] = self.reusedCount.get(section, 0) + 1
+        return zoneStr
+
+    def addZoneStr(self, zone, section, zoneStr):
+        self.zoneStrs.setdefault(self.zoneKeys[zone.name], {})[section] = zoneStr
+
+    def printReused(self, section):
+        if self.reusedCount.get(section, 0) > 0:
+            print "The " + section + " of " + `self.reusedCount[section]` + \
+                  " unchanged zones is reused from the last run."
+
+
 sc.sticky["honeybee_WriteIDF"] = WriteIDF
 sc.sticky["honeybee_RunIDF"] = RunIDF
 
@@ -1704,13 +1787,29 @@ def main(north, epwFileAddress, EPParameters, analysisPeriod, HBZones, HBContext
     hb_writeIDF = sc.sticky["honeybee_WriteIDF"](workingDir)
     hb_runIDF = sc.sticky["honeybee_RunIDF"]()
     
-    # call the objects from the lib
-    thermalZonesPyClasses = hb_hive.callFromHoneybeeHive(HBZones)
+    idfFileFullName = workingDir + "\\" + idfFileName
     
-    reEvaluate = hb_reEvaluateHBZones(thermalZonesPyClasses, meshSettings)
-    reEvaluate.evaluateZones()
+    try:
+        epVerNum = int(''.join(s for s in sc.sticky["honeybee_folders"]["EPVersion"] if s.isdigit()))
+    except:
+        epVerNum = 0
+    
+    # zones that haven't changed since the last run are copied from the cache
+    zoneIDFCache = ZoneIDFCache(idfFileFullName, [hb_hive.getHBID(HBZone) for HBZone in HBZones],
+                                meshSettings, epVerNum)
+    
+    if zoneIDFCache.evaluatedZones != None:
+        print "Zones haven't changed since the last run. Evaluated zones are reused."
+        thermalZonesPyClasses = zoneIDFCache.evaluatedZones
+    else:
+        # call the objects from the lib
+        thermalZonesPyClasses = hb_hive.callFromHoneybeeHive(HBZones)
+        
+        reEvaluate = hb_reEvaluateHBZones(thermalZonesPyClasses, meshSettings)
+        reEvaluate.evaluateZones()
+    
+    zoneIDFCache.setZones(thermalZonesPyClasses)
     
-    idfFileFullName = workingDir + "\\" + idfFileName
     idfFile = open(idfFileFullName, "w")
     
     ################## HEADER ###################
@@ -1860,16 +1959,9 @@ def main(north, epwFileAddress, EPParameters, analysisPeriod, HBZones, HBContext
     #################  BODY #####################
     print "[3 of 8] Writing geometry..."
     ZoneCollectionBasedOnSchAndLoads = {} # This will be used to create zoneLists
-    try:
-        epVerNum = int(''.join(s for s in sc.sticky["honeybee_folders"]["EPVersion"] if s.isdigit()))
-    except:
-        epVerNum = 0
     
     # write idf file
     for zone in thermalZonesPyClasses:
-        # Zone
-        idfFile.write(hb_writeIDF.EPZone(zone))
-        
         # get the schedule and loads for the zone
         schedules = zone.getCurrentSchedules(True)
         loads = zone.getCurrentLoads(True)
@@ -1900,9 +1992,6 @@ def main(north, epwFileAddress, EPParameters, analysisPeriod, HBZones, HBContext
             if not srf.construction.upper() in EPConstructionsCollection:
                 EPConstructionsCollection.append(srf.construction.upper())
             
-            # Surfaces
-            idfFile.write(hb_writeIDF.EPZoneSurface(srf))
-            
             if srf.hasChild:
                 # check the construction
                 # this should be moved inside the function later
@@ -1952,19 +2041,32 @@ def main(north, epwFileAddress, EPParameters, analysisPeriod, HBZones, HBContext
                                         
                                         shdCntrlCollection.append(windowShading)
                                 except: pass
-                
-                # write the glazing strings
-                idfFile.write(hb_writeIDF.EPFenSurface(srf))
         
-        #If there are internal masses assigned to the zone, write them into the IDF.
+        #If there are internal masses assigned to the zone, add their constructions.
         if len(zone.internalMassNames) > 0:
             for massCount, massName in enumerate(zone.internalMassNames):
                 #Write the internal mass construction into the IDF if it is not there yet.
                 if not zone.internalMassConstructions[massCount].upper() in EPConstructionsCollection:
                     EPConstructionsCollection.append(zone.internalMassConstructions[massCount].upper())
-                
-                #Write the internal mass into the IDF
-                idfFile.write(hb_writeIDF.EPInternalMass(zone, massName, zone.internalMassSrfAreas[massCount], zone.internalMassConstructions[massCount]))
+        
+        # Zone, surfaces, glazing and internal masses
+        zoneStr = zoneIDFCache.getZoneStr(zone, "geometry")
+        if zoneStr == None:
+            zoneStrList = [hb_writeIDF.EPZone(zone)]
+            for srf in zone.surfaces:
+                zoneStrList.append(hb_writeIDF.EPZoneSurface(srf))
+                if srf.hasChild:
+                    zoneStrList.append(hb_writeIDF.EPFenSurface(srf))
+            
+            for massCount, massName in enumerate(zone.internalMassNames):
+                zoneStrList.append(hb_writeIDF.EPInternalMass(zone, massName, zone.internalMassSrfAreas[massCount], zone.internalMassConstructions[massCount]))
+            
+            zoneStr = "".join(zoneStrList)
+            zoneIDFCache.addZoneStr(zone, "geometry", zoneStr)
+        
+        idfFile.write(zoneStr)
+    
+    zoneIDFCache.printReused("geometry")
     
     ########### Generators - Electric load center ###########
     
@@ -2323,51 +2425,62 @@ def main(north, epwFileAddress, EPParameters, analysisPeriod, HBZones, HBContext
                 ghenv.Component.AddRuntimeMessage(w, warning)
                 print warning
             
-            #   HAVC System
-            if listName!=None:
-                HAVCTemplateName = listName + "_HVAC"
-                for zone in zones:
-                    idfFile.write(hb_writeIDF.EPIdealAirSystem(zone, HAVCTemplateName))
-            else:
-                HAVCTemplateName = zone.name + "_HVAC"
-                idfFile.write(hb_writeIDF.EPIdealAirSystem(zone, HAVCTemplateName))
+            # loads of zones that haven't changed since the last run are copied from the cache
+            loadsStr = zoneIDFCache.getZoneStr(zone, "loads")
+            if loadsStr == None:
+                loadsStrList = []
+                #   HAVC System
+                if listName!=None:
+                    HAVCTemplateName = listName + "_HVAC"
+                    for zone in zones:
+                        loadsStrList.append(hb_writeIDF.EPIdealAirSystem(zone, HAVCTemplateName))
+                else:
+                    HAVCTemplateName = zone.name + "_HVAC"
+                    loadsStrList.append(hb_writeIDF.EPIdealAirSystem(zone, HAVCTemplateName))
             
-            #Thermostat
-            idfFile.write(hb_writeIDF.EPHVACTemplate(HAVCTemplateName, zone))
+                #Thermostat
+                loadsStrList.append(hb_writeIDF.EPHVACTemplate(HAVCTemplateName, zone))
             
-            #Outdoor Air Controller.
-            idfFile.write(hb_writeIDF.EPOutdoorAir(zone))
+                #Outdoor Air Controller.
+                loadsStrList.append(hb_writeIDF.EPOutdoorAir(zone))
             
-            #   LOADS - INTERNAL LOADS + PLUG LOADS
-            if zone.equipmentSchedule != None:
-                idfFile.write(hb_writeIDF.EPZoneElectricEquipment(zone, listName))
+                #   LOADS - INTERNAL LOADS + PLUG LOADS
+                if zone.equipmentSchedule != None:
+                    loadsStrList.append(hb_writeIDF.EPZoneElectricEquipment(zone, listName))
             
-            #   PEOPLE
-            if zone.occupancySchedule != None:
-                idfFile.write(hb_writeIDF.EPZonePeople(zone, listName))
+                #   PEOPLE
+                if zone.occupancySchedule != None:
+                    loadsStrList.append(hb_writeIDF.EPZonePeople(zone, listName))
             
-            #   LIGHTs
-            idfFile.write(hb_writeIDF.EPZoneLights(zone, listName))
+                #   LIGHTs
+                loadsStrList.append(hb_writeIDF.EPZoneLights(zone, listName))
             
-            #   INFILTRATION
-            idfFile.write(hb_writeIDF.EPZoneInfiltration(zone, listName))
+                #   INFILTRATION
+                loadsStrList.append(hb_writeIDF.EPZoneInfiltration(zone, listName))
             
-            #   AIR MIXING
-            if zone.mixAir == True:
-                for mixZoneCount, zoneMixName in enumerate(zone.mixAirZoneList):
-                    idfFile.write(hb_writeIDF.EPZoneAirMixing(zone, zoneMixName, zone.mixAirFlowList[mixZoneCount], mixZoneCount))
+                #   AIR MIXING
+                if zone.mixAir == True:
+                    for mixZoneCount, zoneMixName in enumerate(zone.mixAirZoneList):
+                        loadsStrList.append(hb_writeIDF.EPZoneAirMixing(zone, zoneMixName, zone.mixAirFlowList[mixZoneCount], mixZoneCount))
             
-            # EARTH TUBE
-            if zone.earthtube == True:
-                idfFile.write(hb_writeIDF.EarthTube(zone))
+                # EARTH TUBE
+                if zone.earthtube == True:
+                    loadsStrList.append(hb_writeIDF.EarthTube(zone))
             
-            #   SIMPLE NATURAL VENTILATION
-            if zone.natVent == True:
-                for natVentCount, natVentObj in enumerate(zone.natVentType):
-                    if natVentObj == 1 or natVentObj == 2:
-                        idfFile.write(hb_writeIDF.EPNatVentSimple(zone, natVentCount))
-                    elif natVentObj == 3:
-                        idfFile.write(hb_writeIDF.EPNatVentFan(zone, natVentCount))
+                #   SIMPLE NATURAL VENTILATION
+                if zone.natVent == True:
+                    for natVentCount, natVentObj in enumerate(zone.natVentType):
+                        if natVentObj == 1 or natVentObj == 2:
+                            loadsStrList.append(hb_writeIDF.EPNatVentSimple(zone, natVentCount))
+                        elif natVentObj == 3:
+                            loadsStrList.append(hb_writeIDF.EPNatVentFan(zone, natVentCount))
+                
+                loadsStr = "".join(loadsStrList)
+                zoneIDFCache.addZoneStr(zone, "loads", loadsStr)
+            
+            idfFile.write(loadsStr)
+    
+    zoneIDFCache.printReused("loads")
     
     #Write any additional strings.
     if additionalStrings_ != []:
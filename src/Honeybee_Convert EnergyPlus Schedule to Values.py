@@ -50,11 +50,11 @@ Provided by Ladybug 0.0.57
 
 ghenv.Component.Name = "Honeybee_Convert EnergyPlus Schedule to Values"
 ghenv.Component.NickName = 'convertEPSCHValues'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "07 | Energy | Schedule"
-#compatibleHBVersion = VER 0.0.56\nFEB_01_2015
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nFEB_01_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "1"
 except: pass
@@ -315,7 +315,7 @@ def main(schName, startDayOfTheWeek, epwFile, customHol):
             return -1
         else:
             dataGotten = True
-            values = readSchedules.getScheduleValues()
+            values = readSchedules.compileSchedule()
     
     if dataGotten == True:
         # Check for any holidays.
@@ -35,6 +35,7 @@ Provided by Honeybee 0.0.66
         _HBObjects: A list of Honeybee objects
         _fileName: A name for the file to which HBObjects will be written (e.g. 20ZonesExample.HB).
         _workingDir_: An optional working directory into which the HBZones will be written.  The default is set to C:\ladybug.
+        chunked_: Set to True to write each object in its own chunk with a table of contents at the start of the file. Load Honeybee Objects can then load only some of the zones from the file instead of the whole model. Files that are written this way can't be loaded by Honeybee versions older than VER 0.0.66 OCT_18_2026. Default is False.
         _dump: Set to True to save the objects to file
     Returns:
         readMe!: ...
@@ -43,7 +44,7 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Dump Honeybee Objects"
 ghenv.Component.NickName = 'dumpHBObjects'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "00 | Honeybee"
@@ -60,7 +61,7 @@ import os
 import uuid
 import Rhino as rc
 
-def dumpHBObjects(HBObjects, fileName, workingDir=None):
+def dumpHBObjects(HBObjects, fileName, workingDir=None, chunked=False):
     hb_hive = sc.sticky["honeybee_Hive"]()
     hb_RADMaterialAUX = sc.sticky["honeybee_RADMaterialAUX"]
     hb_ConstrLib = sc.sticky ["honeybee_constructionLib"]
@@ -371,10 +372,16 @@ def dumpHBObjects(HBObjects, fileName, workingDir=None):
         assert id in keys,\
             " InputError: Adjacent object %s is not in the list of HBObjects."%name
     
-    HBData = {'ids':ids, 'objs': objs}
-    with open(filePath, "wb") as outf:
-        pickle.dump(HBData, outf)
+    if chunked:
+        # write each object in its own chunk so the objects can be loaded partially.
+        hb_HBObjectFile = sc.sticky["honeybee_HBObjectFile"]
+        hb_HBObjectFile(filePath).write(ids, objs)
         print "Saved file to %s"%filePath
+    else:
+        HBData = {'ids':ids, 'objs': objs}
+        with open(filePath, "wb") as outf:
+            pickle.dump(HBData, outf)
+            print "Saved file to %s"%filePath
     return filePath
 
 
@@ -396,8 +403,16 @@ else:
         "If you have already updated userObjects drag Honeybee_Honeybee component " + \
         "into canvas and try again."
         ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
+    
+    if initCheck and chunked_ and not sc.sticky.has_key('honeybee_HBObjectFile'):
+        initCheck = False
+        warning = "You need a newer version of Honeybee to write chunked files. " + \
+        "Use updateHoneybee component to update userObjects.\n" + \
+        "If you have already updated userObjects drag Honeybee_Honeybee component " + \
+        "into canvas and try again."
+        ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
 
 
 
 if initCheck == True and _dump == True and _fileName != None:
-    filePath = dumpHBObjects(_HBObjects, _fileName, _workingDir_)
\ No newline at end of file
+    filePath = dumpHBObjects(_HBObjects, _fileName, _workingDir_, chunked_ == True)
\ No newline at end of file
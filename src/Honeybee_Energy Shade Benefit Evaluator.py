@@ -70,18 +70,18 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Energy Shade Benefit Evaluator"
 ghenv.Component.NickName = 'EnergyShadeBenefit'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
-#compatibleHBVersion = VER 0.0.56\nDEC_15_2017
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nNOV_20_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "5"
 except: pass
 
 import rhinoscriptsyntax as rs
 import Rhino as rc
-import collections
+import array
 import System.Threading.Tasks as tasks
 import System
 import scriptcontext as sc
@@ -505,11 +505,9 @@ def checkSkyResolution(skyResolution, allDataDict, analysisPeriod, latitude, lon
             finalPatchHOYs.append([])
         
         
-        for vecCount, vector in enumerate(sunVectors):
-            ray = rc.Geometry.Ray3d(rc.Geometry.Point3d.Origin, vector)
-            for patchCount, patch in enumerate(skyPatchMeshes):
-                if rc.Geometry.Intersect.Intersection.MeshRay(patch, ray) >= 0:
-                    finalPatchHOYs[patchCount].append(vecCount)
+        for vecCount, patchCount in enumerate(hb_sunOcclusion.skyPatchIndices(skyPatchMeshes, sunVectors)):
+            if patchCount != None:
+                finalPatchHOYs[patchCount].append(vecCount)
         
         vecCount = -1
         for patchCount, hourList in enumerate(finalPatchHOYs):
@@ -539,67 +537,92 @@ def checkSkyResolution(skyResolution, allDataDict, analysisPeriod, latitude, lon
 
 def nonparallel_projection(analysisMesh, sunLines, windowTestPts):
     #Intersect the sun lines with the test mesh
-    faceInt = []
-    for face in range(analysisMesh.Faces.Count): faceInt.append([])
+    numOfHours = len(sunLines[0]) if sunLines else 0
+    hits = array.array('i')
     
     for ptCount, pt in enumerate(windowTestPts):
         try:
             for hour, sunLine in enumerate(sunLines[ptCount]):
                 if sunLine != 0:
                     intPt, i = rc.Geometry.Intersect.Intersection.MeshLine(analysisMesh, sunLine)
-                    if len(intPt)!=0: faceInt[i[0]].append(hour)
+                    if len(intPt)!=0: hits.append(i[0] * numOfHours + hour)
                 else: pass
         except Exception, e:
             print `e`
     
-    return faceInt
+    return hitMatrix([hits], analysisMesh.Faces.Count, numOfHours)
 
 
 def parallel_projection(analysisMesh, sunLines, windowTestPts):
     #Intersect the sun lines with the test mesh using parallel processing
-    faceInt = []
-    for face in range(analysisMesh.Faces.Count): faceInt.append([]) #place holder for result
-    
-    def intersect(i):
-        try:
-            for hour, sunLine in enumerate(sunLines[i]):
-                if sunLine != 0:
-                    intPt, indx = rc.Geometry.Intersect.Intersection.MeshLine(analysisMesh, sunLine)
-                    if len(intPt)!=0: faceInt[indx[0]].append(hour)
-                else: pass
-        except Exception, e:
-            print `e`
-    
-    tasks.Parallel.ForEach(range(len(windowTestPts)), intersect)
-    
-    return faceInt
-
-
-def valCalc(percentBlocked, ECool, EBeam, cellArea, extraDivisor):
-    #Multiply the Energy by the Percentage Blocked by the Shade
-    ECoolPercent = [a*b for a,b in zip(ECool,percentBlocked)]
-    EBeamPercent = [a*b for a,b in zip(EBeam,percentBlocked)]
-    
-    #Calculate the Thermal Effect of the Shade
-    NegBeam = []
-    for item in EBeamPercent:
-        NegBeam.append(item*(-1))
-    
-    BeamEffectCool = [item1 for item1, item2 in zip(EBeamPercent , ECoolPercent) if item1 < item2]
-    DeltaCool1 = sum(BeamEffectCool)
-    
-    BeamEffectHeat = [item1 for item1, item2 in zip(NegBeam , ECoolPercent) if item1 > item2]
-    DeltaHeat1 = sum(BeamEffectHeat)
-    
-    BeamEffectMid = [item1 for item1, item2, item3 in zip(ECoolPercent , EBeamPercent , NegBeam) if item1 < item2 and item1 > item3]
-    DeltaMidCoolList = []
-    DeltaMidHeatList = []
-    for item in BeamEffectMid:
-        if item > 0: DeltaMidCoolList.append(item)
-        else: DeltaMidHeatList.append(item)
-    
-    DeltaMidCool = sum(DeltaMidCoolList)
-    DeltaMidHeat = sum(DeltaMidHeatList)
+    #Each chunk of test points collects its hits in its own buffer so the threads never share a list.
+    numOfHours = len(sunLines[0]) if sunLines else 0
+    numOfChunks = max(1, min(len(windowTestPts), System.Environment.ProcessorCount * 4))
+    hitBuffers = [None] * numOfChunks #place holder for result
+    
+    def intersect(chunkCount):
+        hits = array.array('i')
+        for i in range(chunkCount, len(windowTestPts), numOfChunks):
+            try:
+                for hour, sunLine in enumerate(sunLines[i]):
+                    if sunLine != 0:
+                        intPt, indx = rc.Geometry.Intersect.Intersection.MeshLine(analysisMesh, sunLine)
+                        if len(intPt)!=0: hits.append(indx[0] * numOfHours + hour)
+                    else: pass
+            except Exception, e:
+                print `e`
+        hitBuffers[chunkCount] = hits
+    
+    tasks.Parallel.ForEach(range(numOfChunks), intersect)
+    
+    return hitMatrix(hitBuffers, analysisMesh.Faces.Count, numOfHours)
+
+
+def hitMatrix(hitBuffers, numOfFaces, numOfHours):
+    #Merge the hits (face * numOfHours + hour) into a sparse face x hour matrix of hit counts.
+    #The hours and counts of face i are hours[faceStart[i]:faceStart[i+1]] and counts[faceStart[i]:faceStart[i+1]].
+    keys = array.array('i')
+    for hits in hitBuffers: keys.extend(hits)
+    keys = sorted(keys)
+    
+    faceStart = array.array('i', [0]) * (numOfFaces + 1)
+    hours = array.array('i')
+    counts = array.array('i')
+    lastKey = -1
+    for key in keys:
+        if key == lastKey:
+            counts[-1] += 1
+        else:
+            face, hour = divmod(key, numOfHours)
+            hours.append(hour)
+            counts.append(1)
+            faceStart[face + 1] += 1
+            lastKey = key
+    
+    for face in range(numOfFaces): faceStart[face + 1] += faceStart[face]
+    
+    return faceStart, hours, counts
+
+
+def valCalc(hours, counts, testPtsCount, ECool, EBeam, cellArea, extraDivisor):
+    #Only the hours that the cell blocks the sun contribute to the effects of the shade.
+    DeltaCool1 = 0
+    DeltaHeat1 = 0
+    DeltaMidCool = 0
+    DeltaMidHeat = 0
+    for hour, count in zip(hours, counts):
+        #Multiply the Energy by the Percentage Blocked by the Shade
+        percentBlocked = count/testPtsCount
+        ECoolPercent = ECool[hour]*percentBlocked
+        EBeamPercent = EBeam[hour]*percentBlocked
+        NegBeam = EBeamPercent*(-1)
+        
+        #Calculate the Thermal Effect of the Shade
+        if EBeamPercent < ECoolPercent: DeltaCool1 += EBeamPercent
+        if NegBeam > ECoolPercent: DeltaHeat1 += NegBeam
+        if ECoolPercent < EBeamPercent and ECoolPercent > NegBeam:
+            if ECoolPercent > 0: DeltaMidCool += ECoolPercent
+            else: DeltaMidHeat += ECoolPercent
     
     deltaCooling = DeltaCool1 + DeltaMidCool
     deltaHeating = DeltaHeat1 + DeltaMidHeat
@@ -635,45 +658,31 @@ def evaluateShade(coolingLoad, heatingLoad, beamGain, analysisMesh, analysisArea
     
     #Generate the sun lines for intersection and discount the vector if it intersects a context.
     sunLines = []
+    contextMeshes = []
     if context_:
-        contextMeshes = []
         for brep in context_:
             contextMeshes.extend(rc.Geometry.Mesh.CreateFromBrep(brep, rc.Geometry.MeshingParameters.Default))
-        contextMesh = joinMesh(contextMeshes)
     else: pass
     
+    visibility = hb_sunOcclusion.visibility(windowTestPts, sunVectors, contextMeshes, parallel_ == True)
+    
     for pt in windowTestPts: sunLines.append([]) 
     
     for ptCount, pt in enumerate(windowTestPts):
-        for vec in sunVectors:
-            if context_:
-                if rc.Geometry.Intersect.Intersection.MeshRay(contextMesh, rc.Geometry.Ray3d(pt, vec)) < 0:
-                    sunLines[ptCount].append(rc.Geometry.Line(pt, lineLength * vec))
-                else: sunLines[ptCount].append(0)
-            else:
+        for vecCount, vec in enumerate(sunVectors):
+            if visibility.isVisible(ptCount, vecCount):
                 sunLines[ptCount].append(rc.Geometry.Line(pt, lineLength * vec))
+            else: sunLines[ptCount].append(0)
             
     
     #If parallel is true, then run the intersection through the parallel function.  If not, run it through the normal function.
+    #The result is the number of test points that each mesh face blocks for each hour of the year.
     if parallel_ == True:
-        faceInt = parallel_projection(analysisMesh, sunLines, windowTestPts)
+        faceStart, hours, counts = parallel_projection(analysisMesh, sunLines, windowTestPts)
     else:
-        faceInt = nonparallel_projection(analysisMesh, sunLines, windowTestPts)
-    
-    #Convert the Number Of Intersections for Each Mesh Face into a Percent of Sun Blocked by Each Mesh Face for Each Hour of the Year.
-    percentBlocked = []
-    for face in range(analysisMesh.Faces.Count):
-        percentBlocked.append(len(sunVectors) *[0])
+        faceStart, hours, counts = nonparallel_projection(analysisMesh, sunLines, windowTestPts)
     
     testPtsCount = len(windowTestPts) 
-    # for each mesh surface,
-    for faceCount, faceData in enumerate(faceInt):
-        # check the number of intersections for each hour
-        counter= collections.Counter(faceData)
-        
-        for hour in counter.keys():
-             # store the result in the new percentBlocked list
-             percentBlocked[faceCount][hour] = counter[hour]/testPtsCount
     
     #Calculate ECool and EBeam, which signify the cooling energy at stake and the solar energy at stake respectively.
     ECool = [a-b for a,b in zip(coolingLoad,heatingLoad)]
@@ -685,8 +694,10 @@ def evaluateShade(coolingLoad, heatingLoad, beamGain, analysisMesh, analysisArea
     shadeHelpfulness = []
     shadeHarmfulness = []
     shadeNetEffect = []
-    for cellCount, cell in enumerate(percentBlocked):
-        shadeHelp, shadeHarm, shadeNet = valCalc(cell, ECool, EBeam, analysisAreas[cellCount], extraDivisor)
+    for cellCount in range(analysisMesh.Faces.Count):
+        cellStart, cellEnd = faceStart[cellCount], faceStart[cellCount + 1]
+        shadeHelp, shadeHarm, shadeNet = valCalc(hours[cellStart:cellEnd], counts[cellStart:cellEnd], \
+                                                 testPtsCount, ECool, EBeam, analysisAreas[cellCount], extraDivisor)
         shadeHelpfulness.append(shadeHelp)
         shadeHarmfulness.append(shadeHarm)
         shadeNetEffect.append(shadeNet)
@@ -839,15 +850,16 @@ def main(allDataDict, sunVectors, skyResolution, legendPar, lb_preparation, lb_v
 
 #Import the classes, check the inputs, and generate default values for grid size if the user has given none.
 checkLB = True
-if sc.sticky.has_key('ladybug_release'):
+if sc.sticky.has_key('ladybug_release') and sc.sticky.has_key('honeybee_release'):
     lb_preparation = sc.sticky["ladybug_Preparation"]()
     lb_visualization = sc.sticky["ladybug_ResultVisualization"]()
     lb_sunpath = sc.sticky["ladybug_SunPath"]()
+    hb_sunOcclusion = sc.sticky["honeybee_SunOcclusion"]()
 else:
     checkLB = False
-    print "You should let the Ladybug fly first..."
+    print "You should let the Ladybug and Honeybee fly first..."
     w = gh.GH_RuntimeMessageLevel.Warning
-    ghenv.Component.AddRuntimeMessage(w, "You should let the Ladybug fly first...")
+    ghenv.Component.AddRuntimeMessage(w, "You should let the Ladybug and Honeybee fly first...")
 
 #Check the inputs.
 checkData = False
@@ -72,11 +72,11 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Export To OpenStudio"
 ghenv.Component.NickName = 'exportToOpenStudio'
-ghenv.Component.Message = 'VER 0.0.66\nAUG_11_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
-#compatibleHBVersion = VER 0.0.56\nMAY_18_2018
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nJUL_24_2015
 ghenv.Component.AdditionalHelpFromDocStrings = "1"
 
@@ -5254,6 +5254,16 @@ class RunOPS(object):
         if not workingDir.EndsWith('\\'): workingDir = workingDir + '\\'
         
         fullPath = workingDir + shIdfFileName
+        resultFiles = fullPath + "Zsz.csv",fullPath+".sql",fullPath+".csv", fullPath+".rdd", fullPath+".eio", fullPath+"Table.html"
+        
+        # copy the results of an identical simulation instead of running it again
+        hb_simulationCache = sc.sticky["honeybee_EPSimulationCache"]()
+        cacheKey = hb_simulationCache.key(fullPath + '.idf', epwFileAddress, EPDirectory)
+        if hb_simulationCache.restore(cacheKey, fullPath):
+            print "The results of an identical simulation are copied from the simulation cache."
+            print hb_simulationCache.report()
+            return resultFiles
+        
         folderName = workingDir.replace( (workingDrive + '\\'), '')
         batchStr = workingDrive + '\ncd\\' +  folderName + '\n"' + EPDirectory + \
                 'Epl-run" ' + fullPath + ' ' + fullPath + ' idf ' + epwFileAddress + ' EP N nolimit N N 0 Y'
@@ -5269,7 +5279,10 @@ class RunOPS(object):
         else:
             os.system(batchFileAddress)
         
-        return fullPath + "Zsz.csv",fullPath+".sql",fullPath+".csv", fullPath+".rdd", fullPath+".eio", fullPath+"Table.html"
+        hb_simulationCache.store(cacheKey, fullPath)
+        print hb_simulationCache.report()
+        
+        return resultFiles
     
     def runCmd(self, batchFileAddress, shellKey = True):
         batchFileAddress.replace("\\", "/")
@@ -40,11 +40,11 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Generate Zone Test Points"
 ghenv.Component.NickName = 'genHBZoneTestPts'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "03 | Daylight | Recipes"
-#compatibleHBVersion = VER 0.0.56\nFEB_01_2015
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nFEB_01_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "0"
 except: pass
@@ -150,7 +150,7 @@ def getHBZoneFloorSurfaces(HBZone):
     try:
         # call the objects from the lib
         hb_hive = sc.sticky["honeybee_Hive"]()
-        HBZone = hb_hive.callFromHoneybeeHive([HBZone])[0]
+        HBZone = hb_hive.callFromHoneybeeHive([HBZone], readOnly = True)[0]
 
         for HBS in HBZone.surfaces:
             if int(HBS.type) == 2:
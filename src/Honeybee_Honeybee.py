@@ -47,7 +47,7 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Honeybee"
 ghenv.Component.NickName = 'Honeybee'
-ghenv.Component.Message = 'VER 0.0.66\nAUG_05_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.icon
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "00 | Honeybee"
@@ -72,16 +72,23 @@ import System.Threading.Tasks as tasks
 import System
 import time
 import itertools
+import bisect
 import datetime
 import json
 import copy
 import urllib2 as urllib
 import cPickle as pickle
+import array
+import struct
 import subprocess
+import threading
+import Queue
 import uuid
 import re
 import random
 import zipfile
+import hashlib
+import tempfile
 
 try:
     System.Net.ServicePointManager.SecurityProtocol = System.Net.SecurityProtocolType.Tls12
@@ -422,13 +429,13 @@ class PrepareTemplateEPLibFiles(object):
     def __init__(self, downloadTemplate = False, workingDir = None):
         
         if not workingDir: workingDir = sc.sticky["Honeybee_DefaultFolder"]
-        if not sc.sticky.has_key("honeybee_constructionLib"): sc.sticky ["honeybee_constructionLib"] = {}
-        if not sc.sticky.has_key("honeybee_materialLib"): sc.sticky ["honeybee_materialLib"] = {}
-        if not sc.sticky.has_key("honeybee_windowMaterialLib"): sc.sticky ["honeybee_windowMaterialLib"] = {}
-        if not sc.sticky.has_key("honeybee_ScheduleLib"): sc.sticky["honeybee_ScheduleLib"] = {}
-        if not sc.sticky.has_key("honeybee_ScheduleTypeLimitsLib"): sc.sticky["honeybee_ScheduleTypeLimitsLib"] = {}
-        if not sc.sticky.has_key("honeybee_WindowPropLib"): sc.sticky["honeybee_WindowPropLib"] = {}
-        if not sc.sticky.has_key("honeybee_SpectralDataLib"): sc.sticky["honeybee_SpectralDataLib"] = {}
+        if not sc.sticky.has_key("honeybee_constructionLib"): sc.sticky ["honeybee_constructionLib"] = hb_EPLibraryDict()
+        if not sc.sticky.has_key("honeybee_materialLib"): sc.sticky ["honeybee_materialLib"] = hb_EPLibraryDict()
+        if not sc.sticky.has_key("honeybee_windowMaterialLib"): sc.sticky ["honeybee_windowMaterialLib"] = hb_EPLibraryDict()
+        if not sc.sticky.has_key("honeybee_ScheduleLib"): sc.sticky["honeybee_ScheduleLib"] = hb_EPLibraryDict()
+        if not sc.sticky.has_key("honeybee_ScheduleTypeLimitsLib"): sc.sticky["honeybee_ScheduleTypeLimitsLib"] = hb_EPLibraryDict()
+        if not sc.sticky.has_key("honeybee_WindowPropLib"): sc.sticky["honeybee_WindowPropLib"] = hb_EPLibraryDict()
+        if not sc.sticky.has_key("honeybee_SpectralDataLib"): sc.sticky["honeybee_SpectralDataLib"] = hb_EPLibraryDict()
         if not sc.sticky.has_key("honeybee_thermMaterialLib"): sc.sticky["honeybee_thermMaterialLib"] = {}
         
         self.downloadTemplate = downloadTemplate
@@ -441,13 +448,13 @@ class PrepareTemplateEPLibFiles(object):
         client.DownloadFile(url, localFilePath)
     
     def cleanHBLib(self):
-        sc.sticky ["honeybee_constructionLib"] = {}
-        sc.sticky ["honeybee_materialLib"] = {}
-        sc.sticky ["honeybee_windowMaterialLib"] = {}
-        sc.sticky["honeybee_ScheduleLib"] = {}
-        sc.sticky["honeybee_ScheduleTypeLimitsLib"] = {}
-        sc.sticky["honeybee_WindowPropLib"] = {}
-        sc.sticky["honeybee_SpectralDataLib"] = {}
+        sc.sticky ["honeybee_constructionLib"] = hb_EPLibraryDict()
+        sc.sticky ["honeybee_materialLib"] = hb_EPLibraryDict()
+        sc.sticky ["honeybee_windowMaterialLib"] = hb_EPLibraryDict()
+        sc.sticky["honeybee_ScheduleLib"] = hb_EPLibraryDict()
+        sc.sticky["honeybee_ScheduleTypeLimitsLib"] = hb_EPLibraryDict()
+        sc.sticky["honeybee_WindowPropLib"] = hb_EPLibraryDict()
+        sc.sticky["honeybee_SpectralDataLib"] = hb_EPLibraryDict()
     
     def cleanThermLib(self):
         sc.sticky["honeybee_thermMaterialLib"] = {}
@@ -570,18 +577,95 @@ class PrepareTemplateEPLibFiles(object):
         return libFilePaths
 
 
+class hb_EPLibraryDict(dict):
+    """
+    A dictionary of EnergyPlus library objects that are parsed on first access.
+    
+    Values can be references to the position of the object in a library file.
+    The fields of the object are only parsed when the value is requested and
+    the result replaces the reference. Keys are available without parsing.
+    """
+    
+    class EPObjectRef(object):
+        def __init__(self, filePath, offset, length):
+            self.filePath = filePath
+            self.offset = offset
+            self.length = length
+    
+    def materialize(self, key):
+        value = dict.__getitem__(self, key)
+        if not isinstance(value, self.EPObjectRef): return value
+        
+        EPLibs = HB_GetEPLibraries()
+        with open(value.filePath, 'rb') as inf:
+            inf.seek(value.offset)
+            parsed = EPLibs.parseEPObject(inf.read(value.length))
+        
+        if parsed == None or parsed[1] != key:
+            # the file has changed since it was indexed.
+            parsed = None
+            for EPObjectStr in EPLibs.getEnergyPlusObjectsFromFile(value.filePath):
+                result = EPLibs.parseEPObject(EPObjectStr, True)
+                if result != None and result[1] == key:
+                    parsed = EPLibs.parseEPObject(EPObjectStr)
+            if parsed == None:
+                raise KeyError("Failed to find %s in %s."%(key, value.filePath))
+        
+        dict.__setitem__(self, key, parsed[2])
+        return parsed[2]
+    
+    def __getitem__(self, key):
+        return self.materialize(key)
+    
+    def get(self, key, default = None):
+        if key in self: return self.materialize(key)
+        return default
+    
+    def pop(self, key, *default):
+        if key in self: self.materialize(key)
+        return dict.pop(self, key, *default)
+    
+    def values(self):
+        return [self.materialize(key) for key in self.keys()]
+    
+    def items(self):
+        return [(key, self.materialize(key)) for key in self.keys()]
+    
+    def itervalues(self):
+        for key in self.keys(): yield self.materialize(key)
+    
+    def iteritems(self):
+        for key in self.keys(): yield key, self.materialize(key)
+    
+    def update(self, other = None, **kwargs):
+        # keep the references unparsed when libraries are merged.
+        if isinstance(other, hb_EPLibraryDict):
+            for key in other.keys(): dict.__setitem__(self, key, dict.__getitem__(other, key))
+        elif other != None:
+            dict.update(self, other)
+        dict.update(self, kwargs)
+    
+    def copy(self):
+        newLib = hb_EPLibraryDict()
+        newLib.update(self)
+        return newLib
+    
+    def __reduce__(self):
+        return (dict, (self.items(),))
+
+
 class HB_GetEPLibraries:
     
     def __init__(self):
         self.libraries = {
-            "Material": {},
-            "WindowMaterial": {},
-            "Construction": {},
-            "Schedule" : {},
-            "ScheduleTypeLimits": {},
+            "Material": hb_EPLibraryDict(),
+            "WindowMaterial": hb_EPLibraryDict(),
+            "Construction": hb_EPLibraryDict(),
+            "Schedule" : hb_EPLibraryDict(),
+            "ScheduleTypeLimits": hb_EPLibraryDict(),
             "ThermMaterial": {},
-            "WindowProperty": {},
-            "MaterialProperty": {}
+            "WindowProperty": hb_EPLibraryDict(),
+            "MaterialProperty": hb_EPLibraryDict()
             }
     
     def getEPMaterials(self):
@@ -614,8 +698,7 @@ class HB_GetEPLibraries:
         
         if isMatFile == False:
             print "Loading EP materials, constructions, schedules and material properties from %s"%EPfile
-            EPObjects = self.getEnergyPlusObjectsFromFile(EPfile)
-            self.loadEPConstructionsMaterialsAndSchedules(EPObjects, cleanCurrentLib)
+            self.loadEPLibraryIndex(EPfile, cleanCurrentLib)
         else:
             print "Loading THERM materials from %s"%EPfile
             self.getThermObjectsFromFile(EPfile)
@@ -625,82 +708,167 @@ class HB_GetEPLibraries:
     
     def cleanHBLibs(self):
         self.libraries = {
-            "Material": {},
-            "WindowMaterial": {},
-            "Construction": {},
-            "Schedule" : {},
-            "ScheduleTypeLimits": {},
+            "Material": hb_EPLibraryDict(),
+            "WindowMaterial": hb_EPLibraryDict(),
+            "Construction": hb_EPLibraryDict(),
+            "Schedule" : hb_EPLibraryDict(),
+            "ScheduleTypeLimits": hb_EPLibraryDict(),
             "ThermMaterial": {},
-            "WindowProperty": {},
-            "MaterialProperty": {}
+            "WindowProperty": hb_EPLibraryDict(),
+            "MaterialProperty": hb_EPLibraryDict()
             }
             
     # TODO: Support parsing for files with no next line
     # TODO: Check if keys can be case insensitive
     # TODO: Create EPObjects and not dictionaries
+    def parseEPObject(self, EPObjectStr, headerOnly = False):
+        """Parse a single EnergyPlus object string.
+        
+        Returns:
+            (shortKey, name, fields) or None if the object doesn't belong to any
+            of the libraries. fields is None if headerOnly is True.
+        """
+        rawLines = EPObjectStr.replace("\r\n", "\n").strip().split("\n")
+        lines = []
+        for line in rawLines:
+            if line.strip() == '' or line.startswith('!'): continue
+            lines.append(line)
+        
+        if not lines:
+            return None
+        
+        if lines[0].startswith('MaterialProperty:GlazingSpectralData'):
+            key = 'MaterialProperty:GlazingSpectralData'
+            shortKey = 'MaterialProperty'
+            name = lines[1].split(",")[0].strip().upper()
+            if headerOnly: return shortKey, name, None
+            
+            fields = dict() # create an empty dictonary
+            fields[0] = key
+            # store the data into the dictionary
+            for lineCount, line in enumerate(lines):
+                objValue = line.split("!")[0].strip()
+                try: objDescription = line.split("!")[1].strip()
+                except:  objDescription = ""
+                if lineCount == 0:
+                    fields[lineCount] = objValue[:-1]
+                elif lineCount == 1:
+                    pass # name is already there as the key
+                elif objValue.endswith(","):
+                    fields[lineCount-1] = objValue[:-1], objDescription
+                elif objValue.endswith(";"):
+                    fields[lineCount-1] = objValue[:-1], objDescription
+            return shortKey, name, fields
+        
+        if len(lines) < 2: return None
+        
+        if lines[0].split(",")[0].strip().isupper():
+            key = lines[0].split(",")[0].strip().title()
+        else:
+            key = lines[0].split(",")[0].strip()
+        shortKey = key.split(":")[0]
+        if shortKey not in self.libraries: return None
+        
+        name = lines[1].split(",")[0].strip().upper()
+        values = lines[2:]
+        # it's a two line object such as Any Number scheduleTypeLimit
+        if values == []:
+            name = lines[1].split(";")[0].strip().upper() # name is the last input
+        if headerOnly: return shortKey, name, None
+        
+        fields = dict() # create an empty dictonary
+        fields[0] = key
+        
+        count = 1
+        delimiter = ","
+        for value in values:
+            if not len(value.strip()): continue #pass empty lines
+            if count==len(values): delimiter = ";"
+            v = value.split(delimiter)[0].strip() # find the  value
+            if value.find("!")!= -1:
+                c = value.split("!")[-1].rstrip() # find the  value
+            else:
+                c = ""
+            fields[count] = v, c
+            count += 1
+        return shortKey, name, fields
+    
     def loadEPConstructionsMaterialsAndSchedules(self, EPObjectsString, cleanCurrentLib = True):
         if cleanCurrentLib: self.cleanHBLibs()
         
         for EPObjectStr in EPObjectsString:
-            rawLines = EPObjectStr.strip().split("\n")
-            lines = []
-            for line in rawLines:
-                if line.strip() == '' or line.startswith('!'): continue
-                lines.append(line)
-            
-            if not lines:
-                continue
-            
-            if lines[0].startswith('MaterialProperty:GlazingSpectralData'):
-                key = 'MaterialProperty:GlazingSpectralData'
-                shortKey = 'MaterialProperty'
-                name = lines[1].split(",")[0].strip().upper()
-                self.libraries[shortKey][name] = dict() # create an empty dictonary
-                self.libraries[shortKey][name][0] = key
-                # store the data into the dictionary
-                for lineCount, line in enumerate(lines):
-                    objValue = line.split("!")[0].strip()
-                    try: objDescription = line.split("!")[1].strip()
-                    except:  objDescription = ""
-                    if lineCount == 0:
-                        self.libraries[shortKey][name][lineCount] = objValue[:-1]
-                    elif lineCount == 1:
-                        pass # name is already there as the key
-                    elif objValue.endswith(","):
-                        self.libraries[shortKey][name][lineCount-1] = objValue[:-1], objDescription
-                    elif objValue.endswith(";"):
-                        self.libraries[shortKey][name][lineCount-1] = objValue[:-1], objDescription
-            else:
-                if len(lines) < 2: continue
-                
-                if lines[0].split(",")[0].strip().isupper():
-                    key = lines[0].split(",")[0].strip().title()
-                else:
-                    key = lines[0].split(",")[0].strip()
-                shortKey = key.split(":")[0]
-                
-                name = lines[1].split(",")[0].strip().upper()
-                values = lines[2:]
-                # it's a two line object such as Any Number scheduleTypeLimit
-                if values == []:
-                    name = lines[1].split(";")[0].strip().upper() # name is the last input
-                    
-                if shortKey in self.libraries:
-                    self.libraries[shortKey][name] = dict() # create an empty dictonary
-                    self.libraries[shortKey][name][0] = key
-                    
-                    count = 1
-                    delimiter = ","
-                    for value in values:
-                        if not len(value.strip()): continue #pass empty lines
-                        if count==len(values): delimiter = ";"
-                        v = value.split(delimiter)[0].strip() # find the  value
-                        if value.find("!")!= -1:
-                            c = value.split("!")[-1].rstrip() # find the  value
-                        else:
-                            c = ""
-                        self.libraries[shortKey][name][count] = v, c
-                        count += 1
+            parsed = self.parseEPObject(EPObjectStr)
+            if parsed == None: continue
+            shortKey, name, fields = parsed
+            dict.__setitem__(self.libraries[shortKey], name, fields)
+    
+    def indexEPFile(self, epFilePath):
+        """Find the library objects in an EnergyPlus file without parsing their fields.
+        
+        Objects are split the same way as getEnergyPlusObjectsFromString.
+        
+        Returns:
+            A list of (shortKey, name, offset, length) with byte offsets in the file.
+        """
+        with open(epFilePath, 'rb') as epFile:
+            epFileString = epFile.read()
+        
+        index = []
+        start = 0
+        end = epFileString.find(";")
+        while end != -1:
+            # skip the line breaks between the objects
+            while start < end and epFileString[start] in "\r\n": start += 1
+            EPObjectStr = epFileString[start:end + 1]
+            parsed = self.parseEPObject(EPObjectStr, True)
+            if parsed != None:
+                index.append((parsed[0], parsed[1], start, end + 1 - start))
+            start = end + 1
+            end = epFileString.find(";", start)
+        return index
+    
+    def loadEPLibraryIndex(self, epFilePath, cleanCurrentLib = True):
+        """Add the objects of an EnergyPlus file to the libraries without parsing them.
+        
+        The index is saved next to the file (.hbidx) and is rebuilt when the file changes.
+        Fields of each object are parsed the first time that the object is used.
+        """
+        if cleanCurrentLib: self.cleanHBLibs()
+        
+        indexFilePath = epFilePath + ".hbidx"
+        fileTag, indexVersion = 'HBEP', 1
+        stamp = os.path.getsize(epFilePath), int(os.path.getmtime(epFilePath))
+        
+        index = None
+        if os.path.isfile(indexFilePath):
+            try:
+                with open(indexFilePath, 'rb') as inf:
+                    if inf.read(4) == fileTag:
+                        headerLength = struct.unpack('<I', inf.read(4))[0]
+                        header = pickle.loads(inf.read(headerLength))
+                        if header['version'] == indexVersion and header['stamp'] == stamp:
+                            index = header['index']
+            except Exception:
+                index = None
+        
+        if index == None:
+            index = self.indexEPFile(epFilePath)
+            headerData = pickle.dumps({'version': indexVersion, 'stamp': stamp, 'index': index}, pickle.HIGHEST_PROTOCOL)
+            try:
+                tempPath = indexFilePath + ".tmp"
+                with open(tempPath, 'wb') as outf:
+                    outf.write(fileTag)
+                    outf.write(struct.pack('<I', len(headerData)))
+                    outf.write(headerData)
+                if os.path.isfile(indexFilePath): os.remove(indexFilePath)
+                os.rename(tempPath, indexFilePath)
+            except Exception, e:
+                # the library is still loaded. It will be indexed again next time.
+                print "Failed to save the library index: " + str(e)
+        
+        EPObjectRef = hb_EPLibraryDict.EPObjectRef
+        for shortKey, name, offset, length in index:
+            dict.__setitem__(self.libraries[shortKey], name, EPObjectRef(epFilePath, offset, length))
     
     def report(self): 
         # Report findings
@@ -1671,8 +1839,185 @@ class hb_MSHToRAD(object):
     
         return matFile, radFile
 
+class hb_ProcessScheduler(object):
+    """
+    Run a list of batch files or commands with a bounded pool of workers.
+    
+    Each worker takes the next job from a shared queue as soon as its current
+    process has finished, so fast workers pick up the remaining jobs. Workers
+    block on their process instead of polling it and the exit code and wall
+    time of every job are recorded. Pressing Esc in Grasshopper cancels the
+    remaining jobs and kills the running ones.
+    
+    Args:
+        maxPRuns: Maximum number of processes that run at the same time.
+        shell: Set to True to run the processes without a cmd window.
+    """
+    
+    def __init__(self, maxPRuns = None, shell = False):
+        if not maxPRuns: maxPRuns = 1
+        self.maxPRuns = max(1, int(maxPRuns))
+        self.shell = shell
+        self.jobs = []
+        self.cancelled = False
+    
+    def worker(self, jobQueue):
+        while not self.cancelled:
+            try: job = jobQueue.get_nowait()
+            except Queue.Empty: return
+            
+            startTime = time.time()
+            try:
+                job["process"] = subprocess.Popen(job["command"], shell = self.shell)
+                # a job that started while cancelling should not outlive the others
+                if self.cancelled: self.killProcess(job["process"])
+                job["exitCode"] = job["process"].wait()
+            except Exception, e:
+                job["error"] = str(e)
+            job["wallTime"] = time.time() - startTime
+    
+    def run(self, commands, checkEscape = True):
+        """Run all the commands and return the list of jobs once they are finished.
+        
+        Each job is a dictionary with command, exitCode, wallTime and error keys.
+        exitCode is None for the jobs that didn't start or were cancelled.
+        """
+        self.cancelled = False
+        self.jobs = [{"command": command, "process": None, "exitCode": None, "wallTime": None, "error": None} \
+                     for command in commands]
+        
+        jobQueue = Queue.Queue()
+        for job in self.jobs: jobQueue.put(job)
+        
+        workers = []
+        for count in range(min(self.maxPRuns, len(self.jobs))):
+            thread = threading.Thread(target = self.worker, args = (jobQueue,))
+            thread.daemon = True
+            thread.start()
+            workers.append(thread)
+        
+        for thread in workers:
+            while thread.is_alive():
+                # wake up every now and then to check if the user wants to cancel
+                thread.join(0.5)
+                if checkEscape and not self.cancelled and gh.GH_Document.IsEscapeKeyDown():
+                    print "Cancelling the remaining processes..."
+                    self.cancel()
+        
+        return self.jobs
+    
+    def killProcess(self, process):
+        if process.poll() is not None: return
+        try:
+            # kill the whole process tree since batch files start their own processes
+            subprocess.call("taskkill /F /T /PID %d"%process.pid, shell = True)
+        except:
+            try: process.kill()
+            except: pass
+    
+    def cancel(self):
+        """Stop starting new jobs and kill the running processes."""
+        self.cancelled = True
+        for job in self.jobs:
+            if job["process"] is not None: self.killProcess(job["process"])
+    
+    def failedJobs(self):
+        return [job for job in self.jobs if job["exitCode"] != 0]
+    
+    def report(self, GHComponent = None):
+        """Print the wall time of each job and a warning for the ones that failed.
+        
+        The warning is also added to GHComponent, the component that ran the jobs, if it is given.
+        """
+        for job in self.jobs:
+            if job["wallTime"] is not None:
+                print "%s finished in %.2f seconds with exit code %s."%(os.path.basename(job["command"]), job["wallTime"], job["exitCode"])
+        
+        failedJobs = self.failedJobs()
+        if len(failedJobs) != 0:
+            warning = "%d of %d processes failed or didn't run:\n"%(len(failedJobs), len(self.jobs))
+            for job in failedJobs:
+                warning += "%s > %s\n"%(job["command"], job["error"] or "exit code %s"%job["exitCode"])
+            print warning
+            if GHComponent != None:
+                GHComponent.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
+
+
+class hb_RADSceneWriter(object):
+    """
+    Write Radiance geometry to a file in large blocks.
+    
+    Strings are collected in memory and written to the file together once
+    the buffer is full. Polygons can also be written straight from packed
+    coordinates (x1, y1, z1, x2, y2, z2, ...) without creating points.
+    
+    Usage:
+        sceneWriter = hb_RADSceneWriter(open(radFilePath, 'w'))
+        sceneWriter.writePolygon('Exterior_Wall', 'wall_0', array.array('d', coordinates))
+        sceneWriter.close()
+    """
+    
+    def __init__(self, radFile, bufferSize = 1 << 20):
+        self.radFile = radFile
+        self.bufferSize = bufferSize
+        self.buffer = []
+        self.bufferLength = 0
+    
+    def write(self, radStr):
+        if not radStr: return
+        self.buffer.append(radStr)
+        self.bufferLength += len(radStr)
+        if self.bufferLength >= self.bufferSize:
+            self.flush()
+    
+    def flush(self):
+        if self.buffer:
+            self.radFile.write(''.join(self.buffer))
+            self.buffer = []
+            self.bufferLength = 0
+    
+    def close(self):
+        self.flush()
+        self.radFile.close()
+    
+    @staticmethod
+    def coordinatesStr(coordinates):
+        """Vertices of a polygon from a list of points."""
+        return ''.join(['%.4f  %.4f  %.4f\n'%(pt.X, pt.Y, pt.Z) for pt in coordinates]) + '\n'
+    
+    @staticmethod
+    def packedCoordinatesStr(coordinates):
+        """Vertices of a polygon from packed coordinates."""
+        return '%.4f  %.4f  %.4f\n' * (len(coordinates) // 3) % tuple(coordinates) + '\n'
+    
+    @staticmethod
+    def polygonHeaderStr(material, name, numOfPoints):
+        return material + " polygon " + name + "\n0\n0\n" + `numOfPoints * 3` + "\n"
+    
+    def writePolygon(self, material, name, coordinates):
+        """Write a polygon from packed coordinates.
+        
+        Polygons with less than 3 vertices are written as a comment similar to
+        hb_WriteRAD.getsurfaceStr.
+        """
+        numOfPoints = len(coordinates) // 3
+        if numOfPoints < 3:
+            self.write("# Polygon " + name + " has less than 3 vertices and is removed by Honeybee.\n")
+            return
+        self.write(self.polygonHeaderStr(material, name, numOfPoints) + \
+                   self.packedCoordinatesStr(coordinates))
+
+
 class hb_WriteRAD(object):
     
+    # grid-based studies are split into more point files than CPUs so that the
+    # CPUs that finish their files early pick up the remaining ones.
+    ptsChunksPerCPU = 4
+    
+    # rtrace spends more time on the points close to glazing. The estimated cost of a
+    # point is 1 + glazingCostWeight / (1 + distance to the closest window in meters).
+    glazingCostWeight = 4.0
+    
     def __init__(self, component = ghenv.Component):
         
         self.component = component
@@ -1691,6 +2036,8 @@ class hb_WriteRAD(object):
         self.hb_DSCore = hb_folders["DSCorePath"]
         self.hb_DSLibPath = hb_folders["DSLibPath"]
         
+        # center of the windows in the scene to estimate the cost of the test points
+        self.glazingCenters = []
         
     def writeRADAndMaterialFiles(self, originalHBObjects, subWorkingDir, radFileName, \
                                  analysisRecipe, meshParameters, exportInteriorWalls):
@@ -1716,12 +2063,13 @@ class hb_WriteRAD(object):
         hb_hive = sc.sticky["honeybee_Hive"]()
         HBObjects = hb_hive.callFromHoneybeeHive(originalHBObjects)
         
-        geoRadFile = open(radFileFullName, 'w')
+        geoRadFile = hb_RADSceneWriter(open(radFileFullName, 'w'))
         geoRadFile.write("#GENERATED BY HONEYBEE\n")
         customRADMat = {} # dictionary to collect the custom material names
         customMixFunRadMat = {} # dictionary to collect the custom mixfunc material names
-        surfaceList = []
+        surfaceList = set()
         rotateObjects = False
+        self.glazingCenters = []
         if len(HBObjects)!=0:
             # if this is an annual analysis and north is not 0 rotate all Honeybee objects
             if analysisRecipe.type == 2 and analysisRecipe.northDegrees!=0:
@@ -1751,7 +2099,7 @@ class hb_WriteRAD(object):
                         if self.hb_writeRADAUX.isSrfInterior(srf) and srf.BCObject.name in surfaceList:
                             continue
                         
-                        surfaceList.append(srf.name)
+                        surfaceList.add(srf.name)
                         
                         # collect the custom material informations
                         if srf.RadMaterial!=None:
@@ -1765,6 +2113,7 @@ class hb_WriteRAD(object):
                         if srf.hasChild:
                             # collect the custom material informations
                             for childSrf in srf.childSrfs:
+                                self.glazingCenters.append(childSrf.cenPt)
                                 
                                 if childSrf.RadMaterial!=None:
                                     customRADMat, customMixFunRadMat = self.hb_RADMaterialAUX.addRADMatToDocumentDict(childSrf, customRADMat, customMixFunRadMat)
@@ -1790,6 +2139,7 @@ class hb_WriteRAD(object):
                     if not HBObj.isChild and HBObj.hasChild:
                         # collect the custom material informations
                         for childSrf in HBObj.childSrfs:
+                            self.glazingCenters.append(childSrf.cenPt)
                             if childSrf.RadMaterial!=None:
                                 try:
                                     customRADMat, customMixFunRadMat = self.hb_RADMaterialAUX.addRADMatToDocumentDict(childSrf, customRADMat, customMixFunRadMat)
@@ -1837,6 +2187,10 @@ class hb_WriteRAD(object):
                     
         geoRadFile.close()
         
+        # keep the center of the windows next to the scene so Refine Daylight Simulation
+        # can split the test points the same way
+        self.writeGlazingCenters(os.path.join(subWorkingDir, radFileName + '.glz'))
+        
         ########################################################################
         ######################## GENERATE THE BASE RAD FILE ####################
         materialFileName = subWorkingDir + "\\material_" + radFileName + '.rad'
@@ -1994,43 +2348,109 @@ class hb_WriteRAD(object):
             for v in flattenPtsNormals: v.Transform(transform)    
     
         numOfPoints = len(flattenTestPoints)
-    
+        
+        if numOfCPUs > 1 and analysisRecipe.type != 2:
+            numOfCPUs = numOfCPUs * self.ptsChunksPerCPU
+        
         if numOfCPUs > numOfPoints: numOfCPUs = numOfPoints
-
-        if numOfCPUs > 1:
-            ptsEachCpu = int(numOfPoints/(numOfCPUs))
-            remainder = numOfPoints%numOfCPUs
-        else:		
-            ptsEachCpu = numOfPoints		
-            remainder = 0
-    
-        lenOfPts = []
         
-        for cpuCount in range(numOfCPUs):		
-            if cpuCount < remainder:		
-                lenOfPts.append(ptsEachCpu+1)		
-            else:		
-                lenOfPts.append(ptsEachCpu)
+        if len(self.glazingCenters) == 0:
+            # all the points have the same estimated cost without windows
+            if numOfCPUs > 1:
+                ptsEachCpu = int(numOfPoints/(numOfCPUs))
+                remainder = numOfPoints%numOfCPUs
+            else:
+                ptsEachCpu = numOfPoints
+                remainder = 0
+            
+            lenOfPts = []
+            
+            for cpuCount in range(numOfCPUs):
+                if cpuCount < remainder:
+                    lenOfPts.append(ptsEachCpu+1)
+                else:
+                    lenOfPts.append(ptsEachCpu)
+        else:
+            # split the points into continuous chunks with a similar estimated cost
+            # the order of the points stays the same so the results can be read in order
+            ptsCosts = self.estimatePointsCost(flattenTestPoints)
+            lenOfPts = self.partitionByCost(ptsCosts, numOfCPUs)
         
         testPtsEachCPU = []
-        
+        ptStart = 0
         for cpuCount in range(numOfCPUs):
             # write pts file
-            ptsForThisCPU = []
+            ptEnd = ptStart + lenOfPts[cpuCount]
             ptsFileName = os.path.join(subWorkingDir, radFileName + '_' + `cpuCount` + '.pts')
             
-            ptsFile = open(ptsFileName, "w")
-
-            for ptCount in range(sum(lenOfPts[:cpuCount]), sum(lenOfPts[:cpuCount+1])):
-                ptsFile.write(self.hb_writeRADAUX.testPtsStr(flattenTestPoints[ptCount], flattenPtsNormals[ptCount]))
-                ptsForThisCPU.append(flattenTestPoints[ptCount])
-
-            ptsFile.close()
+            with open(ptsFileName, "w") as ptsFile:
+                ptsFile.write("".join([self.hb_writeRADAUX.testPtsStr(flattenTestPoints[ptCount], flattenPtsNormals[ptCount]) \
+                                       for ptCount in xrange(ptStart, ptEnd)]))
             
-            testPtsEachCPU.append(ptsForThisCPU)        
+            testPtsEachCPU.append(flattenTestPoints[ptStart:ptEnd])
+            ptStart = ptEnd
             
         return testPtsEachCPU, lenOfPts
     
+    def writeGlazingCenters(self, glazingFileName):
+        with open(glazingFileName, "w") as glzFile:
+            glzFile.write("".join(['%.4f\t%.4f\t%.4f\n'%(pt.X, pt.Y, pt.Z) for pt in self.glazingCenters]))
+    
+    def readGlazingCenters(self, glazingFileName):
+        """Read the center of the windows that are written next to a scene by writeRADAndMaterialFiles."""
+        self.glazingCenters = []
+        with open(glazingFileName, "r") as glzFile:
+            for line in glzFile:
+                if line.strip() == "": continue
+                x, y, z = line.split()
+                self.glazingCenters.append(rc.Geometry.Point3d(float(x), float(y), float(z)))
+    
+    def estimatePointsCost(self, testPoints):
+        """Estimate the relative rtrace cost of each test point from its distance to the closest window."""
+        if len(self.glazingCenters) == 0: return [1.0] * len(testPoints)
+        
+        # distances are in meters so the weight doesn't depend on the units of the model
+        conversionFactor = sc.sticky["honeybee_ConversionFactor"]
+        glazingCloud = rc.Geometry.PointCloud(self.glazingCenters)
+        ptsCosts = []
+        for pt in testPoints:
+            closestCenter = self.glazingCenters[glazingCloud.ClosestPoint(pt)]
+            distance = pt.DistanceTo(closestCenter) * conversionFactor
+            ptsCosts.append(1.0 + self.glazingCostWeight / (1.0 + distance))
+        return ptsCosts
+    
+    @staticmethod
+    def partitionByCost(ptsCosts, numOfChunks):
+        """Split a list of costs into continuous chunks with a similar total cost.
+        
+        Returns the number of points in each chunk. Every chunk has at least one point.
+        """
+        if numOfChunks < 1: return []
+        
+        numOfPoints = len(ptsCosts)
+        cumulativeCosts = []
+        totalCost = 0
+        for cost in ptsCosts:
+            totalCost += cost
+            cumulativeCosts.append(totalCost)
+        
+        lenOfPts = []
+        chunkStart = 0
+        for chunkCount in range(1, numOfChunks):
+            # end the chunk at the point that gets closest to its share of the total cost
+            targetCost = totalCost * chunkCount / numOfChunks
+            chunkEnd = bisect.bisect_left(cumulativeCosts, targetCost) + 1
+            if chunkEnd > 1 and chunkEnd <= numOfPoints and \
+                targetCost - cumulativeCosts[chunkEnd - 2] < cumulativeCosts[chunkEnd - 1] - targetCost:
+                chunkEnd -= 1
+            chunkEnd = max(chunkEnd, chunkStart + 1)
+            chunkEnd = min(chunkEnd, numOfPoints - (numOfChunks - chunkCount))
+            lenOfPts.append(chunkEnd - chunkStart)
+            chunkStart = chunkEnd
+        lenOfPts.append(numOfPoints - chunkStart)
+        
+        return lenOfPts
+    
     def writeBatchFiles(self, subWorkingDir, radFileName, radSkyFileName, \
                         radFileFullName, materialFileName, \
                         numOfCPUs, testPtsEachCPU, \
@@ -2229,15 +2649,17 @@ class hb_WriteRAD(object):
             
             # write OCT file
             # 3.2. oconv line
-            sceneRadFiles = [materialFileName, radSkyFileName, radFileFullName]
+            # the sky is added to the cached octree of the static scene
+            sceneRadFiles = [materialFileName, radFileFullName]
             
             if additionalRadFiles:
                 for additionalFile in additionalRadFiles:
                     if additionalFile!=None:
                         sceneRadFiles.append(additionalFile)
-                
-            OCTLine = self.hb_writeRADAUX.oconvLine(OCTFileName, sceneRadFiles)
-            if readyOCTFile ==None: batchFile.write(OCTLine)
+            
+            if readyOCTFile ==None:
+                OCTLine = self.hb_writeRADAUX.cachedOconvLine(OCTFileName, sceneRadFiles, [radSkyFileName])
+                batchFile.write(OCTLine)
             
             if analysisRecipe.type == 0:
                 # add overture line in case it is an image-based analysis
@@ -2360,7 +2782,7 @@ class hb_WriteRAD(object):
             
             return initBatchFileName, batchFiles, fileNames, pcompFileName, RADResultFilesAddress
         
-    def executeBatchFiles(self, batchFileNames, maxPRuns = None, shell = False, waitingTime = 0.5):
+    def executeBatchFiles(self, batchFileNames, maxPRuns = None, shell = False, waitingTime = 0.5, GHComponent = None):
     
         """Run a number of batch files in parallel and
             wait to end of the analysis.
@@ -2369,54 +2791,26 @@ class hb_WriteRAD(object):
                 batchFileNames: List of batch files
                 maxPRuns: max number of files to be ran in parallel (default = 0)
                 shell: set to True if you do NOT want to see the cmd window while the analysis is runnig
+                waitingTime: Not used anymore. The processes are waited on directly.
+                GHComponent: The component that runs the batch files. Failed processes are reported on it.
+            
+            Returns:
+                The list of jobs from hb_ProcessScheduler with the exit code
+                and the wall time of each batch file.
         """
-    
-        if not maxPRuns : maxPRuns = 1
-        maxPRuns = int(maxPRuns)
-        total = len(batchFileNames)
         
-        if maxPRuns < 1: maxPRuns = 1
-        if maxPRuns > total: maxPRuns = total
-        
-        running = 0
-        done = False
-        jobs = []
-        pid = 0
-        
-        try:
-            while not done:
-                if running < maxPRuns and pid < total:
-                    # execute the files
-                    jobs.append(subprocess.Popen(batchFileNames[pid].replace("\\", "/") , shell = shell))
-                    pid+=1
-                    time.sleep(waitingTime)
-                
-                # count how many jobs are running and how many are done
-                running = 0
-                finished = 0
-                for job in jobs:
-                    if job.poll() is None:
-                        #one job is still running
-                        running += 1
-                    else:
-                        finished += 1
-        
-                if running == maxPRuns:
-                    # wait for half a second
-                    #print "waiting..."
-                    time.sleep(waitingTime)
-        
-                if finished ==  total:
-                    done = True
-        
-        except Exception, e:
-            print "Something went wrong: %s"%str(e) 
+        scheduler = hb_ProcessScheduler(maxPRuns, shell)
+        jobs = scheduler.run([batchFileName.replace("\\", "/") for batchFileName in batchFileNames])
+        scheduler.report(GHComponent)
+        return jobs
     
     def runBatchFiles(self, initBatchFileName, batchFileNames, fileNames, \
-                      pcompBatchFile, waitingTime, runInBackground = False):
+                      pcompBatchFile, waitingTime, runInBackground = False, maxPRuns = None, GHComponent = None):
+        
+        if not maxPRuns: maxPRuns = len(batchFileNames)
         
-        self.executeBatchFiles([initBatchFileName], maxPRuns = 1, shell = runInBackground, waitingTime = waitingTime)
-        self.executeBatchFiles(batchFileNames, maxPRuns = len(batchFileNames), shell = runInBackground, waitingTime = waitingTime)
+        self.executeBatchFiles([initBatchFileName], maxPRuns = 1, shell = runInBackground, waitingTime = waitingTime, GHComponent = GHComponent)
+        self.executeBatchFiles(batchFileNames, maxPRuns = maxPRuns, shell = runInBackground, waitingTime = waitingTime, GHComponent = GHComponent)
         
         if pcompBatchFile!="":
             os.system(pcompBatchFile) # put all the files together
@@ -2511,16 +2905,6 @@ class hb_WriteRAD(object):
             #assign the construction based on type
             surface.construction = surface.cnstrSet[surface.type]
             
-        srfStr =  surface.construction.replace(" ", "_") + " polygon " + surface.name.strip() + '_' + `count` + "\n" + \
-            "0\n" + \
-            "0\n" + \
-            `(len(coordinates)*3)` + "\n"
-            
-        ptStr = ''
-        for  pt in coordinates:
-            ptStr = ptStr + '%.4f'%pt.X + '  ' + '%.4f'%pt.Y + '  ' + '%.4f'%pt.Z + '\n'
-        ptStr = ptStr + '\n'
-        
         # check for polygons with only two points.
         # Yes! it is possible. Import a model from REVIT/SketchUp and create some breps out of it
         # and you will get some!
@@ -2528,7 +2912,10 @@ class hb_WriteRAD(object):
             comment = " Polygon " + surface.name + " has less than 3 vertices and is removed by Honeybee.\n"
             return "#" + comment
         
-        return srfStr + ptStr
+        srfStr = hb_RADSceneWriter.polygonHeaderStr(surface.construction.replace(" ", "_"), \
+                 surface.name.strip() + '_' + `count`, len(coordinates))
+        
+        return srfStr + hb_RADSceneWriter.coordinatesStr(coordinates)
 
     def RADSurface(self, surface):
         fullStr = []
@@ -2606,8 +2993,42 @@ class hb_WriteRAD(object):
                 fullStr.append(self.getsurfaceStr(surface.childSrfs[0], glzCount, glzCoorList))
         return ''.join(fullStr)
 
+def pruneCacheFolder(cacheFolder, extension, maxSize, keepFilePath = None):
+    """Remove the least recently used files of a cache folder until they fit in maxSize.
+    
+    Files are marked as used by their modification time. Temporary files that are
+    more than a day old are left over from failed runs and are removed too. Files
+    that are in use by a running study can't be removed and are skipped.
+    """
+    cacheFiles = []
+    totalSize = 0
+    for fileName in os.listdir(cacheFolder):
+        filePath = os.path.join(cacheFolder, fileName)
+        try: fileSize, lastUsed = os.path.getsize(filePath), os.path.getmtime(filePath)
+        except: continue
+        if fileName.endswith(".tmp"):
+            if time.time() - lastUsed > 24 * 3600:
+                try: os.remove(filePath)
+                except: pass
+            continue
+        if not fileName.endswith(extension): continue
+        cacheFiles.append((lastUsed, fileSize, filePath))
+        totalSize += fileSize
+    
+    for lastUsed, fileSize, filePath in sorted(cacheFiles):
+        if totalSize <= maxSize: break
+        if keepFilePath != None and os.path.normcase(filePath) == os.path.normcase(keepFilePath): continue
+        try:
+            os.remove(filePath)
+            totalSize -= fileSize
+        except: pass
+
+
 class hb_WriteRADAUX(object):
     
+    # frozen scene octrees are removed, least recently used first, once the cache is larger than this.
+    octreeCacheMaxSize = 2 * 1024 ** 3
+    
     def __init__(self):
         self.hb_radParDict = sc.sticky["honeybee_RADParameters"]().radParDict
         self.lb_preparation = sc.sticky["ladybug_Preparation"]()
@@ -3127,6 +3548,54 @@ class hb_WriteRADAUX(object):
         
         return line
     
+    def sceneOctreeKey(self, radFilesList):
+        """Hash of the content of the scene files in the order that they are added to the octree."""
+        hasher = hashlib.md5()
+        for address in radFilesList:
+            hasher.update(os.path.basename(address) + "\n")
+            with open(address, "rb") as radFile:
+                for chunk in iter(lambda: radFile.read(1 << 20), ""):
+                    hasher.update(chunk)
+        return hasher.hexdigest()
+    
+    def cachedOconvLine(self, octFileName, sceneRadFiles, skyRadFiles, cacheFolder = None):
+        """oconv lines that reuse a frozen octree of the static scene.
+        
+        The static scene is frozen once in the cache folder under the hash of its
+        files and the sky is added to a copy of it with oconv -i. Studies with the
+        same geometry and materials and a different sky only pay for the sky.
+        """
+        if cacheFolder == None:
+            cacheFolder = os.path.join(sc.sticky["Honeybee_DefaultFolder"], "octreeCache")
+        if not os.path.isdir(cacheFolder): os.makedirs(cacheFolder)
+        
+        r = 1024 * 2
+        # cmd doesn't accept forward slashes in the paths for move
+        sceneOctFile = os.path.join(cacheFolder, self.sceneOctreeKey(sceneRadFiles) + ".oct")
+        senceFiles = ""
+        for address in sceneRadFiles: senceFiles = senceFiles + address.replace("\\" , "/") + " "
+        skyFiles = ""
+        for address in skyRadFiles: skyFiles = skyFiles + address.replace("\\" , "/") + " "
+        
+        # mark the octree as used and make room for the new ones
+        if os.path.isfile(sceneOctFile):
+            try: os.utime(sceneOctFile, None)
+            except: pass
+        self.pruneOctreeCache(cacheFolder, sceneOctFile)
+        
+        # freeze the scene to a temporary file first so a failed run doesn't leave a broken octree
+        tempOctFile = sceneOctFile[:-4] + "_" + str(uuid.uuid4())[:8] + ".tmp"
+        line = 'if not exist "' + sceneOctFile + '" oconv -r ' + str(r) + " -f " + senceFiles + \
+               ' > "' + tempOctFile + '" && move /Y "' + tempOctFile + '" "' + sceneOctFile + '" > nul\n' + \
+               'oconv -i "' + sceneOctFile + '" ' + skyFiles + " > " + octFileName + ".oct\n"
+        
+        return line
+    
+    def pruneOctreeCache(self, cacheFolder, keepOctFile = None, maxSize = None):
+        """Remove the least recently used octrees until the cache fits in maxSize."""
+        if maxSize == None: maxSize = self.octreeCacheMaxSize
+        pruneCacheFolder(cacheFolder, ".oct", maxSize, keepOctFile)
+    
     def overtureLine(self, view, projectName, viewName, radParameters, analysisType = 0):
         octFile = projectName + ".oct"
         ambFile = projectName + ".amb" #amb file is view independent and can be used globally
@@ -3239,12 +3708,8 @@ class hb_WriteRADAUX(object):
         return line0 + line1_1 + line1_2 + line1_3
         
     def testPtsStr(self, testPoint, ptsNormal):
-        return  '%.4f'%testPoint.X + '\t' + \
-                '%.4f'%testPoint.Y + '\t' + \
-                '%.4f'%testPoint.Z + '\t' + \
-                '%.4f'%ptsNormal.X + '\t' + \
-                '%.4f'%ptsNormal.Y + '\t' + \
-                '%.4f'%ptsNormal.Z + '\n'
+        return  '%.4f\t%.4f\t%.4f\t%.4f\t%.4f\t%.4f\n'%(testPoint.X, testPoint.Y, testPoint.Z, \
+                                                      ptsNormal.X, ptsNormal.Y, ptsNormal.Z)
         
 
     def readRadiationResult(self, resultFile):
@@ -3654,6 +4119,263 @@ class hb_ReadAnnualResultsAux(object):
         
         return illFiles
 
+class hb_IllFileIndex(object):
+    """
+    Random access to the values of a Daysim .ill file.
+    
+    The first time that a file is read it is converted into a binary copy
+    next to it (.ill.hbidx) with one block of doubles ordered by hour. Each
+    line of the .ill file is one hour. After that a single hour is read with
+    one seek and a single sensor is read in strides of blockValues values. The
+    copy is rebuilt whenever the .ill file changes.
+    
+    If the copy can't be written (e.g. the results folder is read only) the
+    values are parsed from the .ill file every time that they are read.
+    """
+    
+    # version of the binary format.
+    indexVersion = 3
+    fileTag = 'HBIL'
+    
+    # number of values that are read at once when the values of a sensor are collected.
+    blockValues = 1 << 20
+    
+    def __init__(self, illFilePath):
+        self.illFilePath = illFilePath
+        self.indexFilePath = illFilePath + '.hbidx'
+        
+        self.isIndexed = self.loadIndex()
+        if not self.isIndexed:
+            try:
+                self.convert()
+                self.isIndexed = self.loadIndex()
+            except (IOError, OSError), e:
+                print "Failed to write %s. The .ill file is read directly: %s"%(self.indexFilePath, str(e))
+        if not self.isIndexed: self.scanIllFile()
+    
+    def illStamp(self):
+        return os.path.getsize(self.illFilePath), int(os.path.getmtime(self.illFilePath))
+    
+    def parseLine(self, line, lineCount):
+        """Return the values of a line of the .ill file.  lineCount is the 0-based index of the line."""
+        try:
+            # the first 4 items are month, day, hour and an empty string
+            return [float(value) for value in line.strip().split(" ")[4:]]
+        except ValueError:
+            raise ValueError("Line %d of %s has a value that is not a number."%(lineCount + 1, self.illFilePath))
+    
+    def loadIndex(self):
+        """Read the header of the binary copy.  Returns False if it is missing or out of date."""
+        if not os.path.isfile(self.indexFilePath): return False
+        try:
+            with open(self.indexFilePath, 'rb') as inf:
+                if inf.read(4) != self.fileTag: return False
+                headerLength = struct.unpack('<I', inf.read(4))[0]
+                header = pickle.loads(inf.read(headerLength))
+                self.dataOffset = inf.tell()
+        except Exception:
+            return False
+        if header['version'] != self.indexVersion or header['illStamp'] != self.illStamp(): return False
+        
+        self.hourCount = header['hourCount']
+        self.sensorCount = header['sensorCount']
+        self.byteorder = header['byteorder']
+        return True
+    
+    def scanIllFile(self):
+        """Count the hours and the sensors of the .ill file without writing the binary copy."""
+        self.sensorCount = 0
+        self.hourCount = 0
+        with open(self.illFilePath, 'r') as illInf:
+            for lineCount, line in enumerate(illInf):
+                if lineCount == 0: self.sensorCount = len(self.parseLine(line, lineCount))
+                self.hourCount += 1
+    
+    def convert(self):
+        """Parse the .ill file line by line and write the values of each hour as they are read.
+        
+        Raises a ValueError if a line has a value that is not a number or a different number of
+        sensors than the first line.
+        """
+        illStamp = self.illStamp()
+        sensorCount = None
+        hourCount = 0
+        dataFilePath = self.indexFilePath + ".data"
+        tempPath = self.indexFilePath + ".tmp"
+        try:
+            with open(self.illFilePath, 'r') as illInf:
+                with open(dataFilePath, 'wb') as dataOutf:
+                    for lineCount, line in enumerate(illInf):
+                        hourValues = array.array('d', self.parseLine(line, lineCount))
+                        if sensorCount == None: sensorCount = len(hourValues)
+                        elif len(hourValues) != sensorCount:
+                            raise ValueError("Line %d of %s has %d values instead of %d." \
+                                %(lineCount + 1, self.illFilePath, len(hourValues), sensorCount))
+                        hourValues.tofile(dataOutf)
+                        hourCount += 1
+            if sensorCount == None: sensorCount = 0
+            
+            header = {'version': self.indexVersion, 'illStamp': illStamp, 'hourCount': hourCount,
+                      'sensorCount': sensorCount, 'byteorder': sys.byteorder}
+            headerData = pickle.dumps(header, pickle.HIGHEST_PROTOCOL)
+            
+            with open(tempPath, 'wb') as outf:
+                outf.write(self.fileTag)
+                outf.write(struct.pack('<I', len(headerData)))
+                outf.write(headerData)
+                with open(dataFilePath, 'rb') as dataInf:
+                    shutil.copyfileobj(dataInf, outf, 1 << 20)
+            if os.path.isfile(self.indexFilePath): os.remove(self.indexFilePath)
+            os.rename(tempPath, self.indexFilePath)
+        finally:
+            for filePath in (dataFilePath, tempPath):
+                try:
+                    if os.path.isfile(filePath): os.remove(filePath)
+                except OSError: pass
+    
+    def readBlock(self, inf, offset, count):
+        values = array.array('d')
+        inf.seek(self.dataOffset + offset * values.itemsize)
+        values.fromfile(inf, count)
+        if self.byteorder != sys.byteorder: values.byteswap()
+        return values
+    
+    def getHour(self, hourIndex):
+        """Return the values of all the sensors for an hour.  hourIndex is the 0-based line of the hour in the .ill file."""
+        if not 0 <= hourIndex < self.hourCount: return []
+        if not self.isIndexed:
+            with open(self.illFilePath, 'r') as illInf:
+                for lineCount, line in enumerate(illInf):
+                    if lineCount == hourIndex: return self.parseLine(line, lineCount)
+        
+        with open(self.indexFilePath, 'rb') as inf:
+            return list(self.readBlock(inf, hourIndex * self.sensorCount, self.sensorCount))
+    
+    def getSensor(self, sensorIndex):
+        """Return the values of a sensor for all of the hours."""
+        if not 0 <= sensorIndex < self.sensorCount: return []
+        if not self.isIndexed:
+            with open(self.illFilePath, 'r') as illInf:
+                return [self.parseLine(line, lineCount)[sensorIndex] for lineCount, line in enumerate(illInf)]
+        
+        # read blocks of whole hours and keep every sensorCount-th value
+        values = []
+        blockHours = max(1, self.blockValues // self.sensorCount)
+        with open(self.indexFilePath, 'rb') as inf:
+            for hourIndex in xrange(0, self.hourCount, blockHours):
+                hourCount = min(blockHours, self.hourCount - hourIndex)
+                block = self.readBlock(inf, hourIndex * self.sensorCount, hourCount * self.sensorCount)
+                values.extend(block[sensorIndex::self.sensorCount])
+        return values
+
+
+class hb_AnnualDaylightMetrics(object):
+    """
+    Calculate the standard annual daylight metrics from Daysim .ill files.
+    
+    The .ill files of a study are read once, line by line, and the values of
+    every occupied hour are added to running counts for all of the sensors and
+    thresholds at the same time.
+    
+    Args:
+        illFiles: List of .ill files that are split between CPUs. The sensors
+            of the files are read in order.
+        udiRange: Lower and upper illuminance of useful daylight illuminance.
+    """
+    
+    def __init__(self, illFiles, udiRange=(100, 2000)):
+        self.illFiles = illFiles
+        self.udiRange = udiRange
+    
+    @staticmethod
+    def readOccupancy(occFilePath):
+        """Read a Daysim occupancy file into a list of True/False values for each hour."""
+        occupancy = []
+        with open(occFilePath, "r") as occInf:
+            for line in occInf:
+                if line.startswith("#") or line.strip() == "": continue
+                occupancy.append(float(line.strip().split(",")[-1]) > 0)
+        return occupancy
+    
+    def readHours(self):
+        """Yield the values of all the sensors for each line of the .ill files."""
+        illInfs = [open(illFile, "r") for illFile in self.illFiles]
+        try:
+            while True:
+                values = []
+                for illInf in illInfs:
+                    line = illInf.readline()
+                    if line == "": return
+                    # the first 4 items are month, day, hour and an empty string
+                    values.extend(map(float, line.strip().split(" ")[4:]))
+                yield values
+        finally:
+            for illInf in illInfs: illInf.close()
+    
+    def calculate(self, sensorGroups):
+        """Calculate the metrics for groups of consecutive sensors.
+        
+        Args:
+            sensorGroups: List of (number of sensors, occupancy, thresholds) for
+                each group. Occupancy is a list of True/False values for each hour.
+        
+        Returns:
+            A list with a dictionary for each group. DA and CDA are dictionaries
+            of results for each threshold and UDILess, UDIInRange and UDIMore are
+            lists. All the values are percentages of the occupied hours.
+        """
+        low, high = self.udiRange
+        
+        groupRanges = []
+        counts = []
+        start = 0
+        for sensorCount, occupancy, thresholds in sensorGroups:
+            groupRanges.append((start, start + sensorCount))
+            start += sensorCount
+            counts.append({
+                'DA': dict((threshold, [0] * sensorCount) for threshold in thresholds),
+                'CDA': dict((threshold, [0.0] * sensorCount) for threshold in thresholds),
+                'UDILess': [0] * sensorCount,
+                'UDIMore': [0] * sensorCount,
+                'occupiedHours': 0})
+        
+        for hour, values in enumerate(self.readHours()):
+            if len(values) < start:
+                raise ValueError("Line %d of the .ill files has %d values instead of %d."%(hour + 1, len(values), start))
+            for groupCount, (sensorCount, occupancy, thresholds) in enumerate(sensorGroups):
+                if not occupancy[hour]: continue
+                groupCounts = counts[groupCount]
+                groupCounts['occupiedHours'] += 1
+                groupValues = values[groupRanges[groupCount][0]:groupRanges[groupCount][1]]
+                
+                for threshold in thresholds:
+                    da = groupCounts['DA'][threshold]
+                    da[:] = [c + (v >= threshold) for c, v in zip(da, groupValues)]
+                    cda = groupCounts['CDA'][threshold]
+                    cda[:] = [c + (1 if v >= threshold else v / threshold) for c, v in zip(cda, groupValues)]
+                
+                udiLess = groupCounts['UDILess']
+                udiLess[:] = [c + (v < low) for c, v in zip(udiLess, groupValues)]
+                udiMore = groupCounts['UDIMore']
+                udiMore[:] = [c + (v > high) for c, v in zip(udiMore, groupValues)]
+        
+        results = []
+        for groupCounts in counts:
+            occupiedHours = groupCounts['occupiedHours']
+            factor = 100.0 / occupiedHours if occupiedHours else 0
+            udiLess = groupCounts['UDILess']
+            udiMore = groupCounts['UDIMore']
+            results.append({
+                'DA': dict((threshold, [c * factor for c in da]) for threshold, da in groupCounts['DA'].items()),
+                'CDA': dict((threshold, [c * factor for c in cda]) for threshold, cda in groupCounts['CDA'].items()),
+                'UDILess': [c * factor for c in udiLess],
+                'UDIInRange': [(occupiedHours - less - more) * factor for less, more in zip(udiLess, udiMore)],
+                'UDIMore': [c * factor for c in udiMore],
+                'occupiedHours': occupiedHours})
+        
+        return results
+
+
 class hb_EnergySimulatioParameters(object):
     
     def readEPParams(self, EPParameters):
@@ -3686,6 +4408,229 @@ class hb_EnergySimulatioParameters(object):
         
         return timestep, shadowPar, solarDistribution, simulationControl, ddyFile, terrain, grndTemps, holidays, startDay, heatSizing, coolSizing
 
+class EPCSVColumnReader(object):
+    """Stream an EnergyPlus csv result file and keep only the requested columns in typed arrays."""
+    
+    def __init__(self, csvFilePath):
+        self.csvFilePath = csvFilePath
+        with open(csvFilePath, 'r') as csvFile:
+            self.header = csvFile.readline().split(',')
+    
+    def readColumns(self, columnIndices):
+        """Return a dictionary of row-aligned arrays of values and one of the first unreadable row of each column.
+        
+        Cells that can't be read are stored as nan so that the rows of different columns stay aligned.
+        The first unreadable row of a column is None if all of its cells could be read.  Cells that are
+        missing from a short row are also nan but they don't count as unreadable.
+        """
+        columns = {}
+        failures = {}
+        for index in columnIndices:
+            columns[index] = array.array('d')
+            failures[index] = None
+        nan = float('nan')
+        
+        with open(self.csvFilePath, 'r') as csvFile:
+            csvFile.readline()
+            for rowCount, line in enumerate(csvFile):
+                row = line.split(',')
+                for index in columnIndices:
+                    try: columns[index].append(float(row[index]))
+                    except ValueError:
+                        columns[index].append(nan)
+                        if failures[index] is None: failures[index] = rowCount
+                    except IndexError:
+                        columns[index].append(nan)
+        
+        return columns, failures
+    
+    @staticmethod
+    def firstFailure(failures):
+        """Return the row and column of the first unreadable cell in the order of the csv or None."""
+        firstCells = [(row, columnIndex) for columnIndex, row in failures.items() if row is not None]
+        if firstCells: return min(firstCells)
+        return None
+
+
+class EPResultStore(object):
+    """
+    A columnar binary copy of an EnergyPlus csv result file.
+    
+    The csv is converted once into a .hbres file next to it.  The file starts
+    with an index of the columns (key, variable, units and frequency) and is
+    followed by one block of doubles per column so readers can load only the
+    series that they need.  The store is rebuilt whenever the csv changes.
+    
+    Set convert to False to only open an existing store.  isValid is False if
+    there is no up to date store and the csv should be read directly.
+    Use openReader to get a store or a csv reader for a result file.
+    """
+    
+    # version of the binary format.
+    storeVersion = 2
+    fileTag = 'HBRS'
+    
+    # number of values that are kept in memory while the csv is converted.
+    blockValues = 1 << 20
+    
+    firstFailure = staticmethod(EPCSVColumnReader.firstFailure)
+    
+    def __init__(self, csvFilePath, convert=True):
+        self.csvFilePath = csvFilePath
+        self.storeFilePath = os.path.splitext(csvFilePath)[0] + '.hbres'
+        
+        self.isValid = self.loadIndex()
+        if not self.isValid and convert:
+            self.convert()
+            self.isValid = self.loadIndex()
+    
+    @classmethod
+    def openReader(cls, csvFilePath):
+        """Return the store of a csv result file and build it on the first read.
+        
+        If the store can't be written (e.g. the result folder is read only) the
+        csv is streamed with an EPCSVColumnReader instead.  Both readers have the
+        same header attribute and readColumns method.
+        """
+        try:
+            resultStore = cls(csvFilePath)
+            if resultStore.isValid: return resultStore
+        except (IOError, OSError), e:
+            print "Failed to write the result store. The csv file is read directly: " + str(e)
+        return EPCSVColumnReader(csvFilePath)
+    
+    @staticmethod
+    def parseHeader(column):
+        """Split a csv header into key, variable name, units and frequency."""
+        column = column.strip()
+        if ':' not in column: return '', column, '', ''
+        key = ":".join(column.split(':')[:-1])
+        variable = column.split(':')[-1].split(' [')[0].split('(')[0].strip()
+        units = column.split('[')[-1].split(']')[0] if '[' in column else ''
+        frequency = column.split('(')[-1].split(')')[0] if column.endswith(')') else ''
+        return key, variable, units, frequency
+    
+    def csvStamp(self):
+        return os.path.getsize(self.csvFilePath), int(os.path.getmtime(self.csvFilePath))
+    
+    def loadIndex(self):
+        """Read the index of the store.  Returns False if the store is missing or out of date."""
+        if not os.path.isfile(self.storeFilePath): return False
+        try:
+            with open(self.storeFilePath, 'rb') as inf:
+                if inf.read(4) != self.fileTag: return False
+                indexLength = struct.unpack('<I', inf.read(4))[0]
+                index = pickle.loads(inf.read(indexLength))
+                self.dataOffset = inf.tell()
+        except Exception:
+            return False
+        if index['version'] != self.storeVersion or index['csvStamp'] != self.csvStamp(): return False
+        
+        self.header = index['header']
+        self.columnInfo = [self.parseHeader(column) for column in self.header]
+        self.rowCount = index['rowCount']
+        self.failures = index['failures']
+        self.byteorder = index['byteorder']
+        return True
+    
+    def convert(self):
+        """Parse the csv file once and write all of the columns into the binary store.
+        
+        Rows are parsed in blocks of about blockValues values.  Each block is written
+        column by column into a temporary file and the blocks of each column are then
+        copied one after the other into the store so only one block is in memory.
+        """
+        csvStamp = self.csvStamp()
+        nan = float('nan')
+        itemsize = array.array('d').itemsize
+        blockFilePath = self.storeFilePath + ".blocks"
+        tempPath = self.storeFilePath + ".tmp"
+        try:
+            with open(self.csvFilePath, 'r') as csvFile:
+                header = csvFile.readline().split(',')
+                columnCount = len(header)
+                blockRows = max(1, self.blockValues // columnCount)
+                failures = [None] * columnCount
+                blockSizes = []
+                rowCount = 0
+                with open(blockFilePath, 'wb') as blockFile:
+                    columns = [array.array('d') for column in header]
+                    for line in csvFile:
+                        row = line.split(',')
+                        for columnIndex in xrange(columnCount):
+                            try: columns[columnIndex].append(float(row[columnIndex]))
+                            except ValueError:
+                                columns[columnIndex].append(nan)
+                                if failures[columnIndex] is None: failures[columnIndex] = rowCount
+                            except IndexError:
+                                columns[columnIndex].append(nan)
+                        rowCount += 1
+                        if rowCount % blockRows == 0:
+                            for column in columns: column.tofile(blockFile)
+                            blockSizes.append(blockRows)
+                            columns = [array.array('d') for column in header]
+                    if rowCount % blockRows != 0:
+                        for column in columns: column.tofile(blockFile)
+                        blockSizes.append(rowCount % blockRows)
+                    del columns
+            
+            index = {'version': self.storeVersion, 'csvStamp': csvStamp, 'header': header,
+                     'rowCount': rowCount, 'failures': failures, 'byteorder': sys.byteorder}
+            indexData = pickle.dumps(index, pickle.HIGHEST_PROTOCOL)
+            
+            with open(tempPath, 'wb') as outf:
+                outf.write(self.fileTag)
+                outf.write(struct.pack('<I', len(indexData)))
+                outf.write(indexData)
+                with open(blockFilePath, 'rb') as blockFile:
+                    for columnIndex in xrange(columnCount):
+                        blockStart = 0
+                        for blockSize in blockSizes:
+                            values = array.array('d')
+                            blockFile.seek((blockStart * columnCount + columnIndex * blockSize) * itemsize)
+                            values.fromfile(blockFile, blockSize)
+                            values.tofile(outf)
+                            blockStart += blockSize
+            if os.path.isfile(self.storeFilePath): os.remove(self.storeFilePath)
+            os.rename(tempPath, self.storeFilePath)
+        finally:
+            for filePath in (blockFilePath, tempPath):
+                try:
+                    if os.path.isfile(filePath): os.remove(filePath)
+                except OSError: pass
+    
+    def findColumns(self, variable, key=None):
+        """Return the indices of the columns of a variable and optionally of a single key."""
+        indices = []
+        for columnIndex, info in enumerate(self.columnInfo):
+            if info[1] == variable and (key is None or info[0].upper() == key.upper()):
+                indices.append(columnIndex)
+        return indices
+    
+    def readColumns(self, columnIndices):
+        """Return a dictionary of row-aligned arrays of values and one of the first unreadable row of each column.
+        
+        Cells that can't be read are stored as nan so that the rows of different columns stay aligned.
+        The first unreadable row of a column is None if all of its cells could be read.
+        """
+        columns = {}
+        failures = {}
+        with open(self.storeFilePath, 'rb') as inf:
+            for columnIndex in sorted(set(columnIndices)):
+                values = array.array('d')
+                if columnIndex < len(self.header):
+                    inf.seek(self.dataOffset + columnIndex * self.rowCount * values.itemsize)
+                    values.fromfile(inf, self.rowCount)
+                    if self.byteorder != sys.byteorder: values.byteswap()
+                    failures[columnIndex] = self.failures[columnIndex]
+                else:
+                    values.extend([float('nan')] * self.rowCount)
+                    failures[columnIndex] = None
+                columns[columnIndex] = values
+        
+        return columns, failures
+
+
 class EPMaterialAux(object):
     
     def __init__(self):
@@ -4402,10 +5347,98 @@ class ReadEPSchedules(object):
         self.endHOY = 24
         self.unit = "unknown"
         self.comapctKeywords = ['Weekdays', 'Weekends', 'Alldays', 'AllOtherDays', 'Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+        # library entries that are used while a schedule is compiled
+        self.dependencies = None
+    
+    def recordDependency(self, libName, schName):
+        if self.dependencies == None: return
+        scheduleObj = sc.sticky[libName].get(schName.upper())
+        if scheduleObj != None: scheduleObj = dict(scheduleObj)
+        self.dependencies[(libName, schName.upper())] = scheduleObj
+    
+    @staticmethod
+    def packValues(values):
+        """Keep each distinct day profile of weekly and yearly schedules only once."""
+        if values and all(isinstance(dayValues, list) for dayValues in values):
+            profiles = []
+            profileIndex = {}
+            dayIndex = array.array('H')
+            for dayValues in values:
+                profile = tuple(dayValues)
+                if profile not in profileIndex:
+                    profileIndex[profile] = len(profiles)
+                    profiles.append(profile)
+                dayIndex.append(profileIndex[profile])
+            return tuple(profiles), dayIndex
+        
+        return None, copy.deepcopy(values)
+    
+    @staticmethod
+    def unpackValues(profiles, values):
+        if profiles == None: return copy.deepcopy(values)
+        return [list(profiles[index]) for index in values]
+    
+    def compileSchedule(self, holidays = None):
+        """Get the values of the schedule from the compiled schedules.
+        
+        Schedules are expanded once for each start day of the week and set of
+        holidays and the result is reused until the schedule or any of the
+        schedules and type limits that it refers to changes in the library.
+        
+        Args:
+            holidays: Optional list of days of the year (0-364) that use the
+                holiday schedule of yearly schedules.
+        
+        Returns:
+            The same values as getScheduleValues. The lists can be edited.
+        """
+        if holidays == None: holidays = []
+        holidays = tuple(sorted(set(holidays)))
+        key = self.schName.upper(), self.startDayOfTheWeek, holidays
+        
+        if not sc.sticky.has_key("honeybee_CompiledSchedules"):
+            sc.sticky["honeybee_CompiledSchedules"] = {}
+        compiledSchedules = sc.sticky["honeybee_CompiledSchedules"]
+        
+        compiled = compiledSchedules.get(key)
+        if compiled != None:
+            for (libName, schName), scheduleObj in compiled['dependencies'].items():
+                currentObj = sc.sticky[libName].get(schName)
+                if currentObj != None: currentObj = dict(currentObj)
+                if currentObj != scheduleObj:
+                    compiled = None
+                    break
+        
+        if compiled == None:
+            self.count = 0
+            self.dependencies = {}
+            try:
+                hourlyValues = self.getScheduleValues()
+                if hourlyValues == None: return None
+                state = self.schType, self.startHOY, self.endHOY, self.unit, self.count
+                
+                if holidays and len(hourlyValues) == 365:
+                    for startDay, endDay, holidaySchedule in self.getHolidaySchedValues():
+                        for day in holidays:
+                            if startDay - 1 <= day <= endDay - 1:
+                                hourlyValues[day] = holidaySchedule
+                
+                dependencies = self.dependencies
+            finally:
+                self.dependencies = None
+            
+            profiles, values = self.packValues(hourlyValues)
+            compiled = {'profiles': profiles, 'values': values,
+                        'state': state, 'dependencies': dependencies}
+            compiledSchedules[key] = compiled
+        
+        self.schType, self.startHOY, self.endHOY, self.unit, self.count = compiled['state']
+        return self.unpackValues(compiled['profiles'], compiled['values'])
     
     def getScheduleTypeLimitsData(self, schName):
         
         if schName == None: schName = self.schName
+        self.recordDependency("honeybee_ScheduleTypeLimitsLib", schName)
             
         schedule, comments = self.hb_EPScheduleAUX.getScheduleTypeLimitsDataByName(schName.upper(), ghenv.Component)
         try:
@@ -4633,6 +5666,7 @@ class ReadEPSchedules(object):
         if schName == None:
             schName = self.schName
         if self.hb_EPObjectsAUX.isSchedule(schName):
+            self.recordDependency("honeybee_ScheduleLib", schName)
             scheduleValues, comments = self.hb_EPScheduleAUX.getScheduleDataByName(schName.upper(), ghenv.Component)
             
             scheduleType = scheduleValues[0].lower()
@@ -6054,6 +7088,92 @@ class hb_reEvaluateHBZones(object):
 
 class hb_EPSurface(object):
     
+    # lookup tables for surface types are shared between all the surfaces.
+    # don't modify them on an instance.
+    # 4 represents an Air Wall
+    srfType = {0:'WALL',
+       0.5: 'UndergroundWall',
+       1:'ROOF',
+       1.5: 'UndergroundCeiling',
+       2:'FLOOR',
+       2.25: 'UndergroundSlab',
+       2.5: 'SlabOnGrade',
+       2.75: 'ExposedFloor',
+       3:'CEILING',
+       4:'AIRWALL',
+       5:'WINDOW',
+       6:'SHADING',
+       'WALL': 'WALL',
+       'ROOF':'ROOF',
+       'FLOOR': 'FLOOR',
+       'CEILING': 'CEILING',
+       'WINDOW':'WINDOW',
+       'SHADING': 'SHADING'}
+
+    cnstrSet = {0:'Exterior Wall',
+            0.5: 'Exterior Wall',
+            1: 'Exterior Roof',
+            1.5: 'Exterior Roof',
+            2:'Interior Floor',
+            2.25: 'Exterior Floor',
+            2.5: 'Exterior Floor',
+            2.75: 'Exterior Floor',
+            3:'Interior Ceiling',
+            4:'Air Wall',
+            5:'Exterior Window',
+            6:'Interior Wall'}
+
+    intCnstrSet = {
+            0:'Interior Wall',
+            0.5: 'Exterior Wall',
+            1:'Exterior Roof',
+            1.5:'Exterior Roof',
+            2:'Interior Floor',
+            2.25: 'Exterior Floor',
+            2.5: 'Exterior Floor',
+            2.75: 'Exterior Floor',
+            3:'Interior Ceiling',
+            4:'Air Wall',
+            5:'Interior Window',
+            6:'Interior Wall'}
+
+    srfBC = {0:'Outdoors',
+                 0.5: 'ground',
+                 1:'Outdoors',
+                 1.5: 'ground',
+                 2: 'outdoors', # this will be changed to surface once solveAdjacency is used 
+                 2.25: 'ground',
+                 2.5: 'ground',
+                 2.75: 'outdoors',
+                 3: 'outdoors', # this will be changed to surface once solveAdjacency is used 
+                 4: 'surface',
+                 5: 'Outdoors',
+                 6: 'surface'}
+
+    srfSunExposure = {0:'SunExposed',
+                 0.5:'NoSun',
+                 1:'SunExposed',
+                 1.5:'NoSun', 
+                 2:'NoSun',
+                 2.25: 'NoSun',
+                 2.5: 'NoSun',
+                 2.75: 'SunExposed',
+                 3:'NoSun',
+                 4:'NoSun',
+                 6: 'NoSun'}
+
+    srfWindExposure = {0:'WindExposed',
+                 0.5:'NoWind',
+                 1:'WindExposed',
+                 1.5:'NoWind',
+                 2:'NoWind',
+                 2.25:'NoWind',
+                 2.5:'NoWind',
+                 2.75:'WindExposed',
+                 3:'NoWind',
+                 4:'NoWind',
+                 6:'NoWind'}
+    
     def __init__(self, surface, srfNumber, srfID, *arg):
         """EP surface Class
             surface: surface geometry as a Brep
@@ -6096,90 +7216,6 @@ class hb_EPSurface(object):
         
         self.containsPVgen = False
         
-        # 4 represents an Air Wall
-        self.srfType = {0:'WALL',
-           0.5: 'UndergroundWall',
-           1:'ROOF',
-           1.5: 'UndergroundCeiling',
-           2:'FLOOR',
-           2.25: 'UndergroundSlab',
-           2.5: 'SlabOnGrade',
-           2.75: 'ExposedFloor',
-           3:'CEILING',
-           4:'AIRWALL',
-           5:'WINDOW',
-           6:'SHADING',
-           'WALL': 'WALL',
-           'ROOF':'ROOF',
-           'FLOOR': 'FLOOR',
-           'CEILING': 'CEILING',
-           'WINDOW':'WINDOW',
-           'SHADING': 'SHADING'}
-           
-        self.cnstrSet = {0:'Exterior Wall',
-                0.5: 'Exterior Wall',
-                1: 'Exterior Roof',
-                1.5: 'Exterior Roof',
-                2:'Interior Floor',
-                2.25: 'Exterior Floor',
-                2.5: 'Exterior Floor',
-                2.75: 'Exterior Floor',
-                3:'Interior Ceiling',
-                4:'Air Wall',
-                5:'Exterior Window',
-                6:'Interior Wall'}
-        
-        self.intCnstrSet = {
-                0:'Interior Wall',
-                0.5: 'Exterior Wall',
-                1:'Exterior Roof',
-                1.5:'Exterior Roof',
-                2:'Interior Floor',
-                2.25: 'Exterior Floor',
-                2.5: 'Exterior Floor',
-                2.75: 'Exterior Floor',
-                3:'Interior Ceiling',
-                4:'Air Wall',
-                5:'Interior Window',
-                6:'Interior Wall'}
-        
-        self.srfBC = {0:'Outdoors',
-                     0.5: 'ground',
-                     1:'Outdoors',
-                     1.5: 'ground',
-                     2: 'outdoors', # this will be changed to surface once solveAdjacency is used 
-                     2.25: 'ground',
-                     2.5: 'ground',
-                     2.75: 'outdoors',
-                     3: 'outdoors', # this will be changed to surface once solveAdjacency is used 
-                     4: 'surface',
-                     5: 'Outdoors',
-                     6: 'surface'}
-         
-        self.srfSunExposure = {0:'SunExposed',
-                     0.5:'NoSun',
-                     1:'SunExposed',
-                     1.5:'NoSun', 
-                     2:'NoSun',
-                     2.25: 'NoSun',
-                     2.5: 'NoSun',
-                     2.75: 'SunExposed',
-                     3:'NoSun',
-                     4:'NoSun',
-                     6: 'NoSun'}
-             
-        self.srfWindExposure = {0:'WindExposed',
-                     0.5:'NoWind',
-                     1:'WindExposed',
-                     1.5:'NoWind',
-                     2:'NoWind',
-                     2.25:'NoWind',
-                     2.5:'NoWind',
-                     2.75:'WindExposed',
-                     3:'NoWind',
-                     4:'NoWind',
-                     6:'NoWind'}
-        
         self.numOfVertices = 'autocalculate'
         
         if len(arg) == 0:
@@ -6335,15 +7371,17 @@ class hb_EPSurface(object):
             else:
                 meshPar = rc.Geometry.MeshingParameters.Smooth
         
-        self.meshedFace = rc.Geometry.Mesh.CreateFromBrep(self.geometry, meshPar)[0]
+        # the mesh is only used to extract the points and isn't kept on the surface
+        # so it doesn't get copied with the surface every time it is called from the hive.
+        meshedFace = rc.Geometry.Mesh.CreateFromBrep(self.geometry, meshPar)[0]
         
-        if self.meshedFace.IsValid or self.hasInternalEdge:
+        if meshedFace.IsValid or self.hasInternalEdge:
             if self.isPlanar and not self.hasInternalEdge:
-                plSegments = self.meshedFace.GetNakedEdges()
+                plSegments = meshedFace.GetNakedEdges()
                 segments = []
                 [segments.append(seg.ToNurbsCurve()) for seg in plSegments]
             else:
-                return self.extractMeshPts(self.meshedFace,triangulate)
+                return self.extractMeshPts(meshedFace,triangulate)
         else:
             segments = self.geometry.DuplicateEdgeCurves(True)
         
@@ -8233,6 +9271,12 @@ class thermBC(object):
 
 class viewFactorInfo(object):
     
+    # version of the binary cache format written by toFile.
+    cacheVersion = 1
+    
+    # cached view factor files are removed, least recently used first, once the cache is larger than this.
+    cacheMaxSize = 1024 ** 3
+    
     def __init__(self, testPtViewFactor=None, zoneSrfNames=None, testPtSkyView=None, testPtBlockedVec=None, testPtZoneWeights=None, \
     testPtZoneNames=None, ptHeightWeights=None, zoneInletInfo=None, zoneHasWindows=None, outdoorIsThere=None, outdoorNonSrfViewFac=None, \
     outdoorPtHeightWeights=None, testPtBlockName=None, zoneWindowTransmiss=None, zoneWindowNames=None, finalFloorRefList=None, \
@@ -8287,10 +9331,238 @@ class viewFactorInfo(object):
         self.outdoorPtHeightWeights, self.testPtBlockName, self.zoneWindowTransmiss, self.zoneWindowNames, self.finalFloorRefList, \
         self.constantTransmis, self.finalAddShdTransmiss]
     
+    def toFile(self, filePath):
+        """Write all of the view factor properties into a compact binary file."""
+        # a unique temporary file so studies that write the same cache file at once don't collide
+        tempFile, tempPath = tempfile.mkstemp(suffix = ".tmp", dir = os.path.dirname(filePath))
+        try:
+            with os.fdopen(tempFile, 'wb') as outf:
+                pickle.dump((self.cacheVersion, self.recallAllProps()), outf, pickle.HIGHEST_PROTOCOL)
+            if os.path.isfile(filePath): os.remove(filePath)
+            os.rename(tempPath, filePath)
+        finally:
+            if os.path.isfile(tempPath): os.remove(tempPath)
+        pruneCacheFolder(os.path.dirname(filePath), ".vfi", self.cacheMaxSize, filePath)
+    
+    @classmethod
+    def fromFile(cls, filePath):
+        """Load view factor properties that were written with toFile.
+        
+        Returns None if the file does not exist, is corrupted or was written
+        by a different version of the format.
+        """
+        if not os.path.isfile(filePath): return None
+        try:
+            with open(filePath, 'rb') as inf:
+                version, props = pickle.load(inf)
+        except Exception:
+            return None
+        if version != cls.cacheVersion: return None
+        # mark the file as used so it is the last to be pruned
+        try: os.utime(filePath, None)
+        except: pass
+        return cls(*props)
+    
+    @staticmethod
+    def getCacheFilePath(cacheKey):
+        """Return the path to the cached view factor file for a hash of the calculation inputs."""
+        cacheFolder = os.path.join(sc.sticky["Honeybee_DefaultFolder"], "viewFactorCache")
+        if not os.path.isdir(cacheFolder): os.makedirs(cacheFolder)
+        return os.path.join(cacheFolder, cacheKey + ".vfi")
+    
     def __str__(self):
         return 'View Factor Info' + '\nNumber of Points: ' + str(self.NumPts)
 
 
+class hb_RayBVH(object):
+    """
+    A bounding volume hierarchy over the triangles of a list of meshes.
+    
+    Every triangle is tagged with the index of the mesh that it came from so that
+    a single traversal can return the closest mesh that a ray hits or all of the
+    meshes along the ray. The hierarchy is read-only once built and can be shared
+    between threads.
+    """
+    
+    def __init__(self, meshes, leafSize = 4):
+        self.meshCount = len(meshes)
+        self.leafSize = leafSize
+        self.epsilon = 1e-12
+        
+        # triangles are stored as [v0, edge1, edge2] (9 floats) with a mesh tag.
+        self.triData = []
+        self.triTags = []
+        for meshCount, mesh in enumerate(meshes):
+            if mesh is None: continue
+            self.addMeshTriangles(mesh, meshCount)
+        
+        # nodes are stored in flat lists: 6 floats for the bounding box and
+        # [left, right] for inner nodes or [-start-1, end] for leaves.
+        self.nodeBounds = []
+        self.nodeChildren = []
+        self.triOrder = range(len(self.triTags))
+        if len(self.triTags) != 0:
+            self.build()
+    
+    def addMeshTriangles(self, mesh, tag):
+        vertices = [(float(v.X), float(v.Y), float(v.Z)) for v in mesh.Vertices]
+        for face in mesh.Faces:
+            if face.IsQuad: triangles = ((face.A, face.B, face.C), (face.A, face.C, face.D))
+            else: triangles = ((face.A, face.B, face.C),)
+            for a, b, c in triangles:
+                ax, ay, az = vertices[a]
+                bx, by, bz = vertices[b]
+                cx, cy, cz = vertices[c]
+                self.triData.extend((ax, ay, az, bx-ax, by-ay, bz-az, cx-ax, cy-ay, cz-az))
+                self.triTags.append(tag)
+    
+    def triangleBounds(self, triIndex):
+        i = triIndex*9
+        d = self.triData
+        xs = (d[i], d[i]+d[i+3], d[i]+d[i+6])
+        ys = (d[i+1], d[i+1]+d[i+4], d[i+1]+d[i+7])
+        zs = (d[i+2], d[i+2]+d[i+5], d[i+2]+d[i+8])
+        return min(xs), min(ys), min(zs), max(xs), max(ys), max(zs)
+    
+    def build(self):
+        # use an explicit stack to avoid hitting the recursion limit on big models.
+        triBounds = [self.triangleBounds(i) for i in range(len(self.triTags))]
+        stack = [(0, len(self.triOrder), 0)]
+        self.nodeBounds.extend([0.0]*6)
+        self.nodeChildren.extend([0, 0])
+        
+        while stack:
+            start, end, nodeIndex = stack.pop()
+            tris = self.triOrder[start:end]
+            bounds = [min(triBounds[t][0] for t in tris), min(triBounds[t][1] for t in tris), \
+                      min(triBounds[t][2] for t in tris), max(triBounds[t][3] for t in tris), \
+                      max(triBounds[t][4] for t in tris), max(triBounds[t][5] for t in tris)]
+            self.nodeBounds[nodeIndex*6:nodeIndex*6+6] = bounds
+            
+            if end - start <= self.leafSize:
+                self.nodeChildren[nodeIndex*2:nodeIndex*2+2] = [-start-1, end]
+                continue
+            
+            # split at the median of the triangle centers along the longest axis.
+            axis = max(range(3), key=lambda ax: bounds[ax+3] - bounds[ax])
+            tris.sort(key=lambda t: triBounds[t][axis] + triBounds[t][axis+3])
+            self.triOrder[start:end] = tris
+            mid = (start + end)//2
+            
+            leftIndex = len(self.nodeBounds)//6
+            rightIndex = leftIndex + 1
+            self.nodeBounds.extend([0.0]*12)
+            self.nodeChildren.extend([0, 0, 0, 0])
+            self.nodeChildren[nodeIndex*2:nodeIndex*2+2] = [leftIndex, rightIndex]
+            stack.append((start, mid, leftIndex))
+            stack.append((mid, end, rightIndex))
+    
+    def rayBoxDistance(self, nodeIndex, ox, oy, oz, invX, invY, invZ):
+        """Return the ray parameter where the ray enters the node box or -1 if it misses it."""
+        b = self.nodeBounds
+        i = nodeIndex*6
+        tMin = 0.0
+        tMax = float("inf")
+        for o, inv, lo, hi in ((ox, invX, b[i], b[i+3]), (oy, invY, b[i+1], b[i+4]), (oz, invZ, b[i+2], b[i+5])):
+            if inv is None:
+                if o < lo or o > hi: return -1
+                continue
+            t1 = (lo - o)*inv
+            t2 = (hi - o)*inv
+            if t1 > t2: t1, t2 = t2, t1
+            if t1 > tMin: tMin = t1
+            if t2 < tMax: tMax = t2
+            if tMin > tMax: return -1
+        return tMin
+    
+    def rayTriangle(self, triIndex, ox, oy, oz, dx, dy, dz):
+        """Moller-Trumbore intersection. Return the ray parameter of the hit or -1."""
+        d = self.triData
+        i = triIndex*9
+        e1x, e1y, e1z = d[i+3], d[i+4], d[i+5]
+        e2x, e2y, e2z = d[i+6], d[i+7], d[i+8]
+        px = dy*e2z - dz*e2y
+        py = dz*e2x - dx*e2z
+        pz = dx*e2y - dy*e2x
+        det = e1x*px + e1y*py + e1z*pz
+        if -self.epsilon < det < self.epsilon: return -1
+        invDet = 1.0/det
+        sx = ox - d[i]
+        sy = oy - d[i+1]
+        sz = oz - d[i+2]
+        u = (sx*px + sy*py + sz*pz)*invDet
+        if u < 0 or u > 1: return -1
+        qx = sy*e1z - sz*e1y
+        qy = sz*e1x - sx*e1z
+        qz = sx*e1y - sy*e1x
+        v = (dx*qx + dy*qy + dz*qz)*invDet
+        if v < 0 or u + v > 1: return -1
+        t = (e2x*qx + e2y*qy + e2z*qz)*invDet
+        if t < 0: return -1
+        return t
+    
+    def traverse(self, origin, direction, callback):
+        """Walk the hierarchy along the ray and call callback(t, tag) for each hit.
+        
+        The callback returns the farthest ray parameter that is still of interest
+        so nodes beyond it are skipped. A negative value stops the traversal.
+        """
+        if len(self.triTags) == 0: return
+        ox, oy, oz = float(origin.X), float(origin.Y), float(origin.Z)
+        dx, dy, dz = float(direction.X), float(direction.Y), float(direction.Z)
+        invX = 1.0/dx if dx != 0 else None
+        invY = 1.0/dy if dy != 0 else None
+        invZ = 1.0/dz if dz != 0 else None
+        
+        maxDist = float("inf")
+        stack = [0]
+        while stack:
+            nodeIndex = stack.pop()
+            entry = self.rayBoxDistance(nodeIndex, ox, oy, oz, invX, invY, invZ)
+            if entry == -1 or entry > maxDist: continue
+            first, second = self.nodeChildren[nodeIndex*2:nodeIndex*2+2]
+            if first < 0:
+                for triIndex in self.triOrder[-first-1:second]:
+                    t = self.rayTriangle(triIndex, ox, oy, oz, dx, dy, dz)
+                    if t != -1:
+                        maxDist = callback(t, self.triTags[triIndex])
+                        if maxDist < 0: return
+            else:
+                stack.append(second)
+                stack.append(first)
+    
+    def closestHit(self, origin, direction):
+        """Return (t, meshIndex) of the closest mesh hit by the ray or (-1, None).
+        
+        On an exact tie the mesh that comes first in the input list wins.
+        """
+        best = [-1, None]
+        def onHit(t, tag):
+            if best[0] == -1 or t < best[0] or (t == best[0] and tag < best[1]):
+                best[0], best[1] = t, tag
+            return best[0]
+        self.traverse(origin, direction, onHit)
+        return best[0], best[1]
+    
+    def meshesHit(self, origin, direction, blockingCount = 0):
+        """Return (isBlocked, hitMeshIndices) for all meshes along the ray.
+        
+        Meshes with an index below blockingCount are treated as opaque and stop
+        the traversal as soon as one of them is hit. The other indices are
+        returned sorted so that they can be matched with per-mesh properties.
+        """
+        hits = set()
+        blocked = [False]
+        def onHit(t, tag):
+            if tag < blockingCount:
+                blocked[0] = True
+                return -1
+            hits.add(tag)
+            return float("inf")
+        self.traverse(origin, direction, onHit)
+        return blocked[0], sorted(hits)
+
+
 class hb_Hive(object):
     
     class CopyClass(object):
@@ -8403,17 +9675,99 @@ class hb_Hive(object):
         HBID = '{}#{}'.format(baseKey, key)
         return 'Honeybee View Factor Info - ' + HBID
     
-    def callFromHoneybeeHive(self, geometryList):
+    def copyHBObject(self, HBObject):
+        """Return a deep copy of a Honeybee object that is stored in the hive.
+        
+        Boundary condition objects are shared between the original object and the copy.
+        """
+        # after the first round meshedFace makes copy.deepcopy crash
+        # so I need to regenerate meshFaces
+        bc = []
+        if HBObject.objectType == "HBZone":
+            for surface in HBObject.surfaces:
+                newMesh = rc.Geometry.Mesh()
+                newMesh.Append(surface.meshedFace)
+                surface.meshedFace = newMesh
+
+                # keep track of boundary conditions
+                # and then set them to None not to create
+                # memory issues for large models.
+                bc.append(copy.copy(surface.BCObject))
+                surface.BCObject = None
+                for csrf in surface.childSrfs:
+                    bc.append(copy.copy(csrf.BCObject))
+                    csrf.BCObject = None
+
+        elif HBObject.objectType == "HBSurface": 
+            newMesh = rc.Geometry.Mesh()
+            newMesh.Append(HBObject.meshedFace)
+            HBObject.meshedFace = newMesh
+            # keep track of boundary conditions
+            # and then set them to None not to create
+            # memory issues for large models.
+            bc.append(copy.copy(HBObject.BCObject))
+            HBObject.BCObject = None
+            for csrf in HBObject.childSrfs:
+                bc.append(copy.copy(csrf.BCObject))
+                csrf.BCObject = None                    
+
+        newObject = copy.deepcopy(HBObject)
+
+        # put the boundary condition objects back
+        count = 0
+        if HBObject.objectType == "HBZone":
+            for c, surface in enumerate(newObject.surfaces):
+                surface.BCObject = bc[count]
+                HBObject.surfaces[c].BCObject = bc[count]
+                count += 1
+                for cc, csrf in enumerate(surface.childSrfs):
+                    csrf.BCObject = bc[count]
+                    HBObject.surfaces[c].childSrfs[cc].BCObject = bc[count]
+                    count += 1
+
+        elif HBObject.objectType == "HBSurface": 
+            newObject.BCObject = bc[count]
+            HBObject.BCObject = bc[count]
+            count += 1
+            for cc, csrf in enumerate(newObject.childSrfs):
+                csrf.BCObject = bc[count]
+                HBObject.childSrfs[cc].BCObject = bc[count]
+                count += 1
+
+        del(bc)
+        return newObject
+    
+    @staticmethod
+    def getHBID(geometry):
+        """Return the Honeybee ID of a geometry or a string that is called from the hive.
+        
+        Objects get a new ID every time they are added to the hive so the ID changes
+        whenever the object is changed.
+        """
+        try:
+            hbkey = geometry.UserDictionary['HBID']
+        except:
+            hbkey = geometry.split(' ')[-1]
+        
+        if '#' not in hbkey:
+            raise Exception('Honeybee version mismatch! Update the input component.')
+        
+        return hbkey
+    
+    def callFromHoneybeeHive(self, geometryList, readOnly = False):
+        """Call Honeybee objects from the hive.
+        
+        Args:
+            geometryList: List of geometries or strings with a Honeybee ID.
+            readOnly: Set to True to get the objects that are stored in the hive
+                instead of deep copies. This is much faster for large models but
+                the objects are shared with the component that created them so
+                they shouldn't be modified. Use copyHBObject to get a copy of
+                the objects that has to be modified.
+        """
         HBObjects = []
         for geometry in geometryList:
-            try:
-                hbkey = geometry.UserDictionary['HBID']
-            except:
-                hbkey = geometry.split(' ')[-1]
-            
-            if '#' not in hbkey:
-                raise Exception('Honeybee version mismatch! Update the input component.')
-                
+            hbkey = self.getHBID(geometry)
             baseKey, key = hbkey.split('#')[0], '#'.join(hbkey.split('#')[1:])
             
             if sc.sticky['HBHive'].has_key(baseKey):
@@ -8425,63 +9779,12 @@ class hb_Hive(object):
                 except:
                     pass
                 
+                if readOnly:
+                    HBObjects.append(HBObject)
+                    continue
+                
                 try:
-                    # after the first round meshedFace makes copy.deepcopy crash
-                    # so I need to regenerate meshFaces
-                    bc = []
-                    if HBObject.objectType == "HBZone":
-                        for surface in HBObject.surfaces:
-                            newMesh = rc.Geometry.Mesh()
-                            newMesh.Append(surface.meshedFace)
-                            surface.meshedFace = newMesh
-                            
-                            # keep track of boundary conditions
-                            # and then set them to None not to create
-                            # memory issues for large models.
-                            bc.append(copy.copy(surface.BCObject))
-                            surface.BCObject = None
-                            for csrf in surface.childSrfs:
-                                bc.append(copy.copy(csrf.BCObject))
-                                csrf.BCObject = None
-                                
-                    elif HBObject.objectType == "HBSurface": 
-                        newMesh = rc.Geometry.Mesh()
-                        newMesh.Append(HBObject.meshedFace)
-                        HBObject.meshedFace = newMesh
-                        # keep track of boundary conditions
-                        # and then set them to None not to create
-                        # memory issues for large models.
-                        bc.append(copy.copy(HBObject.BCObject))
-                        HBObject.BCObject = None
-                        for csrf in HBObject.childSrfs:
-                            bc.append(copy.copy(csrf.BCObject))
-                            csrf.BCObject = None                    
-                    
-                    newObject = copy.deepcopy(HBObject)
-                    
-                    # put the boundary condition objects back
-                    count = 0
-                    if HBObject.objectType == "HBZone":
-                        for c, surface in enumerate(newObject.surfaces):
-                            surface.BCObject = bc[count]
-                            HBObject.surfaces[c].BCObject = bc[count]
-                            count += 1
-                            for cc, csrf in enumerate(surface.childSrfs):
-                                csrf.BCObject = bc[count]
-                                HBObject.surfaces[c].childSrfs[cc].BCObject = bc[count]
-                                count += 1
-                                
-                    elif HBObject.objectType == "HBSurface": 
-                        newObject.BCObject = bc[count]
-                        HBObject.BCObject = bc[count]
-                        count += 1
-                        for cc, csrf in enumerate(newObject.childSrfs):
-                            csrf.BCObject = bc[count]
-                            HBObject.childSrfs[cc].BCObject = bc[count]
-                            count += 1
-                    
-                    HBObjects.append(newObject)
-                    del(bc)
+                    HBObjects.append(self.copyHBObject(HBObject))
                 except Exception, e:
                     print `e`
                     print "Failed to copy the object. Returning the original objects...\n" +\
@@ -8495,14 +9798,7 @@ class hb_Hive(object):
     def visualizeFromHoneybeeHive(self, geometryList):
         HBObjects = []
         for geometry in geometryList:
-            try:
-                hbkey = geometry.UserDictionary['HBID']
-            except:
-                hbkey = geometry.split(' ')[-1]
-            
-            if '#' not in hbkey:
-                raise Exception('Honeybee version mismatch! Update the input component.')
-                
+            hbkey = self.getHBID(geometry)
             baseKey, key = hbkey.split('#')[0], '#'.join(hbkey.split('#')[1:])
             
             if sc.sticky['HBHive'].has_key(baseKey):
@@ -8637,6 +9933,497 @@ class CalculateGridBasedDLAnalysisResults(object):
             result.append(res)
         return result
 
+class hb_SunOcclusion(object):
+    """
+    Sun vector visibility shared by the shading and comfort components.
+    
+    Sun vectors are rounded and deduplicated before any ray is cast, sky patches
+    are found from the altitude and azimuth of the vectors instead of intersecting
+    every patch and the visibility of all the test points to all the unique sun
+    vectors is calculated in one pass. The result is kept in
+    sc.sticky["honeybee_SunOcclusionCache"] so a rerun with the same points,
+    vectors and context doesn't cast any rays.
+    
+    Usage:
+        hb_sunOcclusion = sc.sticky["honeybee_SunOcclusion"]()
+        visibility = hb_sunOcclusion.visibility(testPts, sunVectors, contextMeshes)
+        if visibility.isVisible(ptCount, vecCount): ...
+    """
+    
+    # number of results that are kept in the cache
+    cacheSize = 8
+    
+    class Visibility(object):
+        """Points x sun vectors visibility as one bitset per point."""
+        
+        def __init__(self, vectorIndex, numOfUniqueVectors, rows):
+            self.vectorIndex = vectorIndex
+            self.numOfUniqueVectors = numOfUniqueVectors
+            self.rows = rows
+        
+        def isVisible(self, ptCount, vecCount):
+            index = self.vectorIndex[vecCount]
+            if index < 0: return False
+            return bool(self.rows[ptCount][index >> 3] & (1 << (index & 7)))
+    
+    @staticmethod
+    def vectorKey(vector, digits = 6):
+        length = math.sqrt(vector.X ** 2 + vector.Y ** 2 + vector.Z ** 2)
+        return round(vector.X / length, digits), round(vector.Y / length, digits), \
+               round(vector.Z / length, digits)
+    
+    def uniqueVectors(self, vectors):
+        """Remove the duplicated vectors.
+        
+        Returns:
+            uniqueVectors: List of unique vectors.
+            vectorIndex: Index of each input vector in uniqueVectors. None and zero
+                length vectors get -1.
+        """
+        uniqueVectors = []
+        vectorIndex = array.array('i')
+        keys = {}
+        for vector in vectors:
+            if vector == None or vector.IsZero:
+                vectorIndex.append(-1)
+                continue
+            key = self.vectorKey(vector)
+            if key not in keys:
+                keys[key] = len(uniqueVectors)
+                uniqueVectors.append(vector)
+            vectorIndex.append(keys[key])
+        return uniqueVectors, vectorIndex
+    
+    def skyPatchIndices(self, skyPatchMeshes, vectors):
+        """Find the sky patch of each vector from its altitude and azimuth.
+        
+        The bands of the sky dome are found from the vertices of the patch meshes so
+        the result follows the sky that is passed in and matches intersecting the
+        vectors with the patches from the center of the dome.
+        
+        Returns:
+            A list with the index of the patch for each vector or None if the vector
+            doesn't point to any of the patches.
+        """
+        bands = {}
+        for patchCount, patch in enumerate(skyPatchMeshes):
+            altitudes = []
+            x = y = 0
+            for vertex in patch.Vertices:
+                radius = math.sqrt(vertex.X ** 2 + vertex.Y ** 2 + vertex.Z ** 2)
+                altitudes.append(math.asin(max(-1, min(1, vertex.Z / radius))))
+                x += vertex.X
+                y += vertex.Y
+            bandKey = round(min(altitudes), 6), round(max(altitudes), 6)
+            bands.setdefault(bandKey, []).append((math.atan2(y, x), patchCount))
+        
+        bandKeys = sorted(bands.keys())
+        for bandKey in bandKeys: bands[bandKey].sort()
+        
+        uniqueVectors, vectorIndex = self.uniqueVectors(vectors)
+        uniquePatches = []
+        for vector in uniqueVectors:
+            length = math.sqrt(vector.X ** 2 + vector.Y ** 2 + vector.Z ** 2)
+            altitude = math.asin(max(-1, min(1, vector.Z / length)))
+            azimuth = math.atan2(vector.Y, vector.X)
+            patchIndex = None
+            for minAlt, maxAlt in bandKeys:
+                if minAlt - 1e-9 <= altitude <= maxAlt + 1e-9:
+                    band = bands[(minAlt, maxAlt)]
+                    # the patches of a band are equally wide so the closest center wins
+                    closest = min(band, key = lambda patch: abs(math.atan2(math.sin(azimuth - patch[0]), math.cos(azimuth - patch[0]))))
+                    patchIndex = closest[1]
+                    break
+            uniquePatches.append(patchIndex)
+        
+        return [uniquePatches[index] if index >= 0 else None for index in vectorIndex]
+    
+    def cacheKey(self, points, uniqueVectors, contextMesh):
+        hasher = hashlib.md5()
+        coordinates = array.array('d')
+        for pt in points: coordinates.extend((pt.X, pt.Y, pt.Z))
+        hasher.update(coordinates.tostring())
+        hasher.update(repr([self.vectorKey(vector) for vector in uniqueVectors]))
+        if contextMesh != None:
+            coordinates = array.array('d')
+            for vertex in contextMesh.Vertices: coordinates.extend((vertex.X, vertex.Y, vertex.Z))
+            hasher.update(coordinates.tostring())
+            hasher.update(repr([(face.A, face.B, face.C, face.D) for face in contextMesh.Faces]))
+        return hasher.hexdigest()
+    
+    def visibility(self, points, vectors, contextMeshes = None, parallel = True):
+        """Check if the points can see the sun vectors past the context meshes.
+        
+        Args:
+            points: List of test points.
+            vectors: List of sun vectors. None is never visible.
+            contextMeshes: List of context meshes. All the vectors are visible if empty.
+            parallel: Set to True to cast the rays in parallel.
+        
+        Returns:
+            A Visibility object.
+        """
+        uniqueVectors, vectorIndex = self.uniqueVectors(vectors)
+        
+        contextMesh = None
+        if contextMeshes:
+            contextMesh = rc.Geometry.Mesh()
+            for mesh in contextMeshes: contextMesh.Append(mesh)
+        
+        if not sc.sticky.has_key("honeybee_SunOcclusionCache"):
+            sc.sticky["honeybee_SunOcclusionCache"] = []
+        cache = sc.sticky["honeybee_SunOcclusionCache"]
+        
+        key = self.cacheKey(points, uniqueVectors, contextMesh)
+        for cachedKey, cachedRows in cache:
+            if cachedKey == key:
+                return self.Visibility(vectorIndex, len(uniqueVectors), cachedRows)
+        
+        numOfBytes = (len(uniqueVectors) + 7) // 8
+        rows = [None] * len(points)
+        
+        def castRays(ptCount):
+            pt = points[ptCount]
+            row = bytearray(numOfBytes)
+            for index, vector in enumerate(uniqueVectors):
+                if contextMesh == None or \
+                   rc.Geometry.Intersect.Intersection.MeshRay(contextMesh, rc.Geometry.Ray3d(pt, vector)) < 0:
+                    row[index >> 3] |= 1 << (index & 7)
+            rows[ptCount] = row
+        
+        if parallel:
+            tasks.Parallel.ForEach(range(len(points)), castRays)
+        else:
+            for ptCount in range(len(points)): castRays(ptCount)
+        
+        cache.append((key, rows))
+        if len(cache) > self.cacheSize: del cache[0]
+        
+        return self.Visibility(vectorIndex, len(uniqueVectors), rows)
+
+
+class hb_EPSimulationCache(object):
+    """
+    Results of EnergyPlus simulations stored by the content of their inputs.
+    
+    The key of a simulation is a hash of the normalized idf (comments, white space
+    around the fields and letter case are ignored, and files that the idf refers to
+    are hashed by content), the epw file and the EnergyPlus version (the IDD version and
+    the size and date of the executable in the EnergyPlus folder). The result files
+    of a successful run are copied to <Honeybee default folder>\simulationCache\<key>
+    and are copied back when the same inputs are simulated again. The least recently
+    used simulations are removed once the cache is larger than maxSize.
+    
+    Usage:
+        hb_simulationCache = sc.sticky["honeybee_EPSimulationCache"]()
+        cacheKey = hb_simulationCache.key(idfFilePath, epwFilePath, EPPath)
+        if not hb_simulationCache.restore(cacheKey, fullPath):
+            # run the simulation
+            hb_simulationCache.store(cacheKey, fullPath)
+        print hb_simulationCache.report()
+    """
+    
+    # files that EnergyPlus writes next to fullPath
+    resultExtensions = ('.csv', '.eio', '.err', '.rdd', '.mdd', '.sql', 'Table.html', \
+                        'Table.csv', 'Zsz.csv', 'Ssz.csv', 'Meter.csv')
+    
+    maxSize = 5 * 1024 ** 3
+    
+    lock = threading.Lock()
+    
+    def __init__(self, cacheFolder = None, maxSize = None):
+        if cacheFolder == None:
+            cacheFolder = os.path.join(sc.sticky["Honeybee_DefaultFolder"], "simulationCache")
+        self.cacheFolder = cacheFolder
+        if maxSize != None: self.maxSize = maxSize
+        self.indexFile = os.path.join(cacheFolder, "index.json")
+    
+    @staticmethod
+    def hashFile(filePath, hasher):
+        with open(filePath, 'rb') as inf:
+            for chunk in iter(lambda: inf.read(1 << 20), ""):
+                hasher.update(chunk)
+    
+    def key(self, idfFilePath, epwFilePath, EPPath):
+        hasher = hashlib.md5()
+        with open(idfFilePath, 'r') as idfFile:
+            lines = [line.split('!')[0] for line in idfFile]
+        for field in re.split(r'([,;])', ''.join(lines)):
+            field = field.strip()
+            if not field: continue
+            hasher.update(field.lower() + '\n')
+            # schedule files and other files that the idf refers to
+            if ('\\' in field or '/' in field) and os.path.isfile(field):
+                self.hashFile(field, hasher)
+        
+        self.hashFile(epwFilePath, hasher)
+        hasher.update(self.engineVersion(EPPath))
+        return hasher.hexdigest()
+    
+    @staticmethod
+    def engineVersion(EPPath):
+        """Identify the EnergyPlus engine by its IDD version and the size and date of its executable.
+        
+        The folder name isn't enough since OpenStudio installs keep EnergyPlus in a folder
+        that is named EnergyPlus for every version.
+        """
+        version = [os.path.normcase(os.path.normpath(EPPath))]
+        try:
+            with open(os.path.join(EPPath, 'Energy+.idd'), 'r') as iddFile:
+                for lineCount, line in enumerate(iddFile):
+                    if line.startswith('!IDD_Version') or line.startswith('!IDD_BUILD'): version.append(line.strip())
+                    if lineCount > 10: break
+        except: pass
+        for exeName in ('energyplus.exe', 'EnergyPlus.exe', 'energyplus'):
+            exeFilePath = os.path.join(EPPath, exeName)
+            if os.path.isfile(exeFilePath):
+                version.append('%s:%d:%d'%(exeName, os.path.getsize(exeFilePath), int(os.path.getmtime(exeFilePath))))
+                break
+        return '|'.join(version)
+    
+    def readIndex(self):
+        try:
+            with open(self.indexFile, 'r') as inf:
+                return json.load(inf)
+        except:
+            return {'entries': {}, 'stats': {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}}
+    
+    def writeIndex(self, index):
+        if not os.path.isdir(self.cacheFolder): os.makedirs(self.cacheFolder)
+        with open(self.indexFile + '.tmp', 'w') as outf:
+            json.dump(index, outf)
+        if os.path.isfile(self.indexFile): os.remove(self.indexFile)
+        os.rename(self.indexFile + '.tmp', self.indexFile)
+    
+    def restore(self, key, fullPath):
+        """Copy the cached results to fullPath + extension.
+        
+        Returns:
+            True if the simulation was in the cache.
+        """
+        with self.lock:
+            index = self.readIndex()
+            entry = index['entries'].get(key)
+            entryFolder = os.path.join(self.cacheFolder, key)
+            if entry != None and all(os.path.isfile(os.path.join(entryFolder, 'eplusout' + ext)) for ext in entry['files']):
+                for ext in entry['files']:
+                    shutil.copyfile(os.path.join(entryFolder, 'eplusout' + ext), fullPath + ext)
+                entry['lastUsed'] = time.time()
+                index['stats']['hits'] += 1
+                self.writeIndex(index)
+                return True
+            
+            index['stats']['misses'] += 1
+            self.writeIndex(index)
+            return False
+    
+    def store(self, key, fullPath):
+        """Copy the results of a successful run at fullPath to the cache."""
+        errFile = fullPath + '.err'
+        if not os.path.isfile(errFile): return False
+        with open(errFile, 'r') as inf:
+            errStr = inf.read()
+        if "EnergyPlus Completed Successfully" not in errStr or "**  Fatal  **" in errStr:
+            return False
+        
+        with self.lock:
+            index = self.readIndex()
+            entryFolder = os.path.join(self.cacheFolder, key)
+            if os.path.isdir(entryFolder): shutil.rmtree(entryFolder, True)
+            os.makedirs(entryFolder)
+            
+            files, size = [], 0
+            for ext in self.resultExtensions:
+                if os.path.isfile(fullPath + ext):
+                    shutil.copyfile(fullPath + ext, os.path.join(entryFolder, 'eplusout' + ext))
+                    files.append(ext)
+                    size += os.path.getsize(fullPath + ext)
+            
+            index['entries'][key] = {'files': files, 'size': size, 'lastUsed': time.time()}
+            index['stats']['stores'] += 1
+            self.evict(index)
+            self.writeIndex(index)
+        return True
+    
+    def evict(self, index):
+        """Remove the least recently used simulations until the cache fits in maxSize."""
+        entries = index['entries']
+        totalSize = sum(entry['size'] for entry in entries.values())
+        for key in sorted(entries.keys(), key = lambda key: entries[key]['lastUsed']):
+            if totalSize <= self.maxSize: break
+            totalSize -= entries[key]['size']
+            del entries[key]
+            shutil.rmtree(os.path.join(self.cacheFolder, key), True)
+            index['stats']['evictions'] += 1
+    
+    def statistics(self):
+        index = self.readIndex()
+        stats = dict(index['stats'])
+        stats['entries'] = len(index['entries'])
+        stats['size'] = sum(entry['size'] for entry in index['entries'].values())
+        return stats
+    
+    def report(self):
+        stats = self.statistics()
+        return "Simulation cache: %d simulations, %.1f MB of %.1f MB. %d hits, %d misses, %d stored, %d evicted."% \
+               (stats['entries'], stats['size'] / 1024.0 ** 2, self.maxSize / 1024.0 ** 2, \
+                stats['hits'], stats['misses'], stats['stores'], stats['evictions'])
+
+
+class hb_ComfortMatrixFile(object):
+    """
+    Binary file of an hourly comfort matrix.
+    
+    A comfort matrix is a header string (data type;analysis period start;end)
+    followed by one row of point values for each hour. The binary file keeps the
+    header string, data type, analysis period, hour count and point count in a small
+    header and then the values as doubles ordered by hour (4-byte floats can be
+    requested when exact values aren't needed). An hour or a point
+    is read from its offset in the file (memory-mapped when possible) without
+    reading the rest of the matrix.
+    
+    Usage:
+        hb_matrixFile = sc.sticky["honeybee_ComfortMatrixFile"]
+        hb_matrixFile.write(resultFilePath, comfResultsMtx)
+        if hb_matrixFile.isMatrixFile(resultFilePath):
+            comfResultsMtx = hb_matrixFile(resultFilePath).read(hours = range(24))
+    """
+    
+    # version of the binary format.
+    fileVersion = 1
+    fileTag = 'HBCM'
+    extension = '.hbmtx'
+    typecode = 'd'
+    
+    def __init__(self, filePath):
+        self.filePath = filePath
+        with open(filePath, 'rb') as inf:
+            if inf.read(4) != self.fileTag: raise ValueError("%s is not a Honeybee matrix file."%filePath)
+            headerLength = struct.unpack('<I', inf.read(4))[0]
+            header = pickle.loads(inf.read(headerLength))
+            self.dataOffset = inf.tell()
+        if header['version'] != self.fileVersion:
+            raise ValueError("%s was written with another version of Honeybee."%filePath)
+        
+        self.header = header['header']
+        self.dataType = header['dataType']
+        self.analysisPeriod = header['analysisPeriod']
+        self.hourCount = header['hourCount']
+        self.pointCount = header['pointCount']
+        self.rowLengths = header['rowLengths']
+        self.typecode = header['typecode']
+        self.byteorder = header['byteorder']
+        self.itemsize = array.array(self.typecode).itemsize
+    
+    @classmethod
+    def isMatrixFile(cls, filePath):
+        try:
+            with open(filePath, 'rb') as inf:
+                return inf.read(4) == cls.fileTag
+        except Exception:
+            return False
+    
+    @staticmethod
+    def parseHeader(headerStr):
+        """Return the data type and the analysis period in the header string of a matrix."""
+        headerItems = headerStr.split(';')
+        try:
+            analysisPeriod = tuple(tuple(int(val) for val in re.findall(r'-?\d+', item)) for item in headerItems[1:3])
+            if len(analysisPeriod) != 2: analysisPeriod = None
+        except Exception:
+            analysisPeriod = None
+        return headerItems[0], analysisPeriod
+    
+    @classmethod
+    def write(cls, filePath, matrix, typecode = None):
+        """Write a comfort matrix (header string followed by a list of values for each hour).
+        
+        Values are written as doubles. Set typecode to 'f' to write 4-byte floats instead.
+        The typecode is kept in the header.
+        """
+        if typecode == None: typecode = cls.typecode
+        rows = matrix[1:]
+        pointCount = max([len(row) for row in rows] + [0])
+        # rows are padded to the same length. Their lengths are only kept if they differ.
+        rowLengths = [len(row) for row in rows]
+        if rowLengths.count(pointCount) == len(rowLengths): rowLengths = None
+        
+        dataType, analysisPeriod = cls.parseHeader(matrix[0])
+        header = {'version': cls.fileVersion, 'header': matrix[0], 'dataType': dataType,
+                  'analysisPeriod': analysisPeriod, 'hourCount': len(rows), 'pointCount': pointCount,
+                  'rowLengths': rowLengths, 'typecode': typecode, 'byteorder': sys.byteorder}
+        headerData = pickle.dumps(header, pickle.HIGHEST_PROTOCOL)
+        
+        nan = float('nan')
+        tempPath = filePath + ".tmp"
+        with open(tempPath, 'wb') as outf:
+            outf.write(cls.fileTag)
+            outf.write(struct.pack('<I', len(headerData)))
+            outf.write(headerData)
+            for row in rows:
+                values = array.array(typecode, row)
+                if len(values) < pointCount: values.extend([nan] * (pointCount - len(values)))
+                values.tofile(outf)
+        if os.path.isfile(filePath): os.remove(filePath)
+        os.rename(tempPath, filePath)
+        return filePath
+    
+    def openData(self, inf):
+        """Memory-map the file if the platform supports it.  Otherwise the values are read with seek."""
+        try:
+            import mmap
+            return mmap.mmap(inf.fileno(), 0, access = mmap.ACCESS_READ)
+        except Exception:
+            return None
+    
+    def readValues(self, inf, data, offset, count):
+        values = array.array(self.typecode)
+        start = self.dataOffset + offset * self.itemsize
+        if data != None:
+            values.fromstring(data[start:start + count * self.itemsize])
+        else:
+            inf.seek(start)
+            values.fromfile(inf, count)
+        if self.byteorder != sys.byteorder: values.byteswap()
+        return values
+    
+    def read(self, hours = None, points = None):
+        """
+        Return the matrix in the same form that it was written.
+        
+        Args:
+            hours: Optional list of 0-based hour rows to read. Default is all the hours.
+            points: Optional list of 0-based point indices to read from each hour. Default is all the points.
+        """
+        if hours == None: hours = range(self.hourCount)
+        matrix = [self.header]
+        with open(self.filePath, 'rb') as inf:
+            data = self.openData(inf)
+            try:
+                # when a few points are requested only their values are read from each hour.
+                readPoints = points != None and len(points) * 8 < self.pointCount
+                for hour in hours:
+                    if not 0 <= hour < self.hourCount:
+                        matrix.append([])
+                        continue
+                    rowLength = self.pointCount if self.rowLengths == None else self.rowLengths[hour]
+                    if readPoints:
+                        row = [self.readValues(inf, data, hour * self.pointCount + point, 1)[0] \
+                               for point in points if 0 <= point < rowLength]
+                    else:
+                        values = self.readValues(inf, data, hour * self.pointCount, rowLength)
+                        if points == None: row = values.tolist()
+                        else: row = [values[point] for point in points if 0 <= point < rowLength]
+                    matrix.append(row)
+            finally:
+                if data != None: data.close()
+        return matrix
+    
+    def readPoint(self, point):
+        """Return the values of a point for all of the hours."""
+        return [row[0] if row else None for row in self.read(points = [point])[1:]]
+
+
 class SerializeObjects(object):
     
     def __init__(self, filePath, data = None):
@@ -8653,6 +10440,149 @@ class SerializeObjects(object):
 
 
 
+class hb_HBObjectFile(object):
+    """
+    Chunked binary file for dumped Honeybee objects.
+    
+    Every object is pickled on its own and the file starts with a table of
+    contents with the offset, type and section of each object. Sections are
+    zones, surfaces, hvac, library (constructions, materials, schedules,
+    shading controls and Radiance materials) and other. A subset of the
+    zones can be loaded by only reading the objects that they depend on.
+    """
+    
+    # version of the binary format.
+    fileVersion = 1
+    fileTag = 'HBOB'
+    
+    sections = {'HBZone': 'zones', 'HBSurface': 'surfaces',
+                'HBHvac': 'hvac', 'HBair': 'hvac', 'HBheat': 'hvac', 'HBcool': 'hvac',
+                'HBConstr': 'library', 'HBMat': 'library', 'HBsched': 'library',
+                'HBShdCntrl': 'library', 'HBRadMat': 'library'}
+    
+    def __init__(self, filePath):
+        self.filePath = filePath
+        self.toc = None
+    
+    @classmethod
+    def isObjectFile(cls, filePath):
+        with open(filePath, 'rb') as inf:
+            return inf.read(4) == cls.fileTag
+    
+    @staticmethod
+    def dependencies(obj):
+        """Ids of the objects that have to be loaded together with a dumped object."""
+        deps = []
+        objectType = obj['objectType']
+        if objectType == 'HBZone':
+            deps.extend(obj['surfaces'])
+            deps.append(obj['HVACSystem'])
+        elif objectType == 'HBSurface':
+            if isinstance(obj.get('parent'), str): deps.append(obj['parent'])
+            if not obj.get('isChild') and (obj.get('hasChild') or obj['type'] == 6):
+                deps.extend([c for c in obj['childSrfs'] if c != obj['ID']])
+        elif objectType == 'HBHvac':
+            for key in ('airDetails', 'heatingDetails', 'coolingDetails'):
+                if obj[key] != None: deps.append(obj[key])
+        return deps
+    
+    def write(self, ids, objs):
+        """Write dumped objects to the file.
+        
+        Args:
+            ids: Ids of the objects that were dumped by the user.
+            objs: A dictionary of all the dumped objects and their dependencies.
+        """
+        chunks = []
+        objects = {}
+        zones = {}
+        offset = 0
+        for key, obj in objs.iteritems():
+            data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+            objectType = obj['objectType']
+            objects[key] = (offset, len(data), objectType,
+                            self.sections.get(objectType, 'other'), self.dependencies(obj))
+            chunks.append(data)
+            offset += len(data)
+            
+            if objectType == 'HBZone':
+                bb = obj['geometry'].GetBoundingBox(True)
+                zones[key] = (obj['name'], (bb.Min.X, bb.Min.Y, bb.Min.Z, bb.Max.X, bb.Max.Y, bb.Max.Z))
+        
+        toc = {'version': self.fileVersion, 'ids': ids, 'objects': objects, 'zones': zones}
+        tocData = pickle.dumps(toc, pickle.HIGHEST_PROTOCOL)
+        
+        tempPath = self.filePath + ".tmp"
+        with open(tempPath, 'wb') as outf:
+            outf.write(self.fileTag)
+            outf.write(struct.pack('<II', self.fileVersion, len(tocData)))
+            outf.write(tocData)
+            for data in chunks: outf.write(data)
+        if os.path.isfile(self.filePath): os.remove(self.filePath)
+        os.rename(tempPath, self.filePath)
+        self.toc = toc
+    
+    def readTOC(self):
+        with open(self.filePath, 'rb') as inf:
+            if inf.read(4) != self.fileTag:
+                raise ValueError("%s is not a Honeybee object file."%self.filePath)
+            version, tocLength = struct.unpack('<II', inf.read(8))
+            if version > self.fileVersion:
+                raise ValueError("%s is written by a newer version of Honeybee."%self.filePath)
+            self.toc = pickle.loads(inf.read(tocLength))
+            self.dataOffset = inf.tell()
+        return self.toc
+    
+    def findZones(self, names = None, zRange = None):
+        """Return the ids of the zones that match the names and/or a range of elevations.
+        
+        Args:
+            names: A list of zone names. Default is all the zones.
+            zRange: (min, max) elevation in meters. Zones that overlap the range are returned.
+        """
+        if self.toc == None: self.readTOC()
+        if names != None: names = set([name.upper() for name in names])
+        
+        zoneIds = []
+        for key in self.toc['ids']:
+            if key not in self.toc['zones']: continue
+            name, bounds = self.toc['zones'][key]
+            if names != None and name.upper() not in names: continue
+            if zRange != None and (bounds[5] < zRange[0] or bounds[2] > zRange[1]): continue
+            zoneIds.append(key)
+        return zoneIds
+    
+    def read(self, ids = None):
+        """Read the objects with their dependencies and return them as dumped data.
+        
+        Args:
+            ids: Ids of the objects to be loaded. Default is all the objects in the file.
+        Returns:
+            A dictionary with 'ids' and 'objs' in the same structure as the one that
+            is dumped. Library objects are always included.
+        """
+        if self.toc == None: self.readTOC()
+        objects = self.toc['objects']
+        if ids == None: ids = self.toc['ids']
+        
+        toBeLoaded = set([key for key, item in objects.iteritems() if item[3] == 'library'])
+        stack = list(ids)
+        while stack:
+            key = stack.pop()
+            if key in toBeLoaded: continue
+            toBeLoaded.add(key)
+            stack.extend(objects[key][4])
+        
+        objs = {}
+        with open(self.filePath, 'rb') as inf:
+            for key in sorted(toBeLoaded, key = lambda k: objects[k][0]):
+                offset, length = objects[key][:2]
+                inf.seek(self.dataOffset + offset)
+                objs[key] = pickle.loads(inf.read(length))
+        
+        return {'ids': list(ids), 'objs': objs}
+
+
 class hb_hvacProperties(object):
     def __init__(self):
         
@@ -9823,6 +11753,9 @@ if checkIn.letItFly:
         sc.sticky["honeybee_ThermBC"] = thermBC
         sc.sticky["honeybee_ThermDefault"] = thermDefaults
         sc.sticky["honeybee_ViewFactors"] = viewFactorInfo
+        sc.sticky["honeybee_RayBVH"] = hb_RayBVH
+        sc.sticky["honeybee_EPResultStore"] = EPResultStore
+        sc.sticky["honeybee_EPCSVColumnReader"] = EPCSVColumnReader
         sc.sticky["PVgen"] = PV_gen
         sc.sticky["PVinverter"] = PVinverter
         sc.sticky["HB_generatorsystem"] = HB_generatorsystem
@@ -9843,13 +11776,21 @@ if checkIn.letItFly:
         sc.sticky["honeybee_DLAnalysisRecipe"] = DLAnalysisRecipe
         sc.sticky["honeybee_MeshToRAD"] = hb_MSHToRAD
         sc.sticky["honeybee_WriteRAD"] = hb_WriteRAD
+        sc.sticky["honeybee_RADSceneWriter"] = hb_RADSceneWriter
+        sc.sticky["honeybee_ProcessScheduler"] = hb_ProcessScheduler
         sc.sticky["honeybee_WriteRADAUX"] = hb_WriteRADAUX
         sc.sticky["honeybee_WriteDS"] = hb_WriteDS
         sc.sticky["honeybee_RADParameters"] = hb_RADParameters
         sc.sticky["honeybee_DSParameters"] = hb_DSParameters
         sc.sticky["honeybee_ReadAnnualResultsAux"] = hb_ReadAnnualResultsAux
+        sc.sticky["honeybee_IllFileIndex"] = hb_IllFileIndex
+        sc.sticky["honeybee_AnnualDaylightMetrics"] = hb_AnnualDaylightMetrics
         sc.sticky["honeybee_EPParameters"] = hb_EnergySimulatioParameters
         sc.sticky["honeybee_SerializeObjects"] = SerializeObjects
+        sc.sticky["honeybee_HBObjectFile"] = hb_HBObjectFile
+        sc.sticky["honeybee_SunOcclusion"] = hb_SunOcclusion
+        sc.sticky["honeybee_EPSimulationCache"] = hb_EPSimulationCache
+        sc.sticky["honeybee_ComfortMatrixFile"] = hb_ComfortMatrixFile
         sc.sticky["honeybee_GridBasedDLResults"] = CalculateGridBasedDLAnalysisResults
         sc.sticky["honeybee_DLAnalaysisTypes"] = {0: ["0: illuminance" , "lux"],
                                                   1: ["1: radiation" , "wh/m2"],
@@ -41,7 +41,7 @@ Provided by Honeybee 0.0.66
         ============: ...
         parallel_: Set to "True" to run the calculation with multiple cores and "False" to run it with a single core.  Multiple cores can increase the speed of the calculation substantially and is recommended if you are not running other big or important processes.  The default is set to "True."
         _buildMesh: Set boolean to "True" to generate a mesh based on your zones and the input distFromFloorOrSrf_ and gridSize_.  This is a necessary step before calculating view factors from each test point to the surrounding zone surfaces.
-        _runIt: Set boolean to "True" to run the component and calculate viewFactors from each test point to surrounding surfaces.
+        _runIt: Set boolean to "True" to run the component and calculate viewFactors from each test point to surrounding surfaces.  Results are cached in the Honeybee default folder so re-running the component with the same zones and settings loads the previous view factors instead of recalculating them.
     Returns:
         readMe!: ...
         ==========: ...
@@ -58,11 +58,11 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Indoor View Factor Calculator"
 ghenv.Component.NickName = 'IndoorViewFactor'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
-#compatibleHBVersion = VER 0.0.56\nDEC_15_2017
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nJUN_25_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "6"
 except: pass
@@ -76,9 +76,10 @@ from Grasshopper.Kernel.Data import GH_Path
 import Rhino as rc
 import rhinoscriptsyntax as rs
 import scriptcontext as sc
-import operator
 import System.Threading.Tasks as tasks
 import time
+import hashlib
+import struct
 
 w = gh.GH_RuntimeMessageLevel.Warning
 tol = sc.doc.ModelAbsoluteTolerance
@@ -1257,52 +1258,61 @@ def checkViewResolution(viewResolution, lb_preparation):
     
     return newVecs, skyViewVecs, newVecsAreas, skyViewVecsAreas
 
-def allSame(items):
-    return all(x == items[0] for x in items)
+def pointViewFactors(zoneBVH, srfCount, viewVectors, point):
+    #Keep track of the divisor.
+    divisor = len(viewVectors)
+    
+    #Count the closest surface hit by each of the rays projected from the point.
+    #A ray is only counted when more than one surface can be compared, in keeping with the original check that the surface hits were not all the same.
+    srfHits = [0]*srfCount
+    if srfCount > 1:
+        for vec in viewVectors:
+            dist, srfIndex = zoneBVH.closestHit(point, vec)
+            if dist != -1: srfHits[srfIndex] += 1
+    
+    #Divide the hits by the total rays to get the view factor.
+    return [hitCount/divisor for hitCount in srfHits]
+
+def pointSkyView(zoneBVH, opaqueCount, skyViewVecs, point, zoneWindowTransmiss, zoneHasWindows, zoneWindowNames):
+    finalViewCount = []
+    finalWindowNameCount = []
+    for vec in skyViewVecs:
+        #A single traversal tells if the ray is blocked by an opaque surface and which windows it passes through.
+        blocked, windowHits = zoneBVH.meshesHit(point, vec, opaqueCount)
+        if blocked == True:
+            #The ray has been blocked by an opaque surface.
+            finalViewCount.append(0)
+            finalWindowNameCount.append(0)
+        elif zoneHasWindows == 2:
+            finalViewCount.append(1) #This is the code to indicate that the point is outside and there is no need to calculate a window transmissivity.
+            finalWindowNameCount.append(0)
+        else:
+            #The ray is not blocked but it is hitting a window and so we need to factor in the window transmissivity.
+            transmiss = 1
+            winNameList = []
+            for meshIndex in windowHits:
+                winCount = meshIndex - opaqueCount
+                transmiss = transmiss * zoneWindowTransmiss[winCount]
+                winNameList.append(zoneWindowNames[winCount].upper())
+            finalViewCount.append(transmiss)
+            finalWindowNameCount.append(winNameList)
+    
+    return finalViewCount, finalWindowNameCount
 
-def parallel_projection(zoneSrfsMesh, viewVectors, pointList):
+def parallel_projection(zoneBVH, srfCount, viewVectors, pointList):
     #Placeholder for the outcome of the parallel projection.
     pointIntList = []
     for point in pointList: pointIntList.append([])
     
-    #Keep track of the divisor.
-    divisor = len(viewVectors)
-    
     def intersect(i):
-        point = pointList[i]
-        #Create the rays to be projected from each point.
-        pointRays = []
-        for vec in viewVectors: pointRays.append(rc.Geometry.Ray3d(point, vec))
-        
-        #Create a list that will hold the intersection hits of each surface
-        srfHits = []
-        for srf in zoneSrfsMesh: srfHits.append([])
-        
-        #Perform the intersection of the rays with the mesh.
-        pointIntersectList = []
-        for rayCount, ray in enumerate(pointRays):
-            pointIntersectList.append([])
-            for srf in zoneSrfsMesh:
-                intersect = rc.Geometry.Intersect.Intersection.MeshRay(srf, ray)
-                if intersect == -1: intersect = "N"
-                pointIntersectList[rayCount].append(intersect)
-        
-        #Find the intersection that was the closest for each ray.
-        for list in pointIntersectList:
-            if allSame(list) == False:
-                minIndex, minValue = min(enumerate(list), key=operator.itemgetter(1))
-                srfHits[minIndex].append(1)
-        
-        #Sum up the lists and divide by the total rays to get the view factor.
-        for hitList in srfHits:
-            pointIntList[i].append(sum(hitList)/divisor)
+        pointIntList[i] = pointViewFactors(zoneBVH, srfCount, viewVectors, pointList[i])
     
     tasks.Parallel.ForEach(range(len(pointList)), intersect)
     
     return pointIntList
 
 
-def parallel_skyProjection(zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, pointList, zoneWindowMesh, zoneWindowTransmiss, zoneHasWindows, zoneWindowNames):
+def parallel_skyProjection(zoneBVH, opaqueCount, skyViewVecs, skyViewVecsAreas, pointList, zoneWindowTransmiss, zoneHasWindows, zoneWindowNames):
     #Placeholder for the outcome of the parallel projection.
     pointIntList = []
     skyBlockedList = []
@@ -1316,49 +1326,7 @@ def parallel_skyProjection(zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, pointL
     divisor = len(skyViewVecs)
     
     def intersect(i):
-        point = pointList[i]
-        #Create the rays to be projected from each point.
-        pointRays = []
-        for vec in skyViewVecs: pointRays.append(rc.Geometry.Ray3d(point, vec))
-        
-        #Perform the intersection of the rays with the opaque mesh.
-        pointIntersectList = []
-        for rayCount, ray in enumerate(pointRays):
-            pointIntersectList.append([])
-            for srf in zoneOpaqueMesh:
-                intersect = rc.Geometry.Intersect.Intersection.MeshRay(srf, ray)
-                if intersect == -1: pass
-                else: pointIntersectList[rayCount].append(1)
-        
-        #See if the ray passed all of the context meshes.
-        finalIntersectList = []
-        for ray in pointRays:
-            finalIntersectList.append([])
-        for listCt, rayList in enumerate(pointIntersectList):
-            for intersect in rayList:
-                finalIntersectList[listCt].append(intersect)
-        
-        finalViewCount = []
-        finalWindowNameCount = []
-        for rayListCount, rayList in enumerate(finalIntersectList):
-            if sum(rayList) == 0:
-                if zoneHasWindows == 2:
-                    finalViewCount.append(1)
-                    finalWindowNameCount.append(0)
-                else:
-                    transmiss = 1
-                    winNameList = []
-                    for winCount, winMesh in enumerate(zoneWindowMesh):
-                        intersect = rc.Geometry.Intersect.Intersection.MeshRay(winMesh, pointRays[rayListCount])
-                        if intersect == -1: pass
-                        else:
-                            transmiss = transmiss * zoneWindowTransmiss[winCount]
-                            winNameList.append(zoneWindowNames[winCount].upper())
-                    finalViewCount.append(transmiss)
-                    finalWindowNameCount.append(winNameList)
-            else:
-                finalViewCount.append(0)
-                finalWindowNameCount.append(0)
+        finalViewCount, finalWindowNameCount = pointSkyView(zoneBVH, opaqueCount, skyViewVecs, pointList[i], zoneWindowTransmiss, zoneHasWindows, zoneWindowNames)
         
         #Sum up the lists and divide by the total rays to get the view factor.
         skyBlockedList[i] = finalViewCount
@@ -1376,15 +1344,20 @@ def checkOutdoorViewFac(outdoorTestPtViewFactor, testPtSkyView):
     return outdoorNonSrfViewFac
 
 
-def skyViewCalc(testPts, zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, zoneHasWindows, zoneWindowMesh, zoneWindowTransmiss, zoneWindowNames):
+def skyViewCalc(testPts, zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, zoneHasWindows, zoneWindowMesh, zoneWindowTransmiss, zoneWindowNames, hb_rayBVH):
     testPtSkyView = []
     testPtSkyBlockedList = []
     testPtBlockName = []
     
     for zoneCount, pointList in enumerate(testPts):
         if zoneHasWindows[zoneCount] > 0:
+            #Build one hierarchy for the opaque surfaces followed by the windows of the zone.
+            opaqueCount = len(zoneOpaqueMesh[zoneCount])
+            if zoneHasWindows[zoneCount] == 2: zoneBVH = hb_rayBVH(list(zoneOpaqueMesh[zoneCount]))
+            else: zoneBVH = hb_rayBVH(list(zoneOpaqueMesh[zoneCount]) + list(zoneWindowMesh[zoneCount]))
+            
             if parallel_ == True or parallel_ == None:
-                skyViewFactors, skyBlockedList, finalWindowNameCount = parallel_skyProjection(zoneOpaqueMesh[zoneCount], skyViewVecs, skyViewVecsAreas, testPts[zoneCount], zoneWindowMesh[zoneCount], zoneWindowTransmiss[zoneCount], zoneHasWindows[zoneCount], zoneWindowNames[zoneCount])
+                skyViewFactors, skyBlockedList, finalWindowNameCount = parallel_skyProjection(zoneBVH, opaqueCount, skyViewVecs, skyViewVecsAreas, testPts[zoneCount], zoneWindowTransmiss[zoneCount], zoneHasWindows[zoneCount], zoneWindowNames[zoneCount])
                 testPtSkyView.append(skyViewFactors)
                 testPtSkyBlockedList.append(skyBlockedList)
                 testPtBlockName.append(finalWindowNameCount)
@@ -1392,54 +1365,9 @@ def skyViewCalc(testPts, zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, zoneHasW
                 testPtSkyView.append([])
                 testPtSkyBlockedList.append([])
                 testPtBlockName.append([])
+                divisor = len(skyViewVecs)
                 for pointCount, point in enumerate(pointList):
-                    #Make the list that will eventually hold the view factors of each surface.
-                    divisor = len(skyViewVecs)
-                    
-                    #Create the rays to be projected from each point.
-                    pointRays = []
-                    for vec in skyViewVecs: pointRays.append(rc.Geometry.Ray3d(point, vec))
-                    
-                    #Perform the intersection of the rays with the opaque mesh.
-                    pointIntersectList = []
-                    for rayCount, ray in enumerate(pointRays):
-                        pointIntersectList.append([])
-                        for srf in zoneOpaqueMesh[zoneCount]:
-                            intersect = rc.Geometry.Intersect.Intersection.MeshRay(srf, ray)
-                            if intersect == -1: pointIntersectList[rayCount].append(0)
-                            else: pointIntersectList[rayCount].append(1)
-                    
-                    #See if the ray passed all of the context meshes.
-                    finalIntersectList = []
-                    for ray in pointRays:
-                        finalIntersectList.append([])
-                    for listCt, rayList in enumerate(pointIntersectList):
-                        for intersect in rayList:
-                            finalIntersectList[listCt].append(intersect)
-                    
-                    finalViewCount = []
-                    finalWindowNameCount = []
-                    for rayListCount, rayList in enumerate(finalIntersectList):
-                        if sum(rayList) == 0:
-                            if zoneHasWindows[zoneCount] == 2:
-                                finalViewCount.append(1) #This is the code to indicate that the point is outside and there is no need to calculate a window transmissivity.
-                                finalWindowNameCount.append(0)
-                            else:
-                                #The ray is not blocked but it is hitting a window and so we need to factor in the window transmissivity.
-                                transmiss = 1
-                                winNameList = []
-                                for winCount, winMesh in enumerate(zoneWindowMesh[zoneCount]):
-                                    intersect = rc.Geometry.Intersect.Intersection.MeshRay(winMesh, pointRays[rayListCount])
-                                    if intersect == -1: pass
-                                    else:
-                                        transmiss = transmiss * zoneWindowTransmiss[zoneCount][winCount]
-                                        winNameList.append(zoneWindowNames[zoneCount][winCount].upper())
-                                finalViewCount.append(transmiss)
-                                finalWindowNameCount.append(winNameList)
-                        else:
-                            #The ray has been blocked by an opaque surface.
-                            finalViewCount.append(0)
-                            finalWindowNameCount.append(0)
+                    finalViewCount, finalWindowNameCount = pointSkyView(zoneBVH, opaqueCount, skyViewVecs, point, zoneWindowTransmiss[zoneCount], zoneHasWindows[zoneCount], zoneWindowNames[zoneCount])
                     
                     #Sum up the lists and divide by the total rays to get the view factor.
                     testPtSkyBlockedList[zoneCount].append(finalViewCount)
@@ -1453,53 +1381,51 @@ def skyViewCalc(testPts, zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, zoneHasW
     return testPtSkyView, testPtSkyBlockedList, testPtBlockName
 
 
-def main(testPts, zoneSrfsMesh, viewVectors, includeOutdoor):
+def main(testPts, zoneSrfsMesh, viewVectors, includeOutdoor, hb_rayBVH):
     testPtViewFactor = []
     
     for zoneCount, pointList in enumerate(testPts):
+        #Build one hierarchy over all surface triangles of the zone so that each ray needs a single traversal.
+        srfCount = len(zoneSrfsMesh[zoneCount])
+        zoneBVH = hb_rayBVH(list(zoneSrfsMesh[zoneCount]))
+        
         if parallel_ == True  or parallel_ == None:
-            viewFactors = parallel_projection(zoneSrfsMesh[zoneCount], viewVectors, testPts[zoneCount])
+            viewFactors = parallel_projection(zoneBVH, srfCount, viewVectors, testPts[zoneCount])
             testPtViewFactor.append(viewFactors)
         else:
             testPtViewFactor.append([])
             for pointCount, point in enumerate(pointList):
-                #Make the list that will eventually hold the view factors of each surface.
-                testPtViewFactor[zoneCount].append([])
-                divisor = len(viewVectors)
-                
-                #Create the rays to be projected from each point.
-                pointRays = []
-                for vec in viewVectors: pointRays.append(rc.Geometry.Ray3d(point, vec))
-                
-                #Create a list that will hold the intersection hits of each surface
-                srfHits = []
-                for srf in zoneSrfsMesh[zoneCount]: srfHits.append([])
-                
-                #Perform the intersection of the rays with the mesh.
-                pointIntersectList = []
-                for rayCount, ray in enumerate(pointRays):
-                    pointIntersectList.append([])
-                    for srf in zoneSrfsMesh[zoneCount]:
-                        intersect = rc.Geometry.Intersect.Intersection.MeshRay(srf, ray)
-                        if intersect == -1: intersect = "N"
-                        pointIntersectList[rayCount].append(intersect)
-                
-                #Find the intersection that was the closest for each ray.
-                for list in pointIntersectList:
-                    try:
-                        if allSame(list) == False:
-                            minIndex, minValue = min(enumerate(list), key=operator.itemgetter(1))
-                            srfHits[minIndex].append(1)
-                    except: pass
-                
-                #Sum up the lists and divide by the total rays to get the view factor.
-                for hitList in srfHits:
-                    testPtViewFactor[zoneCount][pointCount].append(sum(hitList)/divisor)
+                testPtViewFactor[zoneCount].append(pointViewFactors(zoneBVH, srfCount, viewVectors, point))
     
     
     return testPtViewFactor
 
 
+def hashCalculationInputs(hasher, data):
+    #Add geometry and nested lists of data to the hash in a way that does not depend on object identity.
+    if isinstance(data, rc.Geometry.Mesh):
+        hasher.update('M' + str(data.Vertices.Count) + ',' + str(data.Faces.Count))
+        for v in data.Vertices: hasher.update(struct.pack('<3d', v.X, v.Y, v.Z))
+        for face in data.Faces: hasher.update(struct.pack('<4i', face.A, face.B, face.C, face.D))
+    elif isinstance(data, (rc.Geometry.Point3d, rc.Geometry.Point3f, rc.Geometry.Vector3d)):
+        hasher.update(struct.pack('<3d', data.X, data.Y, data.Z))
+    elif isinstance(data, str):
+        hasher.update(repr(data))
+    elif hasattr(data, '__iter__'):
+        hasher.update('[')
+        for item in data: hashCalculationInputs(hasher, item)
+        hasher.update(']')
+    else:
+        hasher.update(repr(data))
+
+def getViewFactorCacheKey(calculationInputs):
+    #The component version is part of the key so that results of an older calculation method are never reused.
+    hasher = hashlib.sha1()
+    hasher.update(ghenv.Component.Message)
+    hashCalculationInputs(hasher, calculationInputs)
+    return hasher.hexdigest()
+
+
 def computeFloorReflect(testPts, testPtViewFactor, zoneSrfTypes, flrRefList):
     # Set defaults and a list to be filled.
     defaultRef = 0.2
@@ -1605,6 +1531,7 @@ if initCheck == True:
     if hb_zoneData[10] == True:
         lb_preparation = sc.sticky["ladybug_Preparation"]()
         hb_viewFactor = sc.sticky["honeybee_ViewFactors"]
+        hb_rayBVH = sc.sticky["honeybee_RayBVH"]
         hb_hive = sc.sticky["honeybee_Hive"]()
         checkData, gridSize, distFromFloor, viewResolution, removeInt, sectionMethod, sectionBreps, includeOutdoor, constantTransmis, addShdTransmiss = checkTheInputs()
 
@@ -1637,25 +1564,42 @@ if checkData == True and buildMesh == True:
 #If all of the data is good and the user has set "_runIt" to "True", run the shade benefit calculation to generate all results.
 if checkData == True and _runIt == True and geoCheck == True and buildMesh == True:
     start = time.clock()
-    viewVectors, skyViewVecs, newVecsAreas, skyViewVecsAreas = checkViewResolution(viewResolution, lb_preparation)
-    testPtViewFactor = main(testPtsInit, zoneSrfsMesh, viewVectors, includeOutdoor)
-    testPtSkyView, testPtBlockedVec, testPtBlockName = skyViewCalc(testPtsInit, zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, zoneHasWindows, zoneWindowMesh, zoneWindowTransmiss, zoneWindowNames)
-    
-    outdoorNonSrfViewFac = []
-    if sectionMethod != 0 and includeOutdoor == True:
-        outdoorIsThere = True
-        outdoorNonSrfViewFac = checkOutdoorViewFac(testPtViewFactor[-1], testPtSkyView[-1])
-    else: outdoorIsThere = False
     
-    finalFloorRefList = computeFloorReflect(testPtsInit, testPtViewFactor, zoneSrfTypes, flrRefList)
+    #Check if the view factors of the same zones and settings have already been calculated.
+    cacheKey = getViewFactorCacheKey([testPtsInit, zoneSrfsMesh, zoneOpaqueMesh, zoneWindowMesh, viewResolution, sectionMethod, includeOutdoor, \
+    zoneSrfNames, testPtZoneWeights, testPtZoneNames, ptHeightWeights, zoneInletInfo, zoneHasWindows, outdoorPtHeightWeights, \
+    zoneWindowTransmiss, zoneWindowNames, flrRefList, zoneSrfTypes, constantTransmis, finalAddShdTransmiss])
+    cacheFile = hb_viewFactor.getCacheFilePath(cacheKey)
+    viewFactorInfo = hb_viewFactor.fromFile(cacheFile)
     
-    total_fs = time.clock() - start
+    if viewFactorInfo != None:
+        print "View factors were loaded from a previous calculation of the same zones and settings."
+        total_fs = time.clock() - start
+    else:
+        viewVectors, skyViewVecs, newVecsAreas, skyViewVecsAreas = checkViewResolution(viewResolution, lb_preparation)
+        testPtViewFactor = main(testPtsInit, zoneSrfsMesh, viewVectors, includeOutdoor, hb_rayBVH)
+        testPtSkyView, testPtBlockedVec, testPtBlockName = skyViewCalc(testPtsInit, zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, zoneHasWindows, zoneWindowMesh, zoneWindowTransmiss, zoneWindowNames, hb_rayBVH)
+        
+        outdoorNonSrfViewFac = []
+        if sectionMethod != 0 and includeOutdoor == True:
+            outdoorIsThere = True
+            outdoorNonSrfViewFac = checkOutdoorViewFac(testPtViewFactor[-1], testPtSkyView[-1])
+        else: outdoorIsThere = False
+        
+        finalFloorRefList = computeFloorReflect(testPtsInit, testPtViewFactor, zoneSrfTypes, flrRefList)
+        
+        total_fs = time.clock() - start
+        
+        #Put all of the information into a list that will carry the data onto the next component easily.
+        viewFactorInfo = hb_viewFactor(testPtViewFactor, zoneSrfNames, testPtSkyView, testPtBlockedVec, testPtZoneWeights, \
+        testPtZoneNames, ptHeightWeights, zoneInletInfo, zoneHasWindows, outdoorIsThere, outdoorNonSrfViewFac, \
+        outdoorPtHeightWeights, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, finalFloorRefList, \
+        constantTransmis, finalAddShdTransmiss)
+        
+        #Save the results so that a re-run with the same inputs does not need to recalculate them.
+        try: viewFactorInfo.toFile(cacheFile)
+        except Exception, e: print "Failed to cache the view factors:\n" + str(e)
     
-    #Put all of the information into a list that will carry the data onto the next component easily.
-    viewFactorInfo = hb_viewFactor(testPtViewFactor, zoneSrfNames, testPtSkyView, testPtBlockedVec, testPtZoneWeights, \
-    testPtZoneNames, ptHeightWeights, zoneInletInfo, zoneHasWindows, outdoorIsThere, outdoorNonSrfViewFac, \
-    outdoorPtHeightWeights, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, finalFloorRefList, \
-    constantTransmis, finalAddShdTransmiss)
     viewFactorInfo = hb_hive.addNonGeoObjToHive(viewFactorInfo, ghenv.Component)
 
 #Print out a report of calculation time.
@@ -31,6 +31,8 @@ Provided by Honeybee 0.0.66
     Args:
         _HBObjects: A list of Honeybee objects
         _filePath: A valid path to a file on your drive (e.g. c:\ladybug\20ZonesExample.HB)
+        zoneNames_: An optional list of zone names to only load these zones from the file. This only works for files that are dumped with chunked_ set to True.
+        elevationRange_: An optional domain of elevations in Rhino model units to only load the zones that overlap it (e.g. the floors 10 to 12 of a tower). This only works for files that are dumped with chunked_ set to True.
         _load: Set to True to load the objects from the file
     Returns:
         readMe!: ...
@@ -38,11 +40,11 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Load Honeybee Objects"
 ghenv.Component.NickName = 'loadHBObjects'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "00 | Honeybee"
-#compatibleHBVersion = VER 0.0.59\nDEC_15_2017
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nFEB_01_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "6"
 except: pass
@@ -189,8 +191,13 @@ def loadHBObjects(HBData):
                 HBObject.BCObject = outdoorBCObject()
                 
             if HBObject.type!=6 and HBObject.BC.lower() == "surface":
-                # replace parent object with ID
-                HBObject.BCObject = HBObjects[HBObject.BCObject]
+                if HBObject.BCObject in HBObjects:
+                    # replace parent object with ID
+                    HBObject.BCObject = HBObjects[HBObject.BCObject]
+                else:
+                    # the adjacent zone is not loaded from the file
+                    HBObject.BC = 'ADIABATIC'
+                    HBObject.BCObject = outdoorBCObject()
     
     for id, HBO in objs.iteritems():
         if HBO['objectType'] == 'HBSurface' and HBO['type'] == 5: continue
@@ -242,10 +249,38 @@ def loadHBObjects(HBData):
         return hb_hive.addNonGeoObjToHive([HBObjects[id] for id in HBData["ids"]][0], ghenv.Component)
 
 
-def main(filePath):
+def main(filePath, zoneNames, elevationRange):
     if not os.path.isfile(filePath):
         raise ValueError("Can't find %s"%filePath)
     
+    hb_HBObjectFile = sc.sticky["honeybee_HBObjectFile"]
+    if hb_HBObjectFile.isObjectFile(filePath):
+        objectFile = hb_HBObjectFile(filePath)
+        if not zoneNames and elevationRange == None:
+            return loadHBObjects(objectFile.read())
+        
+        if not zoneNames: zoneNames = None
+        zRange = None
+        if elevationRange != None:
+            # dumped objects are in meters
+            fac = sc.sticky["honeybee_ConversionFactor"]
+            zRange = (elevationRange.Min * fac, elevationRange.Max * fac)
+        
+        zoneIds = objectFile.findZones(zoneNames, zRange)
+        if zoneIds == []:
+            warning = "None of the zones in the file matches zoneNames_ and elevationRange_."
+            print warning
+            ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
+            return -1
+        return loadHBObjects(objectFile.read(zoneIds))
+    
+    if zoneNames or elevationRange != None:
+        warning = "zoneNames_ and elevationRange_ only work for files that are dumped with chunked_ set to True.\n" + \
+            "All the objects in the file are loaded."
+        print warning
+        ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
+    
+    # files that are dumped by older versions of Honeybee
     with open(filePath, "rb") as inf:
         return loadHBObjects(pickle.load(inf))
 
@@ -270,5 +305,5 @@ else:
         ghenv.Component.AddRuntimeMessage(w, warning)
 
 if initCheck == True and _filePath != None and _load == True:
-    results = main(_filePath)
+    results = main(_filePath, zoneNames_, elevationRange_)
     HBObjects = results if results!= -1 else None
@@ -35,7 +35,7 @@ Provided by Honeybee 0.0.66
         =============: ...
         analysisPeriodOrHOY_: An analysis period from the 'Ladybug Analysis Period' component or an hour of the analysis between 1 and 8760 for which you want to conduct the analysis. If no value is connected here, the component will run for only noon on the winter solstice.  A single HOY is used by default as longer analysis periods can take a very long time.
         =============: ...
-        writeResultFile_: Set to 1 or 'True' to have the component write all results into CSV result files and set to 0 or 'False' to not have the component write these files.  The default is set to 'True' as these simulations can be long and you usually want a copy of your results.  You may want to set it to 'False' if you are just scrolling through key hours and want the fastest run possible.  Set to 2 if you want the component to only write the results of the last two matrices (comfort results and degFromTarget).
+        writeResultFile_: Set to 1 or 'True' to have the component write all results into binary matrix files (.hbmtx) and set to 0 or 'False' to not have the component write these files.  The default is set to 'True' as these simulations can be long and you usually want a copy of your results.  You may want to set it to 'False' if you are just scrolling through key hours and want the fastest run possible.  Set to 2 if you want the component to only write the results of the last two matrices (comfort results and degFromTarget).  Set to 3 or 4 to write the same files as 1 or 2 but as CSV files.  Binary matrix files are a fraction of the size of CSV files and are read much faster by the 'Honeybee_Read Microclimate Matrix' component.
         parallel_: Set to "True" to run the component using multiple CPUs.  This can dramatically decrease calculation time but can interfere with other intense computational processes that might be running on your machine.  For this reason, the default is set to 'False.'
         _runIt: Set boolean to "True" to run the component and generate files for an annual indoor comfort assessment.
     Returns:
@@ -47,21 +47,21 @@ Provided by Honeybee 0.0.66
         adaptComfMtx: A python matrix containing adaptive comfort data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component.
         degFromTargetMtx: A python matrix containing degrees from tartget temperature data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component.
         ===============: ...
-        radTempResult: A csv file address containing the radiant temperature resultsfor each point for every hour of the analysis.
-        airTempResult: A csv file address containing the air temperature results for each point for every hour of the analysis.
-        operativeTempResult: A csv file address containing the operative temperature results for each point for every hour of the analysis.
-        adaptComfResult: A csv file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis.
-        degFromTargetResult: A csv file address containing the a series of numbers indicating the degrees that a certain point is from the neutral temperature for every hour of the analysis.
+        radTempResult: A result file address (binary matrix or csv) containing the radiant temperature resultsfor each point for every hour of the analysis.
+        airTempResult: A result file address (binary matrix or csv) containing the air temperature results for each point for every hour of the analysis.
+        operativeTempResult: A result file address (binary matrix or csv) containing the operative temperature results for each point for every hour of the analysis.
+        adaptComfResult: A result file address (binary matrix or csv) containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis.
+        degFromTargetResult: A result file address (binary matrix or csv) containing the a series of numbers indicating the degrees that a certain point is from the neutral temperature for every hour of the analysis.
 
 """
 
 ghenv.Component.Name = "Honeybee_Microclimate Map Analysis"
 ghenv.Component.NickName = 'MicroclimateMap'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
-#compatibleHBVersion = VER 0.0.56\nFEB_01_2015
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nJUN_07_2016
 try: ghenv.Component.AdditionalHelpFromDocStrings = "6"
 except: pass
@@ -76,6 +76,7 @@ from Grasshopper.Kernel.Data import GH_Path
 import Rhino as rc
 import scriptcontext as sc
 import math
+import operator
 import os
 import System.Threading.Tasks as tasks
 
@@ -94,11 +95,11 @@ outputsDictAdapt = {
 5: ["adaptComfMtx", "A python matrix containing adaptive comfort data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 6: ["degFromTargetMtx", "A python matrix containing degrees from tartget temperature data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 7: ["===============", "..."],
-8: ["radTempResult", "A csv file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
-9: ["airTempResult", "A csv file address containing the air temperature results for each point for every hour of the analysis."],
-10: ["operativeTempResult", "A csv file address containing the operative temperature results for each point for every hour of the analysis."],
-11: ["adaptComfResult", "A csv file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
-12: ["degFromTargetResult", "A csv file address containing the a series of numbers indicating the degrees that a certain point is from the neutral temperature for every hour of the analysis."]
+8: ["radTempResult", "A result file address (binary matrix or csv) containing the radiant temperature resultsfor each point for every hour of the analysis."],
+9: ["airTempResult", "A result file address (binary matrix or csv) containing the air temperature results for each point for every hour of the analysis."],
+10: ["operativeTempResult", "A result file address (binary matrix or csv) containing the operative temperature results for each point for every hour of the analysis."],
+11: ["adaptComfResult", "A result file address (binary matrix or csv) containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
+12: ["degFromTargetResult", "A result file address (binary matrix or csv) containing the a series of numbers indicating the degrees that a certain point is from the neutral temperature for every hour of the analysis."]
 }
 
 outputsDictPMV = {
@@ -111,11 +112,11 @@ outputsDictPMV = {
 5: ["PMVComfMtx", "A python matrix containing PMV comfort data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 6: ["PMV_Mtx", "A python matrix containing predicted mean vote (PMV) data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 7: ["===============", "..."],
-8: ["radTempResult", "A csv file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
-9: ["airTempResult", "A csv file address containing the air temperature results for each point for every hour of the analysis."],
-10: ["SET_Result", "A csv file address containing the standard effective temperature (SET) results for each point for every hour of the analysis."],
-11: ["PMVComfResult", "A csv file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
-12: ["PMV_Result", "A csv file address containing predicted mean vote (PMV) results indicating the distance that a certain point is from the neutral temperature for every hour of the analysis."]
+8: ["radTempResult", "A result file address (binary matrix or csv) containing the radiant temperature resultsfor each point for every hour of the analysis."],
+9: ["airTempResult", "A result file address (binary matrix or csv) containing the air temperature results for each point for every hour of the analysis."],
+10: ["SET_Result", "A result file address (binary matrix or csv) containing the standard effective temperature (SET) results for each point for every hour of the analysis."],
+11: ["PMVComfResult", "A result file address (binary matrix or csv) containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
+12: ["PMV_Result", "A result file address (binary matrix or csv) containing predicted mean vote (PMV) results indicating the distance that a certain point is from the neutral temperature for every hour of the analysis."]
 }
 
 outputsDictUTCI = {
@@ -128,11 +129,11 @@ outputsDictUTCI = {
 5: ["OutdoorComfMtx", "A python matrix containing outdoor (UTCI) comfort data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 6: ["DegFromNeutralMtx", "A python matrix containing the degrees from the neutral UTCI value of 20 C for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 7: ["===============", "..."],
-8: ["radTempResult", "A csv file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
-9: ["airTempResult", "A csv file address containing the air temperature results for each point for every hour of the analysis."],
-10: ["UTCI_Result", "A csv file address containing universal thermal climate index (UTCI) results for each point for every hour of the analysis."],
-11: ["OutdoorComfResult", "A csv file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
-12: ["DegFromNeutralResult", "A csv file address containing the degrees from the neutral UTCI value of 20 C indicating the distance that a certain point is from the neutral temperature for every hour of the analysis."]
+8: ["radTempResult", "A result file address (binary matrix or csv) containing the radiant temperature resultsfor each point for every hour of the analysis."],
+9: ["airTempResult", "A result file address (binary matrix or csv) containing the air temperature results for each point for every hour of the analysis."],
+10: ["UTCI_Result", "A result file address (binary matrix or csv) containing universal thermal climate index (UTCI) results for each point for every hour of the analysis."],
+11: ["OutdoorComfResult", "A result file address (binary matrix or csv) containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
+12: ["DegFromNeutralResult", "A result file address (binary matrix or csv) containing the degrees from the neutral UTCI value of 20 C indicating the distance that a certain point is from the neutral temperature for every hour of the analysis."]
 }
 
 outputsDictPET = {
@@ -145,11 +146,11 @@ outputsDictPET = {
 5: ["PET_ComfMtx", "A python matrix containing PET comfort data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 6: ["PET_CategoryMtx", "A python matrix containing the categories of PET. These are either: -4 = Very Cold, -3 = Cold, -2 = Cool, -1 = Slightly Cool, 0 = Comfortable, 1 = Slightly Warm, 2 = Warm, 3 = Hot, 4 = Very Hot"],
 7: ["===============", "..."],
-8: ["radTempResult", "A csv file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
-9: ["airTempResult", "A csv file address containing the air temperature results for each point for every hour of the analysis."],
-10: ["PET_Result", "A csv file address containing physiological equivalent temperature (PET) results for each point for every hour of the analysis."],
-11: ["PETComfResult", "A csv file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
-12: ["PETCategoryResult", "A csv file address containing the categories of PET.   These are either: -4 = Very Cold, -3 = Cold, -2 = Cool, -1 = Slightly Cool, 0 = Comfortable, 1 = Slightly Warm, 2 = Warm, 3 = Hot, 4 = Very Hot"]
+8: ["radTempResult", "A result file address (binary matrix or csv) containing the radiant temperature resultsfor each point for every hour of the analysis."],
+9: ["airTempResult", "A result file address (binary matrix or csv) containing the air temperature results for each point for every hour of the analysis."],
+10: ["PET_Result", "A result file address (binary matrix or csv) containing physiological equivalent temperature (PET) results for each point for every hour of the analysis."],
+11: ["PETComfResult", "A result file address (binary matrix or csv) containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
+12: ["PETCategoryResult", "A result file address (binary matrix or csv) containing the categories of PET.   These are either: -4 = Very Cold, -3 = Cold, -2 = Cool, -1 = Slightly Cool, 0 = Comfortable, 1 = Slightly Warm, 2 = Warm, 3 = Hot, 4 = Very Hot"]
 }
 
 
@@ -212,7 +213,7 @@ def manageOutput(comfortModel):
             ghenv.Component.Params.Output[input].NickName = "__________"
             ghenv.Component.Params.Output[input].Name = "."
             ghenv.Component.Params.Output[input].Description = " "
-        elif input > 7 and input < 11 and writeResultFile_ == 2:
+        elif input > 7 and input < 11 and (writeResultFile_ == 2 or writeResultFile_ == 4):
             ghenv.Component.Params.Output[input].NickName = "__________"
             ghenv.Component.Params.Output[input].Name = "."
             ghenv.Component.Params.Output[input].Description = " "
@@ -282,34 +283,53 @@ def processPrevailOutdoorTemp(prevailingOutdoorTemp, avgMonthOrRunMean):
     return prevailTemp, coldTimes
 
 
-def calculatePointMRT(srfTempDict, testPtsViewFactor, hour, originalHour, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, prevailingOutdoorTemp):
-    #Calculate the MRT for each point.
+def packPointViewFactors(testPtsViewFactor):
+    #Pack the view factors of each zone into a dense points x surfaces matrix of floats.
+    packedViewFactors = []
+    for pointList in testPtsViewFactor:
+        srfCount = max([len(pointViewFactor) for pointViewFactor in pointList] + [0])
+        packedViewFactors.append([[float(srfView) for srfView in pointViewFactor] + [0.0]*(srfCount-len(pointViewFactor)) for pointViewFactor in pointList])
+    
+    return packedViewFactors
+
+def packPointMRTInputs(srfTempDict, testPtsViewFactor, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac):
+    #Pack the view factors and collect the surface temperature lists of each zone once for the whole analysis period.
+    #The T^4 of the surfaces is computed for one hour at a time so no hours x surfaces or hours x points matrix is kept.
+    packedViewFactors = packPointViewFactors(testPtsViewFactor)
+    mrtInputs = []
+    
+    for zoneCount, ptViewFactors in enumerate(packedViewFactors):
+        if len(ptViewFactors) == 0:
+            mrtInputs.append(([], [], None, None))
+            continue
+        srfCount = len(ptViewFactors[0])
+        if outdoorClac == True and zoneCount == len(packedViewFactors)-1:
+            srfTemps = [outSrfTempDict[str([zoneCount,srfIndex])]["srfTemp"] for srfIndex in range(srfCount)]
+            nonSrfViewFacs = [float(val) for val in outdoorNonSrfViewFac]
+            totalViewFacs = [sum(ptViewFac) + nonSrfViewFacs[ptCount] for ptCount, ptViewFac in enumerate(ptViewFactors)]
+            mrtInputs.append((ptViewFactors, srfTemps, nonSrfViewFacs, totalViewFacs))
+        else:
+            srfTemps = [srfTempDict[str([zoneCount,srfIndex])]["srfTemp"] for srfIndex in range(srfCount)]
+            mrtInputs.append((ptViewFactors, srfTemps, None, None))
+    
+    return mrtInputs
+
+def calculateHourPointMRT(mrtInputs, hour, originalHour, prevailingOutdoorTemp):
+    #Calculate the MRT of each point for one hour as the product of the packed view factors with the T^4 column of the hour.
     pointMRTValues = []
-    for zoneCount, pointList in enumerate(testPtsViewFactor):
-        if outdoorClac == False or zoneCount != len(testPtsViewFactor)-1:
-            pointMRTValues.append([])
-            for pointViewFactor in pointList:
-                pointMRT = 0
-                for srfCount, srfView in enumerate(pointViewFactor):
-                    path  = str([zoneCount,srfCount])
-                    weightedSrfTemp = srfView*(math.pow((srfTempDict[path]["srfTemp"][hour] + 273.15),4))
-                    pointMRT = pointMRT+weightedSrfTemp
-                pointMRT = math.pow(pointMRT,0.25) - 273.15
-                pointMRTValues[zoneCount].append(round(pointMRT, 3))
+    
+    for ptViewFactors, srfTemps, nonSrfViewFacs, totalViewFacs in mrtInputs:
+        srfT4Col = [math.pow((srfTemp[hour] + 273.15),4) for srfTemp in srfTemps]
+        if nonSrfViewFacs == None:
+            zoneMRTValues = [round(math.pow(sum(map(operator.mul, ptViewFac, srfT4Col)),0.25) - 273.15, 3) for ptViewFac in ptViewFactors]
         else:
-            pointMRTValues.append([])
-            for ptCount, pointViewFactor in enumerate(pointList):
-                pointMRT = 0
-                for srfCount, srfView in enumerate(pointViewFactor):
-                    path  = str([zoneCount,srfCount])
-                    weightedSrfTemp = srfView*(math.pow((outSrfTempDict[path]["srfTemp"][hour]+273.15),4))
-                    pointMRT = pointMRT+weightedSrfTemp
-                
-                weightedSrfTemp = outdoorNonSrfViewFac[ptCount]*(math.pow((prevailingOutdoorTemp[originalHour]+273.15),4))
-                pointMRT = pointMRT+weightedSrfTemp
-                pointMRT = pointMRT / (sum(pointViewFactor) + outdoorNonSrfViewFac[ptCount])
-                pointMRT = math.pow(pointMRT,0.25) - 273.15
-                pointMRTValues[zoneCount].append(round(pointMRT, 3))
+            outT4 = math.pow((prevailingOutdoorTemp[originalHour]+273.15),4)
+            zoneMRTValues = []
+            for ptCount, ptViewFac in enumerate(ptViewFactors):
+                pointMRT = sum(map(operator.mul, ptViewFac, srfT4Col)) + nonSrfViewFacs[ptCount]*outT4
+                pointMRT = pointMRT / totalViewFacs[ptCount]
+                zoneMRTValues.append(round(math.pow(pointMRT,0.25) - 273.15, 3))
+        pointMRTValues.append(zoneMRTValues)
     
     return pointMRTValues
 
@@ -348,20 +368,8 @@ def calculateSolarAdjustedMRT(pointMRTValues, stepOfSimulation, originalHour, di
     sunVec = sunVecInfo[0][count]
     altitude = sunVecInfo[1][count]
     
-    #Assign the sun vector to a sky patch that aligns with the testPtBlockedVec list.
-    vectorskyPatches = []
-    
-    if sunVec != None:
-        intersected = False
-        ray = rc.Geometry.Ray3d(rc.Geometry.Point3d.Origin, sunVec)
-        for patchCount, patch in enumerate(skyPatchMeshes):
-            if rc.Geometry.Intersect.Intersection.MeshRay(patch, ray) >= 0:
-                vectorskyPatches.append(patchCount)
-                intersected = True
-        if intersected == False:
-            vectorskyPatches.append(None)
-    else:
-        vectorskyPatches.append(None)
+    #The sky patch of the sun vector that aligns with the testPtBlockedVec list.
+    vectorskyPatches = [sunVecInfo[3][count]]
     
     
     ##Calculate the diffuse, direct, and global horizontal components of the solar radiation at the hour.
@@ -844,7 +852,9 @@ def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataN
                 sunVecs.append(sunVec)
                 altitudes.append(altitude)
                 azimuths.append(azimuth)
-            sunVecInfo = [sunVecs, altitudes, azimuths]
+            #Assign the sun vectors to the sky patches once for all the hours.
+            sunVecPatches = hb_sunOcclusion.skyPatchIndices(skyPatchMeshes, sunVecs)
+            sunVecInfo = [sunVecs, altitudes, azimuths, sunVecPatches]
         
         #Make a dictionary that will relate the testPtZoneNames to the air temperatures.
         airTempDict = createZoneDict(testPtZoneNames, "zoneName", "airTemp", airTempDataHeaders, airTempDataNumbers)
@@ -863,6 +873,9 @@ def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataN
         #Run through every hour of the analysis to fill up the matrices.
         calcCancelled = False
         try:
+            #Pack the view factors and the surface temperatures once for the whole analysis period.
+            mrtInputs = packPointMRTInputs(srfTempDict, testPtsViewFactor, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac)
+            
             def climateMap(count):
                 #Ability to cancel with Esc
                 if gh.GH_Document.IsEscapeKeyDown(): assert False
@@ -878,7 +891,7 @@ def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataN
                 for zoneVal in heatGainDataNumbers: heatGainValues.append(zoneVal[hour-1])
                 
                 #Compute the radiant temperature.
-                pointMRTValues = calculatePointMRT(srfTempDict, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, prevailingOutdoorTemp)
+                pointMRTValues = calculateHourPointMRT(mrtInputs, hour-1, originalHour-1, prevailingOutdoorTemp)
                 if sum(zoneHasWindows) != 0:
                     if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, outHorizInfrared, lb_comfortModels)
                     else:
@@ -1039,7 +1052,9 @@ def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
                 sunVecs.append(sunVec)
                 altitudes.append(altitude)
                 azimuths.append(azimuth)
-            sunVecInfo = [sunVecs, altitudes, azimuths]
+            #Assign the sun vectors to the sky patches once for all the hours.
+            sunVecPatches = hb_sunOcclusion.skyPatchIndices(skyPatchMeshes, sunVecs)
+            sunVecInfo = [sunVecs, altitudes, azimuths, sunVecPatches]
         
         #Make a dictionary that will relate the testPtZoneNames to the air temperatures.
         airTempDict = createZoneDict(testPtZoneNames, "zoneName", "airTemp", airTempDataHeaders, airTempDataNumbers)
@@ -1059,6 +1074,9 @@ def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
         #Run through every hour of the analysis to fill up the matrices.
         calcCancelled = False
         try:
+            #Pack the view factors and the surface temperatures once for the whole analysis period.
+            mrtInputs = packPointMRTInputs(srfTempDict, testPtsViewFactor, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac)
+            
             def climateMapPMV(count):
                 #Ability to cancel with Esc
                 if gh.GH_Document.IsEscapeKeyDown(): assert False
@@ -1074,7 +1092,7 @@ def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
                 for zoneVal in heatGainDataNumbers: heatGainValues.append(zoneVal[hour-1])
                 
                 #Compute the radiant temperature.
-                pointMRTValues = calculatePointMRT(srfTempDict, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, outDryBulbTemp)
+                pointMRTValues = calculateHourPointMRT(mrtInputs, hour-1, originalHour-1, outDryBulbTemp)
                 if sum(zoneHasWindows) != 0:
                     if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
                     else:
@@ -1246,7 +1264,9 @@ def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNu
                 sunVecs.append(sunVec)
                 altitudes.append(altitude)
                 azimuths.append(azimuth)
-            sunVecInfo = [sunVecs, altitudes, azimuths]
+            #Assign the sun vectors to the sky patches once for all the hours.
+            sunVecPatches = hb_sunOcclusion.skyPatchIndices(skyPatchMeshes, sunVecs)
+            sunVecInfo = [sunVecs, altitudes, azimuths, sunVecPatches]
         
         #Make a dictionary that will relate the testPtZoneNames to the air temperatures.
         try: airTempDict = createZoneDict(testPtZoneNames, "zoneName", "airTemp", airTempDataHeaders, airTempDataNumbers)
@@ -1268,6 +1288,9 @@ def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNu
         #Run through every hour of the analysis to fill up the matrices.
         calcCancelled = False
         try:
+            #Pack the view factors and the surface temperatures once for the whole analysis period.
+            mrtInputs = packPointMRTInputs(srfTempDict, testPtsViewFactor, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac)
+            
             def climateMapUTCI(count):
                 #Ability to cancel with Esc
                 if gh.GH_Document.IsEscapeKeyDown(): assert False
@@ -1283,7 +1306,7 @@ def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNu
                 for zoneVal in heatGainDataNumbers: heatGainValues.append(zoneVal[hour-1])
                 
                 #Compute the radiant temperature.
-                pointMRTValues = calculatePointMRT(srfTempDict, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, outDryBulbTemp)
+                pointMRTValues = calculateHourPointMRT(mrtInputs, hour-1, originalHour-1, outDryBulbTemp)
                 if sum(zoneHasWindows) != 0:
                     if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
                     else:
@@ -1451,7 +1474,9 @@ def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
                 sunVecs.append(sunVec)
                 altitudes.append(altitude)
                 azimuths.append(azimuth)
-            sunVecInfo = [sunVecs, altitudes, azimuths]
+            #Assign the sun vectors to the sky patches once for all the hours.
+            sunVecPatches = hb_sunOcclusion.skyPatchIndices(skyPatchMeshes, sunVecs)
+            sunVecInfo = [sunVecs, altitudes, azimuths, sunVecPatches]
         
         #Make a dictionary that will relate the testPtZoneNames to the air temperatures.
         try: airTempDict = createZoneDict(testPtZoneNames, "zoneName", "airTemp", airTempDataHeaders, airTempDataNumbers)
@@ -1473,6 +1498,9 @@ def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
         #Run through every hour of the analysis to fill up the matrices.
         calcCancelled = False
         try:
+            #Pack the view factors and the surface temperatures once for the whole analysis period.
+            mrtInputs = packPointMRTInputs(srfTempDict, testPtsViewFactor, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac)
+            
             def climateMapPET(count):
                 #Ability to cancel with Esc
                 if gh.GH_Document.IsEscapeKeyDown(): assert False
@@ -1488,7 +1516,7 @@ def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
                 for zoneVal in heatGainDataNumbers: heatGainValues.append(zoneVal[hour-1])
                 
                 #Compute the radiant temperature.
-                pointMRTValues = calculatePointMRT(srfTempDict, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, outDryBulbTemp)
+                pointMRTValues = calculateHourPointMRT(mrtInputs, hour-1, originalHour-1, outDryBulbTemp)
                 if sum(zoneHasWindows) != 0:
                     if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
                     else:
@@ -1572,93 +1600,44 @@ def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
             return -1
 
 
-def writeCSVAdapt(lb_preparation, directory, fileName, radTempMtx, airTempMtx, operativeTempMtx, adaptComfMtx, degFromTargetMtx):
-    #Find out the number of values in each hour.
-    valLen = len(radTempMtx[-1])-1
-    
-    #Set up a working directory.
-    workingDir = lb_preparation.makeWorkingDir(os.path.join(directory)) 
-    
-    #Create a csv Files.
-    radTempFile = fileName + "RadiantTemp.csv"
-    airTempFile = fileName + "AirTemp.csv"
-    opTempFile = fileName + "OperativeTemp.csv"
-    adaptComfFile = fileName + "AdaptComf.csv"
-    degFromTargetFile = fileName + "DegFromTarget.csv"
-    
-    #Write the radiant temperature result file.
-    if writeResultFile_ != 2:
-        radTempResult = os.path.join(workingDir, radTempFile)
-        radCSVfile = open(radTempResult, 'wb')
-        for lineCount, line in enumerate(radTempMtx):
+def writeResultMtx(workingDir, resultFile, resultMtx, valLen):
+    #Write a matrix into a binary matrix file or, if CSV files have been requested, into a csv file.
+    if writeResultFile_ == 3 or writeResultFile_ == 4:
+        resultPath = os.path.join(workingDir, resultFile + ".csv")
+        CSVfile = open(resultPath, 'wb')
+        for lineCount, line in enumerate(resultMtx):
             lineStr = ''
             if lineCount != 0:
                 for valCt, val in enumerate(line):
                     if valCt != valLen: lineStr = lineStr + str(val) + ','
                     else: lineStr = lineStr + str(val) + "\n"
-                radCSVfile.write(lineStr)
-            else: radCSVfile.write(line + "\n")
-        radCSVfile.close()
+                CSVfile.write(lineStr)
+            else: CSVfile.write(line + "\n")
+        CSVfile.close()
     else:
-        radTempResult = None
+        hb_matrixFile = sc.sticky["honeybee_ComfortMatrixFile"]
+        resultPath = hb_matrixFile.write(os.path.join(workingDir, resultFile + hb_matrixFile.extension), resultMtx)
+    return resultPath
+
+
+def writeCSVAdapt(lb_preparation, directory, fileName, radTempMtx, airTempMtx, operativeTempMtx, adaptComfMtx, degFromTargetMtx):
+    #Find out the number of values in each hour.
+    valLen = len(radTempMtx[-1])-1
     
-    #Write the air temperature result file.
-    if writeResultFile_ != 2:
-        airTempResult = os.path.join(workingDir, airTempFile)
-        airCSVfile = open(airTempResult, 'wb')
-        for lineCount, line in enumerate(airTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                airCSVfile.write(lineStr)
-            else: airCSVfile.write(line + "\n")
-        airCSVfile.close()
-    else:
-        airTempResult = None
+    #Set up a working directory.
+    workingDir = lb_preparation.makeWorkingDir(os.path.join(directory)) 
     
-    #Write the operative temperature result file.
-    if writeResultFile_ != 2:
-        operativeTempResult = os.path.join(workingDir, opTempFile)
-        opCSVfile = open(operativeTempResult, 'wb')
-        for lineCount, line in enumerate(operativeTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                opCSVfile.write(lineStr)
-            else: opCSVfile.write(line + "\n")
-        opCSVfile.close()
+    #Write the radiant temperature, air temperature and operative temperature result files.
+    if writeResultFile_ != 2 and writeResultFile_ != 4:
+        radTempResult = writeResultMtx(workingDir, fileName + "RadiantTemp", radTempMtx, valLen)
+        airTempResult = writeResultMtx(workingDir, fileName + "AirTemp", airTempMtx, valLen)
+        operativeTempResult = writeResultMtx(workingDir, fileName + "OperativeTemp", operativeTempMtx, valLen)
     else:
-        operativeTempResult = None
-    
-    #Write the adaptive comfort result file.
-    adaptComfResult = os.path.join(workingDir, adaptComfFile)
-    comfCSVfile = open(adaptComfResult, 'wb')
-    for lineCount, line in enumerate(adaptComfMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            comfCSVfile.write(lineStr)
-        else: comfCSVfile.write(line + "\n")
-    comfCSVfile.close()
-    
-    #Write the deg from target result file.
-    degFromTargetResult = os.path.join(workingDir, degFromTargetFile)
-    degCSVfile = open(degFromTargetResult, 'wb')
-    for lineCount, line in enumerate(degFromTargetMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            degCSVfile.write(lineStr)
-        else: degCSVfile.write(line + "\n")
-    degCSVfile.close()
+        radTempResult, airTempResult, operativeTempResult = None, None, None
+    
+    #Write the adaptive comfort and degrees from target result files.
+    adaptComfResult = writeResultMtx(workingDir, fileName + "AdaptComf", adaptComfMtx, valLen)
+    degFromTargetResult = writeResultMtx(workingDir, fileName + "DegFromTarget", degFromTargetMtx, valLen)
     
     
     return radTempResult, airTempResult, operativeTempResult, adaptComfResult, degFromTargetResult
@@ -1671,90 +1650,22 @@ def writeCSVPMV(lb_preparation, directory, fileName, radTempMtx, airTempMtx, SET
     #Set up a working directory.
     workingDir = lb_preparation.makeWorkingDir(os.path.join(directory)) 
     
-    #Create a csv Files.
-    radTempFile = fileName + "RadiantTemp.csv"
-    airTempFile = fileName + "AirTemp.csv"
-    SETFile = fileName + "SET.csv"
-    PPDFile = fileName + "PPD.csv"
-    PMVFile = fileName + "PMV.csv"
-    
-    #Write the radiant temperature result file.
-    if writeResultFile_ != 2:
-        radTempResult = os.path.join(workingDir, radTempFile)
-        radCSVfile = open(radTempResult, 'wb')
-        for lineCount, line in enumerate(radTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                radCSVfile.write(lineStr)
-            else: radCSVfile.write(line + "\n")
-        radCSVfile.close()
-    else:
-        radTempResult = None
-    
-    #Write the air temperature result file.
-    if writeResultFile_ != 2:
-        airTempResult = os.path.join(workingDir, airTempFile)
-        airCSVfile = open(airTempResult, 'wb')
-        for lineCount, line in enumerate(airTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                airCSVfile.write(lineStr)
-            else: airCSVfile.write(line + "\n")
-        airCSVfile.close()
+    #Write the radiant temperature, air temperature and SET result files.
+    if writeResultFile_ != 2 and writeResultFile_ != 4:
+        radTempResult = writeResultMtx(workingDir, fileName + "RadiantTemp", radTempMtx, valLen)
+        airTempResult = writeResultMtx(workingDir, fileName + "AirTemp", airTempMtx, valLen)
+        SET_Result = writeResultMtx(workingDir, fileName + "SET", SET_Mtx, valLen)
     else:
-        airTempResult = None
+        radTempResult, airTempResult, SET_Result = None, None, None
     
-    #Write the operative temperature result file.
-    if writeResultFile_ != 2:
-        SET_Result = os.path.join(workingDir, SETFile)
-        opCSVfile = open(SET_Result, 'wb')
-        for lineCount, line in enumerate(SET_Mtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                opCSVfile.write(lineStr)
-            else: opCSVfile.write(line + "\n")
-        opCSVfile.close()
-    else:
-        SET_Result = None
-    
-    #Write the adaptive comfort result file.
-    PPD_Result = os.path.join(workingDir, PPDFile)
-    comfCSVfile = open(PPD_Result, 'wb')
-    for lineCount, line in enumerate(PMVComfMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            comfCSVfile.write(lineStr)
-        else: comfCSVfile.write(line + "\n")
-    comfCSVfile.close()
-    
-    #Write the deg from target result file.
-    PMV_Result = os.path.join(workingDir, PMVFile)
-    degCSVfile = open(PMV_Result, 'wb')
-    for lineCount, line in enumerate(PMV_Mtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            degCSVfile.write(lineStr)
-        else: degCSVfile.write(line + "\n")
-    degCSVfile.close()
+    #Write the PMV comfort and PMV result files.
+    PPD_Result = writeResultMtx(workingDir, fileName + "PPD", PMVComfMtx, valLen)
+    PMV_Result = writeResultMtx(workingDir, fileName + "PMV", PMV_Mtx, valLen)
     
     
     return radTempResult, airTempResult, SET_Result, PPD_Result, PMV_Result
 
+
 def writeCSVUTCI(lb_preparation, directory, fileName, radTempMtx, airTempMtx, UTCI_Mtx, OutdoorComfMtx, DegFromNeutralMtx):
     #Find out the number of values in each hour.
     valLen = len(radTempMtx[-1])-1
@@ -1762,90 +1673,22 @@ def writeCSVUTCI(lb_preparation, directory, fileName, radTempMtx, airTempMtx, UT
     #Set up a working directory.
     workingDir = lb_preparation.makeWorkingDir(os.path.join(directory)) 
     
-    #Create a csv Files.
-    radTempFile = fileName + "RadiantTemp.csv"
-    airTempFile = fileName + "AirTemp.csv"
-    UTCIFile = fileName + "UTCI.csv"
-    OutdoorComfFile = fileName + "OutdoorComf.csv"
-    DegFromNeutralFile = fileName + "DegFromTarget.csv"
-    
-    #Write the radiant temperature result file.
-    if writeResultFile_ != 2:
-        radTempResult = os.path.join(workingDir, radTempFile)
-        radCSVfile = open(radTempResult, 'wb')
-        for lineCount, line in enumerate(radTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                radCSVfile.write(lineStr)
-            else: radCSVfile.write(line + "\n")
-        radCSVfile.close()
+    #Write the radiant temperature, air temperature and UTCI result files.
+    if writeResultFile_ != 2 and writeResultFile_ != 4:
+        radTempResult = writeResultMtx(workingDir, fileName + "RadiantTemp", radTempMtx, valLen)
+        airTempResult = writeResultMtx(workingDir, fileName + "AirTemp", airTempMtx, valLen)
+        UTCI_Result = writeResultMtx(workingDir, fileName + "UTCI", UTCI_Mtx, valLen)
     else:
-        radTempResult = None
+        radTempResult, airTempResult, UTCI_Result = None, None, None
     
-    #Write the air temperature result file.
-    if writeResultFile_ != 2:
-        airTempResult = os.path.join(workingDir, airTempFile)
-        airCSVfile = open(airTempResult, 'wb')
-        for lineCount, line in enumerate(airTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                airCSVfile.write(lineStr)
-            else: airCSVfile.write(line + "\n")
-        airCSVfile.close()
-    else:
-        airTempResult = None
-    
-    #Write the operative temperature result file.
-    if writeResultFile_ != 2:
-        UTCI_Result = os.path.join(workingDir, UTCIFile)
-        opCSVfile = open(UTCI_Result, 'wb')
-        for lineCount, line in enumerate(UTCI_Mtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                opCSVfile.write(lineStr)
-            else: opCSVfile.write(line + "\n")
-        opCSVfile.close()
-    else:
-        UTCI_Result = None
-    
-    #Write the adaptive comfort result file.
-    OutdoorComfResult = os.path.join(workingDir, OutdoorComfFile)
-    comfCSVfile = open(OutdoorComfResult, 'wb')
-    for lineCount, line in enumerate(OutdoorComfMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            comfCSVfile.write(lineStr)
-        else: comfCSVfile.write(line + "\n")
-    comfCSVfile.close()
-    
-    #Write the deg from target result file.
-    DegFromNeutralResult = os.path.join(workingDir, DegFromNeutralFile)
-    degCSVfile = open(DegFromNeutralResult, 'wb')
-    for lineCount, line in enumerate(DegFromNeutralMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            degCSVfile.write(lineStr)
-        else: degCSVfile.write(line + "\n")
-    degCSVfile.close()
+    #Write the outdoor comfort and degrees from neutral result files.
+    OutdoorComfResult = writeResultMtx(workingDir, fileName + "OutdoorComf", OutdoorComfMtx, valLen)
+    DegFromNeutralResult = writeResultMtx(workingDir, fileName + "DegFromTarget", DegFromNeutralMtx, valLen)
     
     
     return radTempResult, airTempResult, UTCI_Result, OutdoorComfResult, DegFromNeutralResult
 
+
 def writeCSVPET(lb_preparation, directory, fileName, radTempMtx, airTempMtx, PET_Mtx, PETComfMtx, PETCategoryMtx):
     #Find out the number of values in each hour.
     valLen = len(radTempMtx[-1])-1
@@ -1853,105 +1696,38 @@ def writeCSVPET(lb_preparation, directory, fileName, radTempMtx, airTempMtx, PET
     #Set up a working directory.
     workingDir = lb_preparation.makeWorkingDir(os.path.join(directory)) 
     
-    #Create a csv Files.
-    radTempFile = fileName + "RadiantTemp.csv"
-    airTempFile = fileName + "AirTemp.csv"
-    PETFile = fileName + "PET.csv"
-    PETComfFile = fileName + "PETComf.csv"
-    PETCategoryFile = fileName + "PETCategory.csv"
-    
-    #Write the radiant temperature result file.
-    if writeResultFile_ != 2:
-        radTempResult = os.path.join(workingDir, radTempFile)
-        radCSVfile = open(radTempResult, 'wb')
-        for lineCount, line in enumerate(radTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                radCSVfile.write(lineStr)
-            else: radCSVfile.write(line + "\n")
-        radCSVfile.close()
-    else:
-        radTempResult = None
-    
-    #Write the air temperature result file.
-    if writeResultFile_ != 2:
-        airTempResult = os.path.join(workingDir, airTempFile)
-        airCSVfile = open(airTempResult, 'wb')
-        for lineCount, line in enumerate(airTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                airCSVfile.write(lineStr)
-            else: airCSVfile.write(line + "\n")
-        airCSVfile.close()
+    #Write the radiant temperature, air temperature and PET result files.
+    if writeResultFile_ != 2 and writeResultFile_ != 4:
+        radTempResult = writeResultMtx(workingDir, fileName + "RadiantTemp", radTempMtx, valLen)
+        airTempResult = writeResultMtx(workingDir, fileName + "AirTemp", airTempMtx, valLen)
+        PET_Result = writeResultMtx(workingDir, fileName + "PET", PET_Mtx, valLen)
     else:
-        airTempResult = None
+        radTempResult, airTempResult, PET_Result = None, None, None
     
-    #Write the operative temperature result file.
-    if writeResultFile_ != 2:
-        PET_Result = os.path.join(workingDir, PETFile)
-        opCSVfile = open(PET_Result, 'wb')
-        for lineCount, line in enumerate(PET_Mtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                opCSVfile.write(lineStr)
-            else: opCSVfile.write(line + "\n")
-        opCSVfile.close()
-    else:
-        PET_Result = None
-    
-    #Write the adaptive comfort result file.
-    PET_ComfResult = os.path.join(workingDir, PETComfFile)
-    comfCSVfile = open(PET_ComfResult, 'wb')
-    for lineCount, line in enumerate(PETComfMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            comfCSVfile.write(lineStr)
-        else: comfCSVfile.write(line + "\n")
-    comfCSVfile.close()
-    
-    #Write the deg from target result file.
-    PET_CategoryResult = os.path.join(workingDir, PETCategoryFile)
-    degCSVfile = open(PET_CategoryResult, 'wb')
-    for lineCount, line in enumerate(PETCategoryMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            degCSVfile.write(lineStr)
-        else: degCSVfile.write(line + "\n")
-    degCSVfile.close()
+    #Write the PET comfort and PET category result files.
+    PET_ComfResult = writeResultMtx(workingDir, fileName + "PETComf", PETComfMtx, valLen)
+    PET_CategoryResult = writeResultMtx(workingDir, fileName + "PETCategory", PETCategoryMtx, valLen)
     
     
     return radTempResult, airTempResult, PET_Result, PET_ComfResult, PET_CategoryResult
 
 
+
 #Import the classes, check the inputs, and generate default values for grid size if the user has given none.
 checkLB = True
-if sc.sticky.has_key('ladybug_release'):
+if sc.sticky.has_key('ladybug_release') and sc.sticky.has_key('honeybee_release'):
     lb_defaultFolder = sc.sticky["Ladybug_DefaultFolder"]
     lb_preparation = sc.sticky["ladybug_Preparation"]()
     lb_visualization = sc.sticky["ladybug_ResultVisualization"]()
     lb_sunpath = sc.sticky["ladybug_SunPath"]()
     lb_comfortModels = sc.sticky["ladybug_ComfortModels"]()
     lb_wind = sc.sticky["ladybug_WindSpeed"]()
+    hb_sunOcclusion = sc.sticky["honeybee_SunOcclusion"]()
 else:
     checkLB = False
-    print "You should let the Ladybug fly first..."
+    print "You should let the Ladybug and Honeybee fly first..."
     w = gh.GH_RuntimeMessageLevel.Warning
-    ghenv.Component.AddRuntimeMessage(w, "You should let the Ladybug fly first...")
+    ghenv.Component.AddRuntimeMessage(w, "You should let the Ladybug and Honeybee fly first...")
 
 
 #Check the type of comfort analysis recipe connected.
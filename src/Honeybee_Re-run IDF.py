@@ -30,7 +30,7 @@ Provided by Ladybug 0.0.45
     Args:
         _idfFilePath: The full file path to the idf file on your system that you would like to run (e.g. C:\ladybug\sample1.idf).
         _epwFileAddress: The full file path to epw weather file that you would like the simulation to run with.
-        parallel_: Set to "True" to run multiple IDFs using multiple CPUs.  Note that this input is only relevant when you have plugged in a list of IDF file addresses.
+        parallel_: Set to "True" to run multiple IDFs using multiple CPUs.  You can also connect a number larger than 1 to set the number of simulations that run at the same time.  Note that this input is only relevant when you have plugged in a list of IDF file addresses.  Each IDF runs in its own folder under a "rerun" folder next to the first IDF and runs with results that are still valid for the same IDF and weather file are skipped.
         runIt_: Set to 'True' to run the simulation.  You can also connect a 2 to run the simulation in the background.
     Returns:
         report: Report!
@@ -41,11 +41,11 @@ Provided by Ladybug 0.0.45
 
 ghenv.Component.Name = "Honeybee_Re-run IDF"
 ghenv.Component.NickName = 'Re-Run IDF'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
-#compatibleHBVersion = VER 0.0.56\nJUL_24_2016
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nFEB_01_2015
 ghenv.Component.AdditionalHelpFromDocStrings = "0"
 
@@ -56,7 +56,10 @@ import shutil
 import Grasshopper.Kernel as gh
 import time
 import subprocess
-import System.Threading.Tasks as tasks
+import threading
+import Queue
+import json
+import System
 
 def checkTheInputs(idfFileName, epwWeatherFile):
     w = gh.GH_RuntimeMessageLevel.Warning
@@ -151,38 +154,245 @@ def runBatchFile(batchFileAddress, runInBackground):
     else:
         os.system(batchFileAddress)
 
+class EPBatchRunner(object):
+    """Run a list of IDF files through EnergyPlus with a limited number of workers.
+    
+    Each IDF runs in its own folder under <folder of the first IDF>\rerun so the runs
+    don't share in.idf and eplusout files. A run is skipped when its results are
+    still valid for the same IDF and weather file. After the batch the run times and
+    error counts are written to manifest.csv and the annual value of each output in
+    the result files is collated to collatedResults.csv in the batch folder.
+    """
+    
+    # energy outputs are summed over the run and the other outputs are averaged
+    energyUnits = ('[J]', '[kWh]', '[kBtu]', '[Wh]')
+    
+    def __init__(self, idfFilePaths, epwFileAddress, EPPath, maxWorkers = 1, runInBackground = 2, retries = 1):
+        self.epwFileAddress = epwFileAddress
+        self.EPPath = EPPath
+        self.maxWorkers = max(1, int(maxWorkers))
+        self.runInBackground = runInBackground
+        self.retries = retries
+        self.batchDir = os.path.join(os.path.dirname(idfFilePaths[0]), "rerun")
+        
+        self.jobs = []
+        jobNames = {}
+        for count, idfFilePath in enumerate(idfFilePaths):
+            shIdfFileName = os.path.basename(idfFilePath)[:-4]
+            # IDFs with the same name from different folders get their own folders
+            jobNames[shIdfFileName] = jobNames.get(shIdfFileName, 0) + 1
+            jobName = shIdfFileName
+            if jobNames[shIdfFileName] > 1: jobName += "_" + str(jobNames[shIdfFileName] - 1)
+            jobDir = os.path.join(self.batchDir, jobName)
+            self.jobs.append({'index': count, 'idfFilePath': idfFilePath, 'name': shIdfFileName,
+                              'jobDir': jobDir, 'fullPath': os.path.join(jobDir, shIdfFileName),
+                              'status': 'waiting', 'runTime': 0, 'warnings': 0, 'severe': 0,
+                              'fatal': 0, 'completed': False})
+        
+        self.results = {}
+        self.simulationCache = sc.sticky["honeybee_EPSimulationCache"]()
+    
+    @staticmethod
+    def fileStamp(filePath):
+        return [os.path.getsize(filePath), int(os.path.getmtime(filePath))]
+    
+    @staticmethod
+    def readErrFile(errFilePath):
+        """Count the warnings and errors in an EnergyPlus .err file."""
+        counts = {'warnings': 0, 'severe': 0, 'fatal': 0, 'completed': False}
+        if not os.path.isfile(errFilePath): return counts
+        with open(errFilePath, 'r') as errFile:
+            for line in errFile:
+                if "** Warning **" in line: counts['warnings'] += 1
+                elif "** Severe  **" in line: counts['severe'] += 1
+                elif "**  Fatal  **" in line: counts['fatal'] += 1
+                elif "EnergyPlus Completed Successfully" in line: counts['completed'] = True
+        return counts
+    
+    def inputStamps(self, job):
+        return {'idf': self.fileStamp(job['idfFilePath']), 'epw': self.fileStamp(self.epwFileAddress),
+                'epwFile': self.epwFileAddress.upper(), 'EPPath': self.EPPath.upper()}
+    
+    def isValid(self, job):
+        """Check if the results of an earlier run can be used."""
+        runInfoFile = job['fullPath'] + '_run.json'
+        if not os.path.isfile(runInfoFile) or not os.path.isfile(job['fullPath'] + '.csv'):
+            return False
+        try:
+            with open(runInfoFile, 'r') as inf:
+                runInfo = json.load(inf)
+        except:
+            return False
+        return runInfo.get('inputs') == self.inputStamps(job) and runInfo.get('completed') == True
+    
+    def writeBatchFile(self, job):
+        if not os.path.isdir(job['jobDir']): os.makedirs(job['jobDir'])
+        shutil.copy(job['idfFilePath'], job['fullPath'] + '.idf')
+        
+        fullPath = job['fullPath']
+        batchStr = job['jobDir'][:2] + '\ncd ' + job['jobDir'] + '\n"' + self.EPPath + \
+                    '\\Epl-run" ' + fullPath + ' ' + fullPath + ' idf ' + self.epwFileAddress + ' EP N nolimit N N 0 Y'
+        
+        batchFileAddress = fullPath + '.bat'
+        with open(batchFileAddress, 'w') as batchfile:
+            batchfile.write(batchStr)
+        
+        return batchFileAddress
+    
+    def runJob(self, job):
+        if self.isValid(job):
+            job.update(self.readErrFile(job['fullPath'] + '.err'))
+            job['status'] = 'skipped'
+            return
+        
+        startTime = time.time()
+        cacheKey = self.simulationCache.key(job['idfFilePath'], self.epwFileAddress, self.EPPath)
+        if not os.path.isdir(job['jobDir']): os.makedirs(job['jobDir'])
+        if self.simulationCache.restore(cacheKey, job['fullPath']):
+            job.update(self.readErrFile(job['fullPath'] + '.err'))
+            job['status'] = 'cached'
+            attempts = []
+        else:
+            attempts = range(self.retries + 1)
+        
+        for attempt in attempts:
+            # remove the results of the earlier runs so a crash can't look like a valid run
+            for ext in ('.csv', '.err', '.eio', '.rdd', '_run.json'):
+                if os.path.isfile(job['fullPath'] + ext): os.remove(job['fullPath'] + ext)
+            
+            runBatchFile(self.writeBatchFile(job), self.runInBackground)
+            job.update(self.readErrFile(job['fullPath'] + '.err'))
+            # only retry runs that ended without an err file
+            if os.path.isfile(job['fullPath'] + '.err'): break
+        
+        job['runTime'] = time.time() - startTime
+        if attempts:
+            job['status'] = 'completed' if job['completed'] else 'failed'
+            self.simulationCache.store(cacheKey, job['fullPath'])
+        
+        with open(job['fullPath'] + '_run.json', 'w') as outf:
+            json.dump({'inputs': self.inputStamps(job), 'completed': job['completed'],
+                       'runTime': job['runTime']}, outf)
+    
+    def readAnnualResults(self, job):
+        """Annual value of each output in the result file of a run."""
+        resultFile = job['fullPath'] + '.csv'
+        if not os.path.isfile(resultFile): return {}
+        
+        with open(resultFile, 'r') as inf:
+            headers = [header.strip() for header in inf.readline().split(',')[1:]]
+            totals = [0.0] * len(headers)
+            count = 0
+            for line in inf:
+                values = line.split(',')[1:]
+                for column, value in enumerate(values[:len(headers)]):
+                    try: totals[column] += float(value)
+                    except ValueError: pass
+                count += 1
+        
+        annualResults = {}
+        for header, total in zip(headers, totals):
+            if not header: continue
+            if any(unit in header for unit in self.energyUnits):
+                annualResults[header + ' (sum)'] = total
+            elif count:
+                annualResults[header + ' (mean)'] = total / count
+        return annualResults
+    
+    def writeManifest(self):
+        manifestFile = os.path.join(self.batchDir, "manifest.csv")
+        with open(manifestFile, 'w') as outf:
+            outf.write("index,idf,status,run time (s),warnings,severe errors,fatal errors\n")
+            for job in self.jobs:
+                outf.write("%d,%s,%s,%.1f,%d,%d,%d\n"%(job['index'], job['idfFilePath'], job['status'], \
+                           job['runTime'], job['warnings'], job['severe'], job['fatal']))
+        return manifestFile
+    
+    def collate(self):
+        """Write the annual results of all the runs to one table indexed by run."""
+        columns = []
+        for job in self.jobs:
+            for header in sorted(self.results.get(job['index'], {}).keys()):
+                if header not in columns: columns.append(header)
+        
+        collatedFile = os.path.join(self.batchDir, "collatedResults.csv")
+        with open(collatedFile, 'w') as outf:
+            outf.write("index,idf," + ",".join(columns) + "\n")
+            for job in self.jobs:
+                annualResults = self.results.get(job['index'], {})
+                values = [str(annualResults[header]) if header in annualResults else '' for header in columns]
+                outf.write("%d,%s,"%(job['index'], job['name']) + ",".join(values) + "\n")
+        return collatedFile
+    
+    def run(self):
+        if not os.path.isdir(self.batchDir): os.makedirs(self.batchDir)
+        
+        jobQueue = Queue.Queue()
+        for job in self.jobs: jobQueue.put(job)
+        
+        def worker():
+            while True:
+                try: job = jobQueue.get_nowait()
+                except Queue.Empty: return
+                try:
+                    self.runJob(job)
+                    if job['completed']: self.results[job['index']] = self.readAnnualResults(job)
+                except Exception, e:
+                    job['status'] = 'failed: ' + str(e)
+        
+        workers = [threading.Thread(target = worker) for i in range(min(self.maxWorkers, len(self.jobs)))]
+        for thread in workers: thread.start()
+        for thread in workers: thread.join()
+        
+        return self.writeManifest(), self.collate()
+
+
 def runParallelIDFs(idfFilePaths, epwFileAddress, runIt, parallel):
     # placeholders for final lists.
     resultFileAddress = [None for x in idfFilePaths]
     eioFileAddress = [None for x in idfFilePaths]
     rddFileAddress = [None for x in idfFilePaths]
     
-    reunInBackground = runIt
-    if parallel == True:
+    # True runs one EnergyPlus per CPU except one and a number sets the number of runs at the same time.
+    if parallel == None or parallel == False:
+        maxWorkers = 1
+    elif parallel == True:
+        maxWorkers = max(1, System.Environment.ProcessorCount - 1)
+    else:
+        maxWorkers = int(parallel)
+    
+    runInBackground = runIt
+    if maxWorkers > 1:
         runInBackground = 2
     
-    def runEP(i):
-        epPath = checkTheInputs(idfFilePaths[i], _epwFileAddress)
-        if epPath != -1:
-            workingDir = "\\".join(idfFilePaths[i].split('\\')[:-1])
-            batchFileAddress, newIDFPath, idfFileName = writeBatchFile(workingDir, idfFilePaths[i], _epwFileAddress, epPath)
-            runBatchFile(batchFileAddress, runInBackground)
-            try:
-                os.remove(newIDFPath)
-            except:
-                pass
-            
-            shIdfFileName = idfFileName.replace('.idf', '')
-            resultFileAddress[i] = str(workingDir) + '\\' + str(shIdfFileName) + '.csv'
-            eioFileAddress[i] = resultFileAddress[i].replace('.csv', '.eio')
-            rddFileAddress[i] = resultFileAddress[i].replace('.csv', '.rdd')
+    validPaths = []
+    for idfFilePath in idfFilePaths:
+        epPath = checkTheInputs(idfFilePath, epwFileAddress)
+        if epPath != -1 and idfFilePath not in validPaths: validPaths.append(idfFilePath)
+    if len(validPaths) == 0:
+        return resultFileAddress, eioFileAddress, rddFileAddress
     
-    if parallel == True:
-        tasks.Parallel.ForEach(range(len(idfFilePaths)), runEP)
-    else:
-        for x in range(len(idfFilePaths)):
-            runEP(x)
+    batchRunner = EPBatchRunner(validPaths, epwFileAddress, epPath, maxWorkers, runInBackground)
+    manifestFile, collatedFile = batchRunner.run()
     
+    for job in batchRunner.jobs:
+        status = job['status']
+        print "%s: %s (%.1f s, %d warnings, %d severe errors, %d fatal errors)"% \
+              (job['name'], status, job['runTime'], job['warnings'], job['severe'], job['fatal'])
+        if job['fatal'] or not status in ('completed', 'skipped', 'cached'):
+            w = gh.GH_RuntimeMessageLevel.Warning
+            ghenv.Component.AddRuntimeMessage(w, "The simulation of %s has failed. Check the .err file for more information."%job['name'])
+    
+    print "Run times and error counts are written to %s"%manifestFile
+    print batchRunner.simulationCache.report()
+    print "Annual results of all the runs are collated to %s"%collatedFile
+    
+    jobs = dict((job['idfFilePath'], job) for job in batchRunner.jobs)
+    for i, idfFilePath in enumerate(idfFilePaths):
+        if idfFilePath in jobs:
+            resultFileAddress[i] = jobs[idfFilePath]['fullPath'] + '.csv'
+            eioFileAddress[i] = resultFileAddress[i].replace('.csv', '.eio')
+            rddFileAddress[i] = resultFileAddress[i].replace('.csv', '.rdd')
     
     return resultFileAddress, eioFileAddress, rddFileAddress
 
@@ -215,13 +425,24 @@ if initCheck and _runIt > 0:
         epPath = checkTheInputs(_idfFilePath[0], _epwFileAddress)
         if epPath != -1:
             workingDir = "\\".join(_idfFilePath[0].split('\\')[:-1])
-            batchFileAddress, newIDFPath, idfFileName = writeBatchFile(workingDir, _idfFilePath[0], _epwFileAddress, epPath)
-            print "The file is written to %s"%batchFileAddress 
-            runBatchFile(batchFileAddress, _runIt)
-            try:
-                os.remove(newIDFPath)
-            except:
-                pass
+            idfFileName = _idfFilePath[0].split('\\')[-1]
+            fullPath = os.path.join(workingDir, idfFileName.replace('.idf', ''))
+            
+            # copy the results of an identical simulation instead of running it again
+            hb_simulationCache = sc.sticky["honeybee_EPSimulationCache"]()
+            cacheKey = hb_simulationCache.key(_idfFilePath[0], _epwFileAddress, epPath)
+            if hb_simulationCache.restore(cacheKey, fullPath):
+                print "The results of an identical simulation are copied from the simulation cache."
+            else:
+                batchFileAddress, newIDFPath, idfFileName = writeBatchFile(workingDir, _idfFilePath[0], _epwFileAddress, epPath)
+                print "The file is written to %s"%batchFileAddress 
+                runBatchFile(batchFileAddress, _runIt)
+                try:
+                    os.remove(newIDFPath)
+                except:
+                    pass
+                hb_simulationCache.store(cacheKey, fullPath)
+            print hb_simulationCache.report()
             
             print '...'
             print 'RUNNING SIMULATION'
@@ -34,6 +34,7 @@ Provided by Honeybee 0.0.66
         _DLAIllumThresholds_: Illuminance threshold for Daylight Autonomy calculation in lux. Default is set to 300 lux.
         SHDGroupI_Sensors_: Senors for dhading group I. Use shadingGroupSensors component to prepare the inputs
         SHDGroupII_Sensors_: Senors for dhading group II. Use shadingGroupSensors component to prepare the inputs
+        fastMetrics_: Set to True to calculate DLA, UDLI, CDA and sDA directly from the .ill files without running Daysim. annualProfiles and htmReport are not generated in this mode. Studies with dynamic shadings and studies that are not in lux always use Daysim. Default is False.
         _runIt: set to True to run the analysis
     Returns:
         DLA: Daylight Autonomy > Percentage of the time during the active occupancy hours that the test point receives more daylight than the illuminance threshold.
@@ -42,15 +43,15 @@ Provided by Honeybee 0.0.66
         UDLI_More_2000: Useful Daylight illuminance > Percentage of time during the active occupancy hours that the test point receives more than 2000 lux.
         CDA: Continuous Daylight Autonomy > Similar to Daylight Autonomy except that the point receives illuminaceLevel/illuminace threshold for hours that illuminance level is less than the threshold.
         sDA: Spatial Daylight Autonomy > sDA is the percent of analysis points across the analysis area that meet or exceed _DLAIllumThresholds value (set to 300 lux for LEED) for at least 50% of the analysis period. Honeybee doesn't consider the effect of dynamic blinds in calculating sDA.
-        annualProfiles: A .csv file generated by Daysim that can be used as lighting schedule for annual energy simulation
+        annualProfiles: A .csv file generated by Daysim that can be used as lighting schedule for annual energy simulation. This output is empty if the results are calculated with fastMetrics_.
 """
 ghenv.Component.Name = "Honeybee_Read Annual Result I"
 ghenv.Component.NickName = 'readAnnualResultsI'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "04 | Daylight | Daylight"
-#compatibleHBVersion = VER 0.0.57\nNOV_03_2015
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nFEB_01_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "2"
 except: pass
@@ -64,8 +65,6 @@ from Grasshopper.Kernel.Data import GH_Path
 import Rhino as rc
 import scriptcontext as sc
 import os
-import subprocess
-import time
 import shutil
 
 """
@@ -84,59 +83,6 @@ def getFilelength(fileName):
             pass
     return i + 1
 
-def executeBatchFiles(batchFileNames, maxPRuns = None, shell = False, waitingTime = 0.2):
-
-    """Run a number of batch files in parallel and
-        wait to end of the analysis.
-
-        Args:
-            batchFileNames: List of batch files
-            maxPRuns: max number of files to be ran in parallel (default = 0)
-            shell: set to True if you do NOT want to see the cmd window while the analysis is runnig
-    """
-
-    if not maxPRuns : maxPRuns = 1
-    maxPRuns = int(maxPRuns)
-    total = len(batchFileNames)
-    
-    if maxPRuns < 1: maxPRuns = 1
-    if maxPRuns > total: maxPRuns = total
-    
-    running = 0
-    done = False
-    jobs = []
-    pid = 0
-    
-    try:
-        while not done:
-            if running < maxPRuns and pid < total:
-                # execute the files
-                jobs.append(subprocess.Popen(batchFileNames[pid].replace("\\", "/") , shell = shell))
-                pid+=1
-                time.sleep(waitingTime)
-            
-            # count how many jobs are running and how many are done
-            running = 0
-            finished = 0
-            for job in jobs:
-                if job.poll() is None:
-                    #one job is still running
-                    running += 1
-                else:
-                    finished += 1
-    
-            if running == maxPRuns:
-                # wait for half a second
-                #print "waiting..."
-                time.sleep(waitingTime)
-    
-            if finished ==  total:
-                done = True
-    
-    except Exception, e:
-        print "Something went wrong: %s"%str(e) 
-
-
 def convertIllFileDaraTreeIntoSortedDictionary(illFilesAddress):
     
     # I should move this function into Honeybee_Honeybee #BadPractice!
@@ -191,7 +137,7 @@ def convertEPScheduleToDSSchedule(scheduleName, folder):
           "# month,day,time,occupancy (1=present/0=absent)\n"
 
     readSchedules = sc.sticky["honeybee_ReadSchedules"](scheduleName, 0)
-    dailyValues  = readSchedules.getScheduleValues()
+    dailyValues  = readSchedules.compileSchedule()
         
     hourlyValues = []
     for values in dailyValues: hourlyValues.extend(values)
@@ -222,7 +168,45 @@ def convertEPScheduleToDSSchedule(scheduleName, folder):
     
     return fullPath
 
-def main(illFilesAddress, testPts, testVecs, occFiles, lightingControlGroups, SHDGroupI_Sensors, SHDGroupII_Sensors, DLAIllumThresholds, runInBackground=False):
+def getIllumThreshold(DLAIllumThresholds, spaceCount):
+    # the same threshold is written to the Daysim header of the space and used by fastMetrics_
+    try: return DLAIllumThresholds[spaceCount]
+    except: return DLAIllumThresholds[0]
+
+def calculateStandardMetrics(illFiles, numOfPtsInEachSpace, occFiles, DLAIllumThresholds):
+    """Calculate DA, CDA and UDLI for all the spaces in a single pass over the ill files.
+    
+    Each space uses the illuminance threshold of its Daysim header and the 100-2000 lux
+    range of useful daylight illuminance that ds_el_lighting uses.
+    """
+    
+    hb_annualDaylightMetrics = sc.sticky["honeybee_AnnualDaylightMetrics"](illFiles)
+    
+    sensorGroups = []
+    for spaceCount, numOfPts in enumerate(numOfPtsInEachSpace):
+        try: occFile = occFiles[spaceCount]
+        except: occFile = occFiles[0]
+        occupancy = hb_annualDaylightMetrics.readOccupancy(occFile)
+        if len(occupancy) != 8760:
+            raise ValueError("%s doesn't have an hourly value for every hour of the year."%occFile)
+        
+        illumT = float(getIllumThreshold(DLAIllumThresholds, spaceCount))
+        sensorGroups.append((numOfPts, occupancy, [illumT]))
+    
+    spaceMetrics = hb_annualDaylightMetrics.calculate(sensorGroups)
+    
+    results = [[], [], [], [], []]
+    for spaceCount, metrics in enumerate(spaceMetrics):
+        illumT = sensorGroups[spaceCount][2][0]
+        results[0].append(metrics['DA'][illumT])
+        results[1].append(metrics['UDILess'])
+        results[2].append(metrics['UDIInRange'])
+        results[3].append(metrics['UDIMore'])
+        results[4].append(metrics['CDA'][illumT])
+    
+    return results
+
+def main(illFilesAddress, testPts, testVecs, occFiles, lightingControlGroups, SHDGroupI_Sensors, SHDGroupII_Sensors, DLAIllumThresholds, fastMetrics=False, runInBackground=False):
     
     if sc.sticky.has_key('honeybee_release'):
 
@@ -406,6 +390,7 @@ def main(illFilesAddress, testPts, testVecs, occFiles, lightingControlGroups, SH
         msg = "Number of points in ill files: " + `sum(numOfPtsInEachFile)` + \
               " doesn't match the number of points in point files: " + `numOfPts`
         return msg, None
+    
    
     # find the heading files and creat multiple ill files for the study
     heaFiles = []
@@ -428,6 +413,27 @@ def main(illFilesAddress, testPts, testVecs, occFiles, lightingControlGroups, SH
     with open(os.path.join(filePath, heaFile), "r") as heainf:
         baseHea = heainf.readlines()
     
+    # the standard metrics can be calculated without Daysim if the study has no dynamic
+    # shadings and the .ill files are in lux. Daysim is still needed for the lighting
+    # schedules and the electric lighting report.
+    if fastMetrics:
+        fastMetricsMsg = None
+        if len(originalIllFilesSorted.keys()) != 1 or len(originalIllFilesSorted[0]) != 1:
+            fastMetricsMsg = "fastMetrics_ doesn't support dynamic shadings."
+        elif "output_units 2" not in [" ".join(line.split()) for line in baseHea]:
+            fastMetricsMsg = "fastMetrics_ only supports .ill files of illuminance in lux."
+        else:
+            try:
+                metrics = calculateStandardMetrics(originalIllFilesSorted[0][0], numOfPtsInEachSpace, occFiles, DLAIllumThresholds)
+                return None, metrics + [[], []]
+            except Exception, e:
+                fastMetricsMsg = "Failed to calculate the results without Daysim: %s"%str(e)
+        
+        warning = fastMetricsMsg + " The results are calculated with Daysim."
+        print warning
+        w = gh.GH_RuntimeMessageLevel.Warning
+        ghenv.Component.AddRuntimeMessage(w, warning)
+    
     modifiedHeaBase = str.Empty
     keywordsToBeRemoved = ["daylight_autonomy_active_RGB", "electric_lighting", "direct_sunlight_file", "thermal_simulation", "occupancy_profile",
                            "continuous_daylight_autonomy_active_RGB", "UDI_100_active_RGB", "UDI_100_2000_active_RGB", "UDI_2000_active_RGB",
@@ -700,8 +706,7 @@ def main(illFilesAddress, testPts, testVecs, occFiles, lightingControlGroups, SH
             modifiedHea += "daylight_savings_time 1\n"
         
         # illuminance level threshold
-        try: illumT = DLAIllumThresholds[spaceCount]
-        except: illumT = DLAIllumThresholds[0]
+        illumT = getIllumThreshold(DLAIllumThresholds, spaceCount)
         
         if modifiedHea.find("[minimum_illuminance_level]") >= 0:
             modifiedHea = modifiedHea.replace("[minimum_illuminance_level]", str(illumT))
@@ -806,7 +811,9 @@ def main(illFilesAddress, testPts, testVecs, occFiles, lightingControlGroups, SH
         batchFileName = os.path.join(filePath, fileName)
         fileNames.append(batchFileName)
 
-    executeBatchFiles(fileNames, ncpus - 1, shell=runInBackground)
+    hb_processScheduler = sc.sticky["honeybee_ProcessScheduler"](ncpus - 1, shell=runInBackground)
+    hb_processScheduler.run(fileNames)
+    hb_processScheduler.report(ghenv.Component)
     
     # calculate sDA    
     
@@ -908,7 +915,7 @@ if _runIt and not isAllNone(_illFilesAddress) and not isAllNone(_testPoints):
     lightingControlGroups_.SimplifyPaths()
     _illFilesAddress.SimplifyPaths()
     
-    res = main(_illFilesAddress, _testPoints, ptsVectors_, occupancyFiles_, lightingControlGroups_, SHDGroupI_Sensors_, SHDGroupII_Sensors_, _DLAIllumThresholds_, _runIt > 1)
+    res = main(_illFilesAddress, _testPoints, ptsVectors_, occupancyFiles_, lightingControlGroups_, SHDGroupI_Sensors_, SHDGroupII_Sensors_, _DLAIllumThresholds_, fastMetrics_, _runIt > 1)
     if res!= -1:
         msg, results = res
         
@@ -928,6 +935,8 @@ if _runIt and not isAllNone(_illFilesAddress) and not isAllNone(_testPoints):
             htmReport = DataTree[Object]()
             
             def readDSStandardResults(filePath):
+                # results that are calculated without Daysim are already a list of values
+                if not isinstance(filePath, str): return filePath
                 results = []
                 with open(filePath, "r") as inf:
                     for line in inf:
@@ -951,7 +960,7 @@ if _runIt and not isAllNone(_illFilesAddress) and not isAllNone(_testPoints):
                 UDLI_100_2000.AddRange(readDSStandardResults(inRangeUDLILists[branchNum]), p)
                 UDLI_More_2000.AddRange(readDSStandardResults(overUDLILists[branchNum]), p)
                 CDA.AddRange(readDSStandardResults(CDALists[branchNum]), p)
-                annualProfiles.Add(EPLSchLists[branchNum], p)
+                if len(EPLSchLists) > branchNum: annualProfiles.Add(EPLSchLists[branchNum], p)
                 sDA.Add(getsDA(DLARes), p)
-                htmReport.Add(htmLists[branchNum], p)
+                if len(htmLists) > branchNum: htmReport.Add(htmLists[branchNum], p)
                     
\ No newline at end of file
@@ -39,11 +39,11 @@ Provided by Honeybee 0.0.66
 """
 ghenv.Component.Name = "Honeybee_Read DS Result for a point"
 ghenv.Component.NickName = 'readDSHourlyResults'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "04 | Daylight | Daylight"
-#compatibleHBVersion = VER 0.0.56\nFEB_01_2015
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nFEB_01_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "0"
 except: pass
@@ -57,6 +57,25 @@ import Grasshopper.Kernel as gh
 from Grasshopper import DataTree
 from Grasshopper.Kernel.Data import GH_Path
 
+w = gh.GH_RuntimeMessageLevel.Warning
+
+#Honeybee check.
+hbCheck = True
+if not sc.sticky.has_key('honeybee_release') == True:
+    hbCheck = False
+    print "You should first let Honeybee fly..."
+    ghenv.Component.AddRuntimeMessage(w, "You should first let Honeybee fly...")
+else:
+    try:
+        if not sc.sticky['honeybee_release'].isCompatible(ghenv.Component): hbCheck = False
+    except:
+        hbCheck = False
+        warning = "You need a newer version of Honeybee to use this compoent." + \
+        "Use updateHoneybee component to update userObjects.\n" + \
+        "If you have already updated userObjects drag Honeybee_Honeybee component " + \
+        "into canvas and try again."
+        ghenv.Component.AddRuntimeMessage(w, warning)
+
 def isAllNone(dataList):
     for item in dataList.AllData():
         if item!=None: return False
@@ -170,6 +189,7 @@ def main(illFilesAddress, testPoints, targetPoint, annualProfiles):
         ghenv.Component.AddRuntimeMessage(w, tempmsg)
     
     illFileSets = convertIllFileDaraTreeIntoSortedDictionary(illFilesAddress)
+    hb_illFileIndex = sc.sticky["honeybee_IllFileIndex"]
         
     # find the index of the point
     pointFound = False
@@ -186,12 +206,10 @@ def main(illFilesAddress, testPoints, targetPoint, annualProfiles):
     # number of points should be the same in all the illfile lists
     # that's why I just try the first list of the ill files
     numOfPtsInEachFile = []
+    illFileIndices = {}
     for illFile in illFileSets[0][0]:
-        with open(illFile, "r") as illInf:
-            for lineCount, line in enumerate(illInf):
-                if not line.startswith("#"):
-                    numOfPtsInEachFile.append(len(line.strip().split(" ")) - 4)
-                    break
+        illFileIndices[illFile] = hb_illFileIndex(illFile)
+        numOfPtsInEachFile.append(illFileIndices[illFile].sensorCount)
     
     # find the right ill file(s) to look into and read the results
     # print targetPtIndex
@@ -241,18 +259,17 @@ def main(illFilesAddress, testPoints, targetPoint, annualProfiles):
     for shadingGroupCount in illFileSets.keys():
         for stateCount, targetIllFiles in enumerate(illFileSets[shadingGroupCount]):
             targetIllFile = targetIllFiles[targetListNumber]
-            result = open(targetIllFile, 'r')
-            for lineCount, line in enumerate(result):
-                hourLuxValue = line.strip().split(" ")[targetIndexNumber + 4]
-                illuminanceValues[shadingGroupCount][stateCount].append(float(hourLuxValue))
-            result.close()
+            # read the column of the point from the indexed copy of the ill file
+            if targetIllFile not in illFileIndices: illFileIndices[targetIllFile] = hb_illFileIndex(targetIllFile)
+            illFileIndex = illFileIndices[targetIllFile]
+            illuminanceValues[shadingGroupCount][stateCount].extend(illFileIndex.getSensor(targetIndexNumber))
             
                 
     return msg, illuminanceValues, shadingProfiles[branch]
 
 
 
-if _targetPoint!=None and not isAllNone(_illFilesAddress) and not isAllNone(_testPoints):
+if hbCheck and _targetPoint!=None and not isAllNone(_illFilesAddress) and not isAllNone(_testPoints):
     
     _testPoints.SimplifyPaths()
     _illFilesAddress.SimplifyPaths()
@@ -37,7 +37,7 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Read EP Custom Result"
 ghenv.Component.NickName = 'EPCustomResult'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -61,6 +61,13 @@ if not sc.sticky.has_key('honeybee_release') == True:
     hbCheck = False
     print "You should first let Honeybee fly..."
     ghenv.Component.AddRuntimeMessage(w, "You should first let Honeybee fly...")
+elif not sc.sticky.has_key('honeybee_EPResultStore'):
+    hbCheck = False
+    warning = "You need a newer version of Honeybee to use this compoent." + \
+    "Use updateHoneybee component to update userObjects.\n" + \
+    "If you have already updated userObjects drag Honeybee_Honeybee component " + \
+    "into canvas and try again."
+    ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
 else:
     try:
         if not sc.sticky['honeybee_release'].isCompatible(ghenv.Component): hbCheck = False
@@ -153,44 +160,47 @@ if hbCheck and _resultFileAddress and _keywords and _resultFileAddress != None:
             keywords.append(word)
     
     try:
-        result = open(_resultFileAddress, 'r')
+        resultReader = sc.sticky["honeybee_EPResultStore"].openReader(_resultFileAddress)
         
-        for lineCount, line in enumerate(result):
-            if lineCount == 0:
-                # PARSE THE FILE HEADING
-                colHeaders = []
-                for column in line.split(','):
-                    colHeaders.append(column)
-                # SEARCH THROUGH THE FILE HEADING
-                simOutputs = hb_EPMaterialAUX.searchListByKeyword(colHeaders, keywords)
-                simOutLower = []
-                for outp in simOutputs:
-                    simOutLower.append(outp.lower())
-                key = []
-                path = []
-                for outp in colHeaders:
-                    if outp.lower() in simOutLower:
-                        outpName = outp.split(' [')[0]
-                        timestep = outp.split('(')[-1].split(')')[0]
-                        units = outp.split('[')[-1].split(']')[0]
-                        makeHeader(results, resultCount, timestep, outpName, units)
-                        key.append(0)
-                        path.append(resultCount)
-                        resultCount += 1
-                    else:
-                        key.append(-1)
-                        path.append(-1)
+        # PARSE THE FILE HEADING
+        colHeaders = []
+        for column in resultReader.header:
+            colHeaders.append(column)
+        # SEARCH THROUGH THE FILE HEADING
+        simOutputs = hb_EPMaterialAUX.searchListByKeyword(colHeaders, keywords)
+        simOutLower = []
+        for outp in simOutputs:
+            simOutLower.append(outp.lower())
+        key = []
+        path = []
+        for outp in colHeaders:
+            if outp.lower() in simOutLower:
+                outpName = outp.split(' [')[0]
+                timestep = outp.split('(')[-1].split(')')[0]
+                units = outp.split('[')[-1].split(']')[0]
+                makeHeader(results, resultCount, timestep, outpName, units)
+                key.append(0)
+                path.append(resultCount)
+                resultCount += 1
             else:
-                for columnCount, column in enumerate(line.split(',')):
-                    p = GH_Path(int(path[columnCount]))
-                    
-                    if key[columnCount] != -1:
-                        results.Add(float(column), p)
-        result.close()
+                key.append(-1)
+                path.append(-1)
+        
+        # READ ONLY THE COLUMNS OF THE REQUESTED OUTPUTS
+        columnIndices = [columnCount for columnCount in range(len(key)) if key[columnCount] != -1]
+        columns, failures = resultReader.readColumns(columnIndices)
+        # LIKE THE ROWS OF THE CSV, ADD THE VALUES UP TO THE FIRST CELL THAT CAN'T BE READ
+        firstFailure = resultReader.firstFailure(failures)
+        for columnCount in columnIndices:
+            values = columns[columnCount]
+            if firstFailure is not None:
+                if columnCount < firstFailure[1]: values = values[:firstFailure[0]+1]
+                else: values = values[:firstFailure[0]]
+            results.AddRange([val for val in values if val == val], GH_Path(int(path[columnCount])))
+        if firstFailure is not None:
+            raise ValueError('Failed to read row ' + str(firstFailure[0]+1) + ' of column ' + str(firstFailure[1]))
         parseSuccess = True
     except:
-        try: result.close()
-        except: pass
         parseSuccess = False
         warn = 'Failed to parse the result file.'
         print warn
@@ -44,7 +44,7 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Read EP HVAC Result"
 ghenv.Component.NickName = 'readEP_HVAC_Result'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -61,6 +61,20 @@ import scriptcontext as sc
 import copy
 import os
 
+#Honeybee check.
+hbCheck = True
+if not sc.sticky.has_key('honeybee_release') == True:
+    hbCheck = False
+    print "You should first let Honeybee fly..."
+    ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, "You should first let Honeybee fly...")
+elif not sc.sticky.has_key('honeybee_EPResultStore'):
+    hbCheck = False
+    warning = "You need a newer version of Honeybee to use this compoent." + \
+    "Use updateHoneybee component to update userObjects.\n" + \
+    "If you have already updated userObjects drag Honeybee_Honeybee component " + \
+    "into canvas and try again."
+    ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
+
 #Read the location and the analysis period info from the eio file, if there is one.
 #Also try to read the floor areas from this file to be used in EUI calculations.
 location = "NoLocation"
@@ -174,161 +188,173 @@ def checkCentralSys(sysInt, sysType):
     return zoneName
 
 
+def addColumnData(resultReader, key, path):
+    #Read only the columns that go into the outputs and add them to the branch of each zone or system.
+    outputs = {0: (sensibleCooling, 3600000.0), 1: (latentCooling, 3600000.0), 2: (sensibleHeating, 3600000.0), \
+        3: (latentHeating, 3600000.0), 4: (supplyVolFlow, 1.0), 5: (supplyAirTemp, 1.0), 6: (supplyAirHumidity, 1.0), \
+        7: (unmetHoursCooling, 1.0), 8: (unmetHoursHeating, 1.0)}
+    
+    #Columns that write into the same branch are interleaved row by row.
+    groups = []
+    groupIndex = {}
+    for columnCount in range(len(resultReader.header)):
+        if not outputs.has_key(key[columnCount]): continue
+        groupKey = (key[columnCount], int(path[columnCount]))
+        if not groupIndex.has_key(groupKey):
+            groupIndex[groupKey] = len(groups)
+            groups.append((key[columnCount], GH_Path(int(path[columnCount])), []))
+        groups[groupIndex[groupKey]][2].append(columnCount)
+    
+    columns, failures = resultReader.readColumns([columnCount for group in groups for columnCount in group[2]])
+    
+    #Like the rows of the csv, values are added up to the first cell that can't be read.
+    firstFailure = resultReader.firstFailure(failures)
+    for k, p, columnCounts in groups:
+        target, divisor = outputs[k]
+        colValues = []
+        for columnCount in columnCounts:
+            values = columns[columnCount]
+            if firstFailure is not None:
+                if columnCount < firstFailure[1]: values = values[:firstFailure[0]+1]
+                else: values = values[:firstFailure[0]]
+            colValues.append(values)
+        if len(colValues) == 1: rowValues = colValues[0]
+        else: rowValues = [val for row in map(None, *colValues) for val in row]
+        #Cells that are missing from a short row are skipped.
+        target.AddRange([val/divisor for val in rowValues if val is not None and val == val], p)
+    
+    if firstFailure is not None:
+        raise ValueError('Failed to read row ' + str(firstFailure[0]+1) + ' of column ' + str(firstFailure[1]))
+
+
 # PARSE THE RESULT FILE.
-if _resultFileAddress and gotData == True:
+if hbCheck and _resultFileAddress and gotData == True:
     try:
-        result = open(_resultFileAddress, 'r')
+        resultReader = sc.sticky["honeybee_EPResultStore"].openReader(_resultFileAddress)
         
-        for lineCount, line in enumerate(result):
-            if lineCount == 0:
-                #ANALYZE THE FILE HEADING
-                key = []; path = []
-                for columnCount, column in enumerate(line.split(',')):
-                    """
-                    if 'Zone Ideal Loads Supply Air Sensible Cooling Energy' in column:
-                        key.append(0)
-                        if 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                        else:
-                            zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS AIR SYSTEM')[0])
-                        makeHeader(sensibleCooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Sensible Cooling Energy", "kWh", True)
+        #ANALYZE THE FILE HEADING
+        key = []; path = []
+        for columnCount, column in enumerate(resultReader.header):
+            """
+            if 'Zone Ideal Loads Supply Air Sensible Cooling Energy' in column:
+                key.append(0)
+                if 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                else:
+                    zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS AIR SYSTEM')[0])
+                makeHeader(sensibleCooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Sensible Cooling Energy", "kWh", True)
+                dataTypeList[0] = True
+            
+            elif 'Zone Ideal Loads Supply Air Latent Cooling Energy' in column:
+                key.append(1)
+                if 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                else:
+                    zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS AIR SYSTEM')[0])
+                makeHeader(latentCooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Latent Cooling Energy", "kWh", True)
+                dataTypeList[1] = True
+            
+            elif 'Zone Ideal Loads Supply Air Sensible Heating Energy' in column:
+                key.append(2)
+                if 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                else:
+                    zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS AIR SYSTEM')[0])
+                makeHeader(sensibleHeating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Sensible Heating Energy", "kWh", True)
+                dataTypeList[2] = True
+            
+            elif 'Zone Ideal Loads Supply Air Latent Heating Energy' in column:
+                key.append(3)
+                if 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                else:
+                    zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS AIR SYSTEM')[0])
+                makeHeader(latentHeating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Latent Heating Energy", "kWh", True)
+                dataTypeList[3] = True
+            """
+            if 'System Node Standard Density Volume Flow Rate' in column:
+                if "RETURN" in column or "OUTDOOR AIR" in column or "ZONE AIR NODE" in column:
+                    key.append(-1)
+                    path.append(-1)
+                else:
+                    if ' IDEAL LOADS SUPPLY INLET' in column:
+                        key.append(4)
+                        zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS SUPPLY INLET')[0])
+                        makeHeader(supplyVolFlow, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Standard Density Volume Flow Rate", "m3/s", True)
                         dataTypeList[0] = True
-                    
-                    elif 'Zone Ideal Loads Supply Air Latent Cooling Energy' in column:
-                        key.append(1)
-                        if 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                        else:
-                            zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS AIR SYSTEM')[0])
-                        makeHeader(latentCooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Latent Cooling Energy", "kWh", True)
-                        dataTypeList[1] = True
-                    
-                    elif 'Zone Ideal Loads Supply Air Sensible Heating Energy' in column:
-                        key.append(2)
-                        if 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                        else:
-                            zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS AIR SYSTEM')[0])
-                        makeHeader(sensibleHeating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Sensible Heating Energy", "kWh", True)
-                        dataTypeList[2] = True
-                    
-                    elif 'Zone Ideal Loads Supply Air Latent Heating Energy' in column:
-                        key.append(3)
-                        if 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                        else:
-                            zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS AIR SYSTEM')[0])
-                        makeHeader(latentHeating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Latent Heating Energy", "kWh", True)
-                        dataTypeList[3] = True
-                    """
-                    if 'System Node Standard Density Volume Flow Rate' in column:
-                        if "RETURN" in column or "OUTDOOR AIR" in column or "ZONE AIR NODE" in column:
+                    else:
+                        try:
+                            zoneName = checkCentralSys((" " + column.split(":")[0].split('NODE')[-1]), 0)
+                            centralSys = True
+                            makeHeader(supplyVolFlow, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Standard Density Volume Flow Rate", "m3/s", True)
+                            dataTypeList[0] = True
+                            key.append(4)
+                            print zoneName
+                        except:
                             key.append(-1)
                             path.append(-1)
-                        else:
-                            if ' IDEAL LOADS SUPPLY INLET' in column:
-                                key.append(4)
-                                zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS SUPPLY INLET')[0])
-                                makeHeader(supplyVolFlow, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Standard Density Volume Flow Rate", "m3/s", True)
-                                dataTypeList[0] = True
-                            else:
-                                try:
-                                    zoneName = checkCentralSys((" " + column.split(":")[0].split('NODE')[-1]), 0)
-                                    centralSys = True
-                                    makeHeader(supplyVolFlow, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Standard Density Volume Flow Rate", "m3/s", True)
-                                    dataTypeList[0] = True
-                                    key.append(4)
-                                    print zoneName
-                                except:
-                                    key.append(-1)
-                                    path.append(-1)
-                    
-                    elif 'System Node Temperature' in column:
-                        if "RETURN" in column or "OUTDOOR AIR" in column or "ZONE AIR NODE" in column:
+            
+            elif 'System Node Temperature' in column:
+                if "RETURN" in column or "OUTDOOR AIR" in column or "ZONE AIR NODE" in column:
+                    key.append(-1)
+                    path.append(-1)
+                else:
+                    if ' IDEAL LOADS SUPPLY INLET' in column:
+                        key.append(5)
+                        zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS SUPPLY INLET')[0])
+                        makeHeader(supplyAirTemp, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Temperature", "C", False)
+                        dataTypeList[1] = True
+                    else:
+                        try:
+                            zoneName = checkCentralSys((" " + column.split(":")[0].split('NODE')[-1]), 1)
+                            centralSys = True
+                            makeHeader(supplyAirTemp, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Temperature", "C", False)
+                            dataTypeList[1] = True
+                            key.append(5)
+                        except:
                             key.append(-1)
                             path.append(-1)
-                        else:
-                            if ' IDEAL LOADS SUPPLY INLET' in column:
-                                key.append(5)
-                                zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS SUPPLY INLET')[0])
-                                makeHeader(supplyAirTemp, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Temperature", "C", False)
-                                dataTypeList[1] = True
-                            else:
-                                try:
-                                    zoneName = checkCentralSys((" " + column.split(":")[0].split('NODE')[-1]), 1)
-                                    centralSys = True
-                                    makeHeader(supplyAirTemp, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Temperature", "C", False)
-                                    dataTypeList[1] = True
-                                    key.append(5)
-                                except:
-                                    key.append(-1)
-                                    path.append(-1)
-                    
-                    elif 'System Node Relative Humidity' in column:
-                        if "RETURN" in column or "OUTDOOR AIR" in column or "ZONE AIR NODE" in column:
+            
+            elif 'System Node Relative Humidity' in column:
+                if "RETURN" in column or "OUTDOOR AIR" in column or "ZONE AIR NODE" in column:
+                    key.append(-1)
+                    path.append(-1)
+                else:
+                    if ' IDEAL LOADS SUPPLY INLET' in column:
+                        key.append(6)
+                        zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS SUPPLY INLET')[0])
+                        makeHeader(supplyAirHumidity, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Relative Humidity", "%", False)
+                        dataTypeList[2] = True
+                    else:
+                        try:
+                            zoneName = checkCentralSys((" " + column.split(":")[0].split('NODE')[-1]), 2)
+                            centralSys = True
+                            makeHeader(supplyAirHumidity, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Relative Humidity", "%", False)
+                            dataTypeList[2] = True
+                            key.append(6)
+                        except:
                             key.append(-1)
                             path.append(-1)
-                        else:
-                            if ' IDEAL LOADS SUPPLY INLET' in column:
-                                key.append(6)
-                                zoneName = checkZone(" " + column.split(':')[0].split(' IDEAL LOADS SUPPLY INLET')[0])
-                                makeHeader(supplyAirHumidity, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Relative Humidity", "%", False)
-                                dataTypeList[2] = True
-                            else:
-                                try:
-                                    zoneName = checkCentralSys((" " + column.split(":")[0].split('NODE')[-1]), 2)
-                                    centralSys = True
-                                    makeHeader(supplyAirHumidity, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Supply Air Relative Humidity", "%", False)
-                                    dataTypeList[2] = True
-                                    key.append(6)
-                                except:
-                                    key.append(-1)
-                                    path.append(-1)
-                    
-                    elif 'Zone Cooling Setpoint Not Met Time' in column:
-                        key.append(7)
-                        zoneName = checkZone(" " + column.split(':')[0])
-                        makeHeader(unmetHoursCooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Unmet Cooling hours", "hours", True)
-                        dataTypeList[3] = True
-                    
-                    elif 'Zone Heating Setpoint Not Met Time' in column:
-                        key.append(8)
-                        zoneName = checkZone(" " + column.split(':')[0])
-                        makeHeader(unmetHoursHeating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Unmet Heating hours", "hours", True)
-                        dataTypeList[4] = True
-                    
-                    else:
-                        key.append(-1)
-                        path.append(-1)
-                    
+            
+            elif 'Zone Cooling Setpoint Not Met Time' in column:
+                key.append(7)
+                zoneName = checkZone(" " + column.split(':')[0])
+                makeHeader(unmetHoursCooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Unmet Cooling hours", "hours", True)
+                dataTypeList[3] = True
+            
+            elif 'Zone Heating Setpoint Not Met Time' in column:
+                key.append(8)
+                zoneName = checkZone(" " + column.split(':')[0])
+                makeHeader(unmetHoursHeating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Unmet Heating hours", "hours", True)
+                dataTypeList[4] = True
+            
             else:
-                for columnCount, column in enumerate(line.split(',')):
-                    p = GH_Path(int(path[columnCount]))
-                    
-                    if key[columnCount] == 0:
-                        sensibleCooling.Add((float(column)/3600000), p)
-                    elif key[columnCount] == 1:
-                        latentCooling.Add((float(column)/3600000), p)
-                    elif key[columnCount] == 2:
-                        sensibleHeating.Add((float(column)/3600000), p)
-                    elif key[columnCount] == 3:
-                        latentHeating.Add((float(column)/3600000), p)
-                    elif key[columnCount] == 4:
-                        supplyVolFlow.Add((float(column)), p)
-                    elif key[columnCount] == 5:
-                        supplyAirTemp.Add(float(column), p)
-                    elif key[columnCount] == 6:
-                        supplyAirHumidity.Add(float(column), p)
-                    elif key[columnCount] == 7:
-                        unmetHoursCooling.Add(float(column),p)
-                    elif key[columnCount] == 8:
-                        unmetHoursHeating.Add(float(column),p)
-                    
-        result.close()
+                key.append(-1)
+                path.append(-1)
+        
+        addColumnData(resultReader, key, path)
         parseSuccess = True
     except:
-        try: result.close()
-        except: pass
         parseSuccess = False
         warn = 'Failed to parse the result file.  Check the folder of the file address you are plugging into this component and make sure that there is a .csv file in the folder. \n'+ \
                   'If there is no csv file or there is a file with no data in it (it is 0 kB), your simulation probably did not run correctly. \n' + \
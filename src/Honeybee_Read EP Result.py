@@ -54,7 +54,7 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Read EP Result"
 ghenv.Component.NickName = 'readEPResult'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -71,6 +71,20 @@ import scriptcontext as sc
 import copy
 import os
 
+#Honeybee check.
+hbCheck = True
+if not sc.sticky.has_key('honeybee_release') == True:
+    hbCheck = False
+    print "You should first let Honeybee fly..."
+    ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, "You should first let Honeybee fly...")
+elif not sc.sticky.has_key('honeybee_EPResultStore'):
+    hbCheck = False
+    warning = "You need a newer version of Honeybee to use this compoent." + \
+    "Use updateHoneybee component to update userObjects.\n" + \
+    "If you have already updated userObjects drag Honeybee_Honeybee component " + \
+    "into canvas and try again."
+    ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
+
 #Check to be sure that the files exist.
 csvExists = True
 if _resultFileAddress and _resultFileAddress != None:
@@ -297,322 +311,353 @@ for name in zoneNameList:
     dataIndex.append(0)
 
 
+#Lookup table of the EnergyPlus outputs that this component reads.  The position of each list is the category used to parse the header and earlier categories take priority.
+headerCategories = [
+    ['Zone Ideal Loads Supply Air Total Cooling Energy', 'Zone Ideal Loads Supply Air Sensible Cooling Energy', 'Zone Ideal Loads Supply Air Latent Cooling Energy', 'Chiller Electric Energy', 'Cooling Coil Electric Energy', 'Zone VRF Air Terminal Cooling Electric Energy', 'VRF Heat Pump Cooling Electric Energy', 'Chiller Heater System Cooling Electric Energy'],
+    ['Zone Ideal Loads Supply Air Total Heating Energy', 'Zone Ideal Loads Supply Air Sensible Heating Energy', 'Zone Ideal Loads Supply Air Latent Heating Energy', 'Boiler Heating Energy', 'Boiler Gas Energy', 'Heating Coil Total Heating Energy', 'Heating Coil Gas Energy', 'Heating Coil Electric Energy', 'Humidifier Electric Energy', 'Zone VRF Air Terminal Heating Electric Energy', 'VRF Heat Pump Heating Electric Energy', 'Chiller Heater System Heating Electric Energy'],
+    ['Zone Lights Electric Energy'],
+    ['Zone Electric Equipment Electric Energy'],
+    ['Fan Electric Energy'],
+    ['Pump Electric Energy'],
+    ['Zone People Total Heating Energy', 'Zone People Sensible Heating Energy', 'Zone People Latent Gain Energy'],
+    ['Zone Windows Total Transmitted Solar Radiation Energy'],
+    ['Zone Ventilation Sensible Heat Loss Energy '],
+    ['Zone Ventilation Sensible Heat Gain Energy'],
+    ['Zone Ideal Loads Zone Total Heating Energy', 'Zone Ideal Loads Zone Sensible Heating Energy', 'Zone Ideal Loads Zone Latent Heating Energy'],
+    ['Zone Ideal Loads Zone Total Cooling Energy', 'Zone Ideal Loads Zone Sensible Cooling Energy', 'Zone Ideal Loads Zone Latent Cooling Energy'],
+    ['Zone Infiltration Total Heat Loss Energy', 'Zone Infiltration Sensible Heat Loss Energy', 'Zone Infiltration Latent Heat Loss Energy'],
+    ['Zone Infiltration Total Heat Gain Energy', 'Zone Infiltration Sensible Heat Gain Energy', 'Zone Infiltration Latent Heat Gain Energy'],
+    ['Zone Operative Temperature'],
+    ['Zone Mean Air Temperature'],
+    ['Zone Mean Radiant Temperature'],
+    ['Zone Air Relative Humidity'],
+    ['Zone Ventilation Standard Density Volume Flow Rate'],
+    ['Zone Infiltration Standard Density Volume Flow Rate'],
+    ['Zone Mechanical Ventilation Standard Density Volume Flow Rate'],
+    ['Earth Tube Air Flow Volume'],
+    ['Zone Air Heat Balance Internal Convective Heat Gain Rate'],
+    ['Zone Air Heat Balance Surface Convection Rate'],
+    ['Zone Air Heat Balance System Air Transfer Rate']
+    ]
+
+def firstCategoryInText(text):
+    for category, names in enumerate(headerCategories):
+        for name in names:
+            if name in text: return category
+    return -1
+
+#Precompile the category of each output variable name so that most headers are classified with a single dictionary lookup.
+headerLookup = {}
+for names in headerCategories:
+    for name in names: headerLookup[name.strip()] = firstCategoryInText(name + ' [')
+
+def classifyHeader(column):
+    #Headers look like KEY:Variable Name [units](frequency).
+    varName = column.split(':')[-1].split('[')[0].strip()
+    try: return headerLookup[varName]
+    except KeyError: return firstCategoryInText(column)
+
+
+def getColumnPath(columnCount):
+    if key[columnCount] != 14:
+        try: return GH_Path(int(path[columnCount]))
+        except: return GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
+    else:
+        return GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
+
+def addColumnData(resultReader, key, path):
+    #Keys that go into data trees with the index of dataTypeList that is switched off if a value can't be read.
+    treeKeys = {0: (cooling, 2), 1: (heating, 3), 2: (electricLight, 4), 3: (electricEquip, 5), 4: (peopleGains, 6), \
+        5: (totalSolarGain, 7), 6: (natVentEnergy, 11), 8: (infiltrationEnergy, 9), 10: (operativeTemperature, 12), \
+        11: (airTemperature, 13), 12: (meanRadTemperature, 14), 13: (relativeHumidity, 15), 15: (fanElectric, None), 25: (pumpElectric, None)}
+    energyKeys = [0, 1, 2, 3, 4, 5, 15, 25]
+    balanceKeys = [6, 8]
+    #Keys that go into the python lists used to construct the combined outputs.
+    listKeys = {23: zoneHeatingEnergy, 24: zoneCoolingEnergy, 16: natVentFlow, 17: infiltrationFlow, 22: mechSysAirFlow, \
+        21: earthTubeFlow, 18: internalAirGain, 19: surfaceAirGain, 20: systemAirGain}
+    
+    #Figure out the target of each requested column and group the columns that write into the same branch.
+    groups = []
+    groupIndex = {}
+    requested = set()
+    for columnCount in range(len(resultReader.header)):
+        p = getColumnPath(columnCount)
+        k = key[columnCount]
+        if treeKeys.has_key(k):
+            target = treeKeys[k][0]
+            groupKey = (id(target), str(p))
+            requested.add(columnCount)
+            if k in balanceKeys: requested.add(columnCount+1)
+        elif listKeys.has_key(k):
+            try: target = listKeys[k][int(path[columnCount])]
+            except: continue
+            groupKey = (id(target), None)
+            requested.add(columnCount)
+        else: continue
+        if not groupIndex.has_key(groupKey):
+            groupIndex[groupKey] = len(groups)
+            groups.append((target, p, []))
+        groups[groupIndex[groupKey]][2].append(columnCount)
+    
+    columns, failures = resultReader.readColumns(sorted(requested))
+    
+    def columnValues(columnCount):
+        #Convert the raw values of a column in the same way that each output expects them.
+        k = key[columnCount]
+        values = columns[columnCount]
+        if k in energyKeys:
+            values = [val/3600000 for val in values]
+        elif k in balanceKeys:
+            nextValues = columns[columnCount+1]
+            values = [((val*(-1)/3600000) + (nextValues[i]/3600000)) for i, val in enumerate(values)]
+            if failures[columnCount] is None: failures[columnCount] = failures[columnCount+1]
+        if treeKeys.has_key(k) and treeKeys[k][1] != None and failures[columnCount] is not None:
+            dataTypeList[treeKeys[k][1]] = False
+        return values
+    
+    for target, p, columnCounts in groups:
+        colValues = [columnValues(columnCount) for columnCount in columnCounts]
+        if len(colValues) == 1: groupValues = colValues[0]
+        else:
+            #Columns writing into the same branch are interleaved row by row.
+            groupValues = [val for rowValues in zip(*colValues) for val in rowValues]
+        groupValues = [val for val in groupValues if val == val]
+        if isinstance(target, list): target.extend(groupValues)
+        else: target.AddRange(groupValues, p)
+
+
 # PARSE THE RESULT FILE.
-if _resultFileAddress and gotData == True and csvExists == True:
+if hbCheck and _resultFileAddress and gotData == True and csvExists == True:
     try:
-        result = open(_resultFileAddress, 'r')
+        resultReader = sc.sticky["honeybee_EPResultStore"].openReader(_resultFileAddress)
         
-        for lineCount, line in enumerate(result):
-            if lineCount == 0:
-                #ANALYZE THE FILE HEADING
-                key = []; path = []
-                for columnCount, column in enumerate(line.split(',')):
-                    
-                    if 'Zone Ideal Loads Supply Air Total Cooling Energy' in column or 'Zone Ideal Loads Supply Air Sensible Cooling Energy' in column or 'Zone Ideal Loads Supply Air Latent Cooling Energy' in column or 'Chiller Electric Energy' in column or 'Cooling Coil Electric Energy' in column or 'Zone VRF Air Terminal Cooling Electric Energy' in column or 'VRF Heat Pump Cooling Electric Energy' in column or 'Chiller Heater System Cooling Electric Energy' in column:
-                        
-                        if 'Zone Ideal Loads Supply Air Total Cooling Energy' in column and 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                            idealAirTrigger = True
-                        elif 'Zone Ideal Loads Supply Air Sensible Cooling Energy' in column and 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                            idealAirTrigger = True
-                        elif 'IDEAL LOADS AIR SYSTEM' in column:
-                            zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS AIR SYSTEM')[0])
-                            idealAirTrigger = True
-                        else:
-                            zoneName = " " +column.split(":")[0]
-                            checkCustomName(coolingC)
-                        
-                        try:
-                            if idealAirTrigger == True:
-                                makeHeader(cooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Cooling Load", energyUnit, True)
-                            else:
-                                makeHeader(cooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Cooling Electric Energy", energyUnit, True)
-                            dataTypeList[2] = True
-                            key.append(0)
-                            coolingC += 1
-                        except:
-                            key.append(-1)
-                    
-                    elif 'Zone Ideal Loads Supply Air Total Heating Energy' in column or 'Zone Ideal Loads Supply Air Sensible Heating Energy' in column or 'Zone Ideal Loads Supply Air Latent Heating Energy' in column or 'Boiler Heating Energy' in column or 'Boiler Gas Energy' in column or 'Heating Coil Total Heating Energy' in column or 'Heating Coil Gas Energy' in column or 'Heating Coil Electric Energy' in column or 'Humidifier Electric Energy' in column or 'Zone VRF Air Terminal Heating Electric Energy' in column or 'VRF Heat Pump Heating Electric Energy' in column or 'Chiller Heater System Heating Electric Energy' in column:
-                        idealAirTrigger = 2
-                        if 'Zone Ideal Loads Supply Air Total Heating Energy' in column and 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                            idealAirTrigger = True
-                        elif 'IDEAL LOADS AIR SYSTEM' in column:
-                            zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS AIR SYSTEM')[0])
-                            idealAirTrigger = True
-                        elif 'Heating Coil Total Heating Energy' not in column:
-                            zoneName = " " +column.split(":")[0]
-                            checkCustomName(heatingC)
-                        else:
-                            zoneName = None
-                            path.append(0)
-                        
-                        if 'COIL HEATING GAS' in column and not 'Heating Coil Electric Energy' in column:
-                            idealAirTrigger = False
-                        elif 'Boiler Heating Energy' in column or 'Boiler Gas Energy' in column:
-                            idealAirTrigger = False
-                        
-                        try:
-                            if zoneName != None:
-                                if idealAirTrigger == True:
-                                    makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Load", energyUnit, True)
-                                elif idealAirTrigger == False:
-                                    makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Fuel Energy", energyUnit, False)
-                                else:
-                                    makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Electric Energy", energyUnit, False)
-                                dataTypeList[3] = True
-                                key.append(1)
-                                heatingC += 1
-                            else:
-                                key.append(-1)
-                        except:
-                            key.append(-1)
-                    
-                    elif 'Zone Lights Electric Energy' in column:
-                        key.append(2)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(electricLight, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Electric Lighting Energy", energyUnit, True)
-                        dataTypeList[4] = True
-                    
-                    elif 'Zone Electric Equipment Electric Energy' in column:
-                        key.append(3)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(electricEquip, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Electric Equipment Energy", energyUnit, True)
-                        dataTypeList[5] = True
-                    
-                    elif 'Fan Electric Energy' in column:
-                        key.append(15)
-                        if 'FAN ON OFF' in column:
-                            zoneName = checkZoneSys(" " + ":".join(column.split(":")[:-1]).split('FAN ON OFF ')[-1], fanC)
-                            makeHeader(fanElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Fan Electric Energy", energyUnit, False)
-                        else:
-                            zoneName = " " +column.split(":")[0]
-                            checkCustomName(fanC)
-                            makeHeader(fanElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Fan Electric Energy", energyUnit, False)
-                        fanC += 1
-                        dataTypeList[6] = True
-                    
-                    elif 'Pump Electric Energy' in column:
-                        key.append(25)
-                        if 'PUMP CONSTANT SPEED' in column:
-                            zoneName = checkZoneSys(" " + ":".join(column.split(":")[:-1]).split('PUMP CONSTANT SPEED ')[-1])
-                            makeHeader(pumpElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Pump Electric Energy", energyUnit, True)
-                        else:
-                            zoneName = " " + column.split(":")[0]
-                            checkCustomName(pumpC)
-                            makeHeader(pumpElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Pump Electric Energy", energyUnit, True)
-                        pumpC += 1
-                        dataTypeList[7] = True
-                    
-                    elif 'Zone People Total Heating Energy' in column or 'Zone People Sensible Heating Energy' in column or 'Zone People Latent Gain Energy' in column:
-                        key.append(4)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(peopleGains, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "People Energy", energyUnit, True)
-                        dataTypeList[8] = True
-                    
-                    elif 'Zone Windows Total Transmitted Solar Radiation Energy' in column:
-                        key.append(5)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(totalSolarGain, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Total Solar Gain", energyUnit, True)
-                        dataTypeList[9] = True
-                    
-                    elif 'Zone Ventilation Sensible Heat Loss Energy ' in column:
-                        key.append(6)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(natVentEnergy, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Natural Ventilation Energy", energyUnit, True)
-                        dataTypeList[12] = True
-                    
-                    elif 'Zone Ventilation Sensible Heat Gain Energy' in column:
-                        key.append(7)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                    
-                    elif 'Zone Ideal Loads Zone Total Heating Energy' in column or 'Zone Ideal Loads Zone Sensible Heating Energy' in column or 'Zone Ideal Loads Zone Latent Heating Energy' in column:
-                        key.append(23)
-                        if 'Zone Ideal Loads Zone Total Heating Energy' in column and 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                        else:
-                            zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS')[0])
-                        zoneHeatingEnergy[int(path[-1])].append(zoneName)
-                        zoneHeatingEnergy[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Ideal Loads Zone Total Cooling Energy' in column or 'Zone Ideal Loads Zone Sensible Cooling Energy' in column or 'Zone Ideal Loads Zone Latent Cooling Energy' in column:
-                        key.append(24)
-                        if 'Zone Ideal Loads Zone Total Cooling Energy' in column and 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+        #ANALYZE THE FILE HEADING
+        key = []; path = []
+        for columnCount, column in enumerate(resultReader.header):
+            category = classifyHeader(column)
+            
+            if category == 0:
+                
+                if 'Zone Ideal Loads Supply Air Total Cooling Energy' in column and 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                    idealAirTrigger = True
+                elif 'Zone Ideal Loads Supply Air Sensible Cooling Energy' in column and 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                    idealAirTrigger = True
+                elif 'IDEAL LOADS AIR SYSTEM' in column:
+                    zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS AIR SYSTEM')[0])
+                    idealAirTrigger = True
+                else:
+                    zoneName = " " +column.split(":")[0]
+                    checkCustomName(coolingC)
+                
+                try:
+                    if idealAirTrigger == True:
+                        makeHeader(cooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Cooling Load", energyUnit, True)
+                    else:
+                        makeHeader(cooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Cooling Electric Energy", energyUnit, True)
+                    dataTypeList[2] = True
+                    key.append(0)
+                    coolingC += 1
+                except:
+                    key.append(-1)
+            
+            elif category == 1:
+                idealAirTrigger = 2
+                if 'Zone Ideal Loads Supply Air Total Heating Energy' in column and 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                    idealAirTrigger = True
+                elif 'IDEAL LOADS AIR SYSTEM' in column:
+                    zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS AIR SYSTEM')[0])
+                    idealAirTrigger = True
+                elif 'Heating Coil Total Heating Energy' not in column:
+                    zoneName = " " +column.split(":")[0]
+                    checkCustomName(heatingC)
+                else:
+                    zoneName = None
+                    path.append(0)
+                
+                if 'COIL HEATING GAS' in column and not 'Heating Coil Electric Energy' in column:
+                    idealAirTrigger = False
+                elif 'Boiler Heating Energy' in column or 'Boiler Gas Energy' in column:
+                    idealAirTrigger = False
+                
+                try:
+                    if zoneName != None:
+                        if idealAirTrigger == True:
+                            makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Load", energyUnit, True)
+                        elif idealAirTrigger == False:
+                            makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Fuel Energy", energyUnit, False)
                         else:
-                            zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS')[0])
-                        zoneCoolingEnergy[int(path[-1])].append(zoneName)
-                        zoneCoolingEnergy[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Infiltration Total Heat Loss Energy' in column or 'Zone Infiltration Sensible Heat Loss Energy' in column or 'Zone Infiltration Latent Heat Loss Energy' in column:
-                        key.append(8)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(infiltrationEnergy, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Infiltration Energy", energyUnit, True)
-                        dataTypeList[10] = True
-                    
-                    elif 'Zone Infiltration Total Heat Gain Energy' in column or 'Zone Infiltration Sensible Heat Gain Energy' in column or 'Zone Infiltration Latent Heat Gain Energy' in column:
-                        key.append(9)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                    
-                    elif 'Zone Operative Temperature' in column:
-                        key.append(10)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(operativeTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Operative Temperature", "C", False)
-                        dataTypeList[13] = True
-                    
-                    elif 'Zone Mean Air Temperature' in column:
-                        key.append(11)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(airTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Air Temperature", "C", False)
-                        dataTypeList[14] = True
-                    
-                    elif 'Zone Mean Radiant Temperature' in column:
-                        key.append(12)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(meanRadTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Radiant Temperature", "C", False)
-                        dataTypeList[15] = True
-                    
-                    elif 'Zone Air Relative Humidity' in column:
-                        key.append(13)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(relativeHumidity, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Relative Humidity", "%", False)
-                        dataTypeList[16] = True
-                    
-                    elif 'Zone Ventilation Standard Density Volume Flow Rate' in column:
-                        key.append(16)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        natVentFlow[int(path[-1])].append(zoneName)
-                        natVentFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Infiltration Standard Density Volume Flow Rate' in column:
-                        key.append(17)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        infiltrationFlow[int(path[-1])].append(zoneName)
-                        infiltrationFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Mechanical Ventilation Standard Density Volume Flow Rate' in column:
-                        key.append(22)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        mechSysAirFlow[int(path[-1])].append(zoneName)
-                        mechSysAirFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Earth Tube Air Flow Volume' in column:
-                        key.append(21)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        earthTubeFlow[int(path[-1])].append(zoneName)
-                        earthTubeFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Air Heat Balance Internal Convective Heat Gain Rate' in column:
-                        key.append(18)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        internalAirGain[int(path[-1])].append(zoneName)
-                        internalAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Air Heat Balance Surface Convection Rate' in column:
-                        key.append(19)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        surfaceAirGain[int(path[-1])].append(zoneName)
-                        surfaceAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Air Heat Balance System Air Transfer Rate' in column:
-                        key.append(20)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        systemAirGain[int(path[-1])].append(zoneName)
-                        systemAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
+                            makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Electric Energy", energyUnit, False)
+                        dataTypeList[3] = True
+                        key.append(1)
+                        heatingC += 1
                     else:
                         key.append(-1)
-                        path.append(-1)
+                except:
+                    key.append(-1)
+            
+            elif category == 2:
+                key.append(2)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(electricLight, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Electric Lighting Energy", energyUnit, True)
+                dataTypeList[4] = True
+            
+            elif category == 3:
+                key.append(3)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(electricEquip, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Electric Equipment Energy", energyUnit, True)
+                dataTypeList[5] = True
+            
+            elif category == 4:
+                key.append(15)
+                if 'FAN ON OFF' in column:
+                    zoneName = checkZoneSys(" " + ":".join(column.split(":")[:-1]).split('FAN ON OFF ')[-1], fanC)
+                    makeHeader(fanElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Fan Electric Energy", energyUnit, False)
+                else:
+                    zoneName = " " +column.split(":")[0]
+                    checkCustomName(fanC)
+                    makeHeader(fanElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Fan Electric Energy", energyUnit, False)
+                fanC += 1
+                dataTypeList[6] = True
+            
+            elif category == 5:
+                key.append(25)
+                if 'PUMP CONSTANT SPEED' in column:
+                    zoneName = checkZoneSys(" " + ":".join(column.split(":")[:-1]).split('PUMP CONSTANT SPEED ')[-1])
+                    makeHeader(pumpElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Pump Electric Energy", energyUnit, True)
+                else:
+                    zoneName = " " + column.split(":")[0]
+                    checkCustomName(pumpC)
+                    makeHeader(pumpElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Pump Electric Energy", energyUnit, True)
+                pumpC += 1
+                dataTypeList[7] = True
+            
+            elif category == 6:
+                key.append(4)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(peopleGains, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "People Energy", energyUnit, True)
+                dataTypeList[8] = True
+            
+            elif category == 7:
+                key.append(5)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(totalSolarGain, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Total Solar Gain", energyUnit, True)
+                dataTypeList[9] = True
+            
+            elif category == 8:
+                key.append(6)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(natVentEnergy, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Natural Ventilation Energy", energyUnit, True)
+                dataTypeList[12] = True
+            
+            elif category == 9:
+                key.append(7)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+            
+            elif category == 10:
+                key.append(23)
+                if 'Zone Ideal Loads Zone Total Heating Energy' in column and 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                else:
+                    zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS')[0])
+                zoneHeatingEnergy[int(path[-1])].append(zoneName)
+                zoneHeatingEnergy[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif category == 11:
+                key.append(24)
+                if 'Zone Ideal Loads Zone Total Cooling Energy' in column and 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                else:
+                    zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS')[0])
+                zoneCoolingEnergy[int(path[-1])].append(zoneName)
+                zoneCoolingEnergy[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif category == 12:
+                key.append(8)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(infiltrationEnergy, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Infiltration Energy", energyUnit, True)
+                dataTypeList[10] = True
+            
+            elif category == 13:
+                key.append(9)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+            
+            elif category == 14:
+                key.append(10)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(operativeTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Operative Temperature", "C", False)
+                dataTypeList[13] = True
+            
+            elif category == 15:
+                key.append(11)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(airTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Air Temperature", "C", False)
+                dataTypeList[14] = True
+            
+            elif category == 16:
+                key.append(12)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(meanRadTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Radiant Temperature", "C", False)
+                dataTypeList[15] = True
+            
+            elif category == 17:
+                key.append(13)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(relativeHumidity, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Relative Humidity", "%", False)
+                dataTypeList[16] = True
+            
+            elif category == 18:
+                key.append(16)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                natVentFlow[int(path[-1])].append(zoneName)
+                natVentFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif category == 19:
+                key.append(17)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                infiltrationFlow[int(path[-1])].append(zoneName)
+                infiltrationFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif category == 20:
+                key.append(22)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                mechSysAirFlow[int(path[-1])].append(zoneName)
+                mechSysAirFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif category == 21:
+                key.append(21)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                earthTubeFlow[int(path[-1])].append(zoneName)
+                earthTubeFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif category == 22:
+                key.append(18)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                internalAirGain[int(path[-1])].append(zoneName)
+                internalAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif category == 23:
+                key.append(19)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                surfaceAirGain[int(path[-1])].append(zoneName)
+                surfaceAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif category == 24:
+                key.append(20)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                systemAirGain[int(path[-1])].append(zoneName)
+                systemAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
             
             else:
-                for columnCount, column in enumerate(line.split(',')):
-                    if key[columnCount] != 14:
-                        try: p = GH_Path(int(path[columnCount]))
-                        except: p = GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
-                    else:
-                        p = GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
-                    
-                    if key[columnCount] == 0:
-                        try: cooling.Add((float(column)/3600000), p)
-                        except: dataTypeList[2] = False
-                    elif key[columnCount] == 1:
-                        try: heating.Add((float(column)/3600000), p)
-                        except: dataTypeList[3] = False
-                    elif key[columnCount] == 2:
-                        try: electricLight.Add((float(column)/3600000), p)
-                        except: dataTypeList[4] = False
-                    elif key[columnCount] == 3:
-                        try: electricEquip.Add((float(column)/3600000), p)
-                        except: dataTypeList[5] = False
-                    elif key[columnCount] == 4:
-                        try: peopleGains.Add((float(column)/3600000), p)
-                        except: dataTypeList[6] = False
-                    elif key[columnCount] == 5:
-                        try: totalSolarGain.Add((float(column)/3600000), p)
-                        except: dataTypeList[7] = False
-                    elif key[columnCount] == 6:
-                        try: natVentEnergy.Add((((float(column))*(-1)/3600000) + ((float( line.split(',')[columnCount+1] ))/3600000)), p)
-                        except: dataTypeList[11] = False
-                    elif key[columnCount] == 7:
-                        pass
-                    elif key[columnCount] == 23:
-                        try: zoneHeatingEnergy[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 24:
-                        try: zoneCoolingEnergy[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 8:
-                        try: infiltrationEnergy.Add((((float(column))*(-1)/3600000) + ((float( line.split(',')[columnCount+1] ))/3600000)), p)
-                        except: dataTypeList[9] = False
-                    elif key[columnCount] == 9:
-                        pass
-                    elif key[columnCount] == 10:
-                        try: operativeTemperature.Add(float(column), p)
-                        except: dataTypeList[12] = False
-                    elif key[columnCount] == 11:
-                        try: airTemperature.Add(float(column), p)
-                        except: dataTypeList[13] = False
-                    elif key[columnCount] == 12:
-                        try: meanRadTemperature.Add(float(column), p)
-                        except: dataTypeList[14] = False
-                    elif key[columnCount] == 13:
-                        try: relativeHumidity.Add(float(column), p)
-                        except: dataTypeList[15] = False
-                    elif key[columnCount] == 15:
-                        try: fanElectric.Add((float(column)/3600000), p)
-                        except: pass
-                    elif key[columnCount] == 25:
-                        try: pumpElectric.Add((float(column)/3600000), p)
-                        except: pass
-                    elif key[columnCount] == 16:
-                        try: natVentFlow[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 17:
-                        try: infiltrationFlow[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 22:
-                        try: mechSysAirFlow[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 21:
-                        try: earthTubeFlow[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 18:
-                        try: internalAirGain[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 19:
-                        try: surfaceAirGain[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 20:
-                        try: systemAirGain[int(path[columnCount])].append(float(column))
-                        except: pass
-                    
-        result.close()
+                key.append(-1)
+                path.append(-1)
+        
+        #READ ONLY THE COLUMNS THAT ARE USED BY THE OUTPUTS
+        addColumnData(resultReader, key, path)
         parseSuccess = True
     except:
-        try: result.close()
-        except: pass
         parseSuccess = False
         warn = 'Failed to parse the result file.  Check the folder of the file address you are plugging into this component and make sure that there is a .csv file in the folder. \n'+ \
                   'If there is a file with no data in it (it is 0 kB), your simulation probably did not run correctly. \n' + \
@@ -45,7 +45,7 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Read EP Surface Result"
 ghenv.Component.NickName = 'readEPSrfResult'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -63,6 +63,21 @@ import copy
 import os
 
 
+#Honeybee check.
+hbCheck = True
+if not sc.sticky.has_key('honeybee_release') == True:
+    hbCheck = False
+    print "You should first let Honeybee fly..."
+    ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, "You should first let Honeybee fly...")
+elif not sc.sticky.has_key('honeybee_EPResultStore'):
+    hbCheck = False
+    warning = "You need a newer version of Honeybee to use this compoent." + \
+    "Use updateHoneybee component to update userObjects.\n" + \
+    "If you have already updated userObjects drag Honeybee_Honeybee component " + \
+    "into canvas and try again."
+    ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
+
+
 #Read the location and the analysis period info from the eio file, if there is one.
 #Also try to read the names of the zones and the surfaces from this file.
 location = "NoLocation"
@@ -327,234 +342,252 @@ for zone in range(len(zoneSrfNameList)): dataIndex.append(0)
 
 
 # PARSE THE RESULT FILE.
-if _resultFileAddress and gotZoneData == True and gotSrfData == True:
+if hbCheck and _resultFileAddress and gotZoneData == True and gotSrfData == True:
     try:
-        result = open(_resultFileAddress, 'r')
+        resultReader = sc.sticky["honeybee_EPResultStore"].openReader(_resultFileAddress)
         
-        for lineCount, line in enumerate(result):
-            if lineCount == 0:
-                #ANALYZE THE FILE HEADING
-                key = []; path = []; duplicateList = []; pieceNumList = []
-                for columnCount, column in enumerate(line.split(',')):
-                    srfName = column.split(':')[0]
-                    if 'Surface Inside Face Temperature' in column:
-                        if gotSrfData == True:
-                            srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 0)
-                            duplicateList.append(duplicate)
-                            pieceNumList.append(pieceNum)
-                            if pieceNum < 2 and path[columnCount] != -1:
-                                makeHeaderGrafted(surfaceIndoorTemp, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Inner Surface Temperature", "C", False, typeName)
-                        else:
-                            path.append([InTemp])
-                            duplicateList.append(False)
-                            pieceNumList.append(1)
-                            makeHeader(surfaceIndoorTemp, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Inner Surface Temperature", "C")
-                            InTemp += 1
-                        key.append(1)
-                        dataTypeList[0] = True
-                    
-                    elif 'Surface Outside Face Temperature' in column:
-                        if gotSrfData == True:
-                            srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 1)
-                            duplicateList.append(duplicate)
-                            pieceNumList.append(pieceNum)
-                            if pieceNum < 2 and path[columnCount] != -1:
-                                makeHeaderGrafted(surfaceOutdoorTemp, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Outer Surface Temperature", "C", False, typeName)
-                        else:
-                            path.append([OutTemp])
-                            duplicateList.append(False)
-                            pieceNumList.append(1)
-                            makeHeader(surfaceOutdoorTemp, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Outer Surface Temperature", "C")
-                            OutTemp += 1
-                        key.append(2)
-                        dataTypeList[1] = True
-                    
-                    elif 'Surface Average Face Conduction Heat Transfer Energy' in column:
-                        if gotSrfData == True:
-                            srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 2)
-                            duplicateList.append(duplicate)
-                            pieceNumList.append(pieceNum)
-                            if pieceNum < 2 and path[columnCount] != -1: makeHeaderGrafted(opaqueEnergyFlow, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Surface Energy Loss/Gain", "kWh", True, typeName)
-                        else:
-                            path.append([opaConduct])
-                            duplicateList.append(False)
-                            pieceNumList.append(1)
-                            makeHeader(opaqueEnergyFlow, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Surface Energy Loss/Gain", "kWh")
-                            opaConduct += 1
-                        key.append(3)
-                        dataTypeList[3] = True
-                    
-                    elif 'Surface Window Heat Gain Energy' in column:
-                        if gotSrfData == True:
-                            srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 3)
-                            duplicateList.append(duplicate)
-                            pieceNumList.append(pieceNum)
-                            if pieceNum < 2 and path[columnCount] != -1: makeHeaderGrafted(glazEnergyFlow, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Surface Energy Loss/Gain", "kWh", True, typeName)
-                        else:
-                            path.append([glzGain])
-                            duplicateList.append(False)
-                            pieceNumList.append(1)
-                            makeHeader(glazEnergyFlow, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Surface Energy Loss/Gain", "kWh")
-                            glzGain += 1
-                        key.append(4)
-                        dataTypeList[4] = True
-                    
-                    elif 'Surface Window Heat Loss Energy' in column:
-                        if gotSrfData == True:
-                            srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 4)
-                            duplicateList.append(duplicate)
-                            pieceNumList.append(pieceNum)
-                        else:
-                            path.append([glzLoss])
-                            duplicateList.append(False)
-                            pieceNumList.append(1)
-                            glzLoss += 1
-                        key.append(5)
-                    
-                    elif 'Surface Window Transmitted Beam Solar Radiation Energy' in column:
-                        if gotSrfData == True:
-                            srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 5)
-                            duplicateList.append(duplicate)
-                            pieceNumList.append(pieceNum)
-                            if pieceNum < 2 and path[columnCount] != -1: makeHeaderGrafted(windowBeamEnergy, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Window Transmitted Beam Energy", "kWh", True, typeName)
-                        else:
-                            path.append([glzBeamGain])
-                            duplicateList.append(False)
-                            pieceNumList.append(1)
-                            makeHeader(windowBeamEnergy, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Window Transmitted Beam Energy", "kWh")
-                            glzBeamGain += 1
-                        key.append(6)
-                        dataTypeList[6] = True
-                    
-                    elif 'Surface Window Transmitted Diffuse Solar Radiation Energy' in column:
-                        if gotSrfData == True:
-                            srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 6)
-                            duplicateList.append(duplicate)
-                            pieceNumList.append(pieceNum)
-                            if pieceNum < 2 and path[columnCount] != -1: makeHeaderGrafted(windowDiffEnergy, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Window Transmitted Diffuse Energy", "kWh", True, typeName)
+        #ANALYZE THE FILE HEADING
+        key = []; path = []; duplicateList = []; pieceNumList = []
+        for columnCount, column in enumerate(resultReader.header):
+            srfName = column.split(':')[0]
+            if 'Surface Inside Face Temperature' in column:
+                if gotSrfData == True:
+                    srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 0)
+                    duplicateList.append(duplicate)
+                    pieceNumList.append(pieceNum)
+                    if pieceNum < 2 and path[columnCount] != -1:
+                        makeHeaderGrafted(surfaceIndoorTemp, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Inner Surface Temperature", "C", False, typeName)
+                else:
+                    path.append([InTemp])
+                    duplicateList.append(False)
+                    pieceNumList.append(1)
+                    makeHeader(surfaceIndoorTemp, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Inner Surface Temperature", "C")
+                    InTemp += 1
+                key.append(1)
+                dataTypeList[0] = True
+            
+            elif 'Surface Outside Face Temperature' in column:
+                if gotSrfData == True:
+                    srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 1)
+                    duplicateList.append(duplicate)
+                    pieceNumList.append(pieceNum)
+                    if pieceNum < 2 and path[columnCount] != -1:
+                        makeHeaderGrafted(surfaceOutdoorTemp, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Outer Surface Temperature", "C", False, typeName)
+                else:
+                    path.append([OutTemp])
+                    duplicateList.append(False)
+                    pieceNumList.append(1)
+                    makeHeader(surfaceOutdoorTemp, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Outer Surface Temperature", "C")
+                    OutTemp += 1
+                key.append(2)
+                dataTypeList[1] = True
+            
+            elif 'Surface Average Face Conduction Heat Transfer Energy' in column:
+                if gotSrfData == True:
+                    srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 2)
+                    duplicateList.append(duplicate)
+                    pieceNumList.append(pieceNum)
+                    if pieceNum < 2 and path[columnCount] != -1: makeHeaderGrafted(opaqueEnergyFlow, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Surface Energy Loss/Gain", "kWh", True, typeName)
+                else:
+                    path.append([opaConduct])
+                    duplicateList.append(False)
+                    pieceNumList.append(1)
+                    makeHeader(opaqueEnergyFlow, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Surface Energy Loss/Gain", "kWh")
+                    opaConduct += 1
+                key.append(3)
+                dataTypeList[3] = True
+            
+            elif 'Surface Window Heat Gain Energy' in column:
+                if gotSrfData == True:
+                    srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 3)
+                    duplicateList.append(duplicate)
+                    pieceNumList.append(pieceNum)
+                    if pieceNum < 2 and path[columnCount] != -1: makeHeaderGrafted(glazEnergyFlow, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Surface Energy Loss/Gain", "kWh", True, typeName)
+                else:
+                    path.append([glzGain])
+                    duplicateList.append(False)
+                    pieceNumList.append(1)
+                    makeHeader(glazEnergyFlow, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Surface Energy Loss/Gain", "kWh")
+                    glzGain += 1
+                key.append(4)
+                dataTypeList[4] = True
+            
+            elif 'Surface Window Heat Loss Energy' in column:
+                if gotSrfData == True:
+                    srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 4)
+                    duplicateList.append(duplicate)
+                    pieceNumList.append(pieceNum)
+                else:
+                    path.append([glzLoss])
+                    duplicateList.append(False)
+                    pieceNumList.append(1)
+                    glzLoss += 1
+                key.append(5)
+            
+            elif 'Surface Window Transmitted Beam Solar Radiation Energy' in column:
+                if gotSrfData == True:
+                    srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 5)
+                    duplicateList.append(duplicate)
+                    pieceNumList.append(pieceNum)
+                    if pieceNum < 2 and path[columnCount] != -1: makeHeaderGrafted(windowBeamEnergy, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Window Transmitted Beam Energy", "kWh", True, typeName)
+                else:
+                    path.append([glzBeamGain])
+                    duplicateList.append(False)
+                    pieceNumList.append(1)
+                    makeHeader(windowBeamEnergy, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Window Transmitted Beam Energy", "kWh")
+                    glzBeamGain += 1
+                key.append(6)
+                dataTypeList[6] = True
+            
+            elif 'Surface Window Transmitted Diffuse Solar Radiation Energy' in column:
+                if gotSrfData == True:
+                    srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 6)
+                    duplicateList.append(duplicate)
+                    pieceNumList.append(pieceNum)
+                    if pieceNum < 2 and path[columnCount] != -1: makeHeaderGrafted(windowDiffEnergy, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Window Transmitted Diffuse Energy", "kWh", True, typeName)
+                else:
+                    path.append([glzDiffGain])
+                    duplicateList.append(False)
+                    pieceNumList.append(1)
+                    makeHeader(windowDiffEnergy, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Window Transmitted Diffuse Energy", "kWh")
+                    glzDiffGain += 1
+                key.append(7)
+                dataTypeList[7] = True
+            
+            elif 'Surface Window Transmitted Solar Radiation Energy' in column:
+                if gotSrfData == True:
+                    srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 7)
+                    duplicateList.append(duplicate)
+                    pieceNumList.append(pieceNum)
+                    if pieceNum < 2 and path[columnCount] != -1: makeHeaderGrafted(windowTotalSolarEnergy, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Window Total Transmitted Solar Energy", "kWh", True, typeName)
+                else:
+                    path.append([glzTotalGain])
+                    duplicateList.append(False)
+                    pieceNumList.append(1)
+                    makeHeader(windowTotalSolarEnergy, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Window Total Transmitted Solar Energy", "kWh")
+                    glzTotalGain += 1
+                key.append(8)
+                dataTypeList[5] = True
+            
+            elif 'Surface Window System Solar Transmittance' in column:
+                if gotSrfData == True:
+                    srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 8)
+                    duplicateList.append(duplicate)
+                    pieceNumList.append(pieceNum)
+                    if pieceNum < 2 and path[columnCount] != -1: 
+                        makeHeaderGrafted(windowTransmissivity, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Surface Window System Solar Transmittance", "Fraction", True, typeName)
+                else:
+                    path.append([glzTransmiss])
+                    duplicateList.append(False)
+                    pieceNumList.append(1)
+                    makeHeader(windowTransmissivity, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Surface Window System Solar Transmittance", "Fraction")
+                    glzTransmiss += 1
+                key.append(10)
+                dataTypeList[8] = True
+            
+            else:
+                key.append(-1)
+                path.append(-1)
+                duplicateList.append(-1)
+                pieceNumList.append(-1)
+        
+        #READ ONLY THE COLUMNS OF THE SURFACES.  WINDOW HEAT LOSS IS READ TOGETHER WITH THE HEAT GAIN BEFORE IT.
+        columnIndices = [columnCount for columnCount in range(len(key)) if path[columnCount] != -1]
+        requested = set(columnIndices)
+        for columnCount in columnIndices:
+            if key[columnCount] == 4: requested.add(columnCount+1)
+        columns, failures = resultReader.readColumns(sorted(requested))
+        
+        def nextCellValue(columnCount, rowCount):
+            value = columns[columnCount+1][rowCount]
+            if value != value: raise ValueError('Failed to read row ' + str(rowCount+1) + ' of column ' + str(columnCount+1))
+            return value
+        
+        #GO THROUGH THE VALUES ROW BY ROW SO THAT THE PIECES OF SPLIT SURFACES ARE ADDED TO THE SAME ROW.
+        rowTotal = max([len(values) for values in columns.values()] + [0])
+        for rowCount in xrange(rowTotal):
+            lineCount = rowCount + 1
+            for columnCount in columnIndices:
+                column = columns[columnCount][rowCount]
+                if column != column and key[columnCount] != 5:
+                    #Cells that are missing from a short row are skipped.  The first cell that can't be read stops the parse.
+                    if failures[columnCount] == rowCount: raise ValueError('Failed to read row ' + str(rowCount+1) + ' of column ' + str(columnCount))
+                    continue
+                if gotSrfData == True and key[columnCount] != 9:
+                    duplicate = duplicateList[columnCount]
+                    pieceCount = pieceNumList[columnCount]
+                    p = GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
+                    if normBySrf == True:
+                        try: srfArea = zoneSrfAreaList[int(path[columnCount][0])][int(path[columnCount][1])]
+                        except:
+                            srfArea = 1
+                            normAreaWorked = False
+                    else: srfArea = 1
+                elif gotSrfData == True and key[columnCount] == 9:
+                    p = GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
+                    srfArea = 1
+                else:
+                    p = GH_Path(int(path[columnCount][0]))
+                    srfArea = 1
+                
+                if key[columnCount] == 1:
+                    if duplicate == False:
+                        surfaceIndoorTemp.Add(column, p)
+                    else:
+                        if pieceCount == 1:
+                            srfPieceDataList[0][path[columnCount][0]][path[columnCount][1]].append(column)
                         else:
-                            path.append([glzDiffGain])
-                            duplicateList.append(False)
-                            pieceNumList.append(1)
-                            makeHeader(windowDiffEnergy, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Window Transmitted Diffuse Energy", "kWh")
-                            glzDiffGain += 1
-                        key.append(7)
-                        dataTypeList[7] = True
-                    
-                    elif 'Surface Window Transmitted Solar Radiation Energy' in column:
-                        if gotSrfData == True:
-                            srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 7)
-                            duplicateList.append(duplicate)
-                            pieceNumList.append(pieceNum)
-                            if pieceNum < 2 and path[columnCount] != -1: makeHeaderGrafted(windowTotalSolarEnergy, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Window Total Transmitted Solar Energy", "kWh", True, typeName)
+                            srfPieceDataList[0][path[columnCount][0]][path[columnCount][1]][lineCount-1] = \
+                                (srfPieceDataList[0][path[columnCount][0]][path[columnCount][1]][lineCount-1] + column)/2
+                elif key[columnCount] == 2:
+                    if duplicate == False:
+                        surfaceOutdoorTemp.Add(column, p)
+                    else:
+                        if pieceCount == 1:
+                            srfPieceDataList[1][path[columnCount][0]][path[columnCount][1]].append(column)
                         else:
-                            path.append([glzTotalGain])
-                            duplicateList.append(False)
-                            pieceNumList.append(1)
-                            makeHeader(windowTotalSolarEnergy, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Window Total Transmitted Solar Energy", "kWh")
-                            glzTotalGain += 1
-                        key.append(8)
-                        dataTypeList[5] = True
-                    
-                    elif 'Surface Window System Solar Transmittance' in column:
-                        if gotSrfData == True:
-                            srfName, typeName, pieceNum, duplicate = checkSrfName(srfName, 8)
-                            duplicateList.append(duplicate)
-                            pieceNumList.append(pieceNum)
-                            if pieceNum < 2 and path[columnCount] != -1: 
-                                makeHeaderGrafted(windowTransmissivity, int(path[columnCount][0]), int(path[columnCount][1]), srfName, column.split('(')[-1].split(')')[0], "Surface Window System Solar Transmittance", "Fraction", True, typeName)
+                            srfPieceDataList[1][path[columnCount][0]][path[columnCount][1]][lineCount-1] = \
+                                (srfPieceDataList[1][path[columnCount][0]][path[columnCount][1]][lineCount-1] + column)/2
+                elif key[columnCount] == 3:
+                    if duplicate == False: opaqueEnergyFlow.Add((column/3600000)/srfArea, p)
+                    else:
+                        if pieceCount == 1: srfPieceDataList[2][path[columnCount][0]][path[columnCount][1]].append((column/3600000)/srfArea)
+                        else: srfPieceDataList[2][path[columnCount][0]][path[columnCount][1]][lineCount-1] = srfPieceDataList[2][path[columnCount][0]][path[columnCount][1]][lineCount-1] + (column/3600000)/srfArea
+                elif key[columnCount] == 4:
+                    if duplicate == False: glazEnergyFlow.Add((((column)/3600000) + ((nextCellValue(columnCount, rowCount))*(-1)/3600000))/srfArea, p)
+                    else:
+                        if pieceCount == 1: srfPieceDataList[3][path[columnCount][0]][path[columnCount][1]].append((((column)/3600000) + ((nextCellValue(columnCount, rowCount))*(-1)/3600000))/srfArea)
+                        else: srfPieceDataList[3][path[columnCount][0]][path[columnCount][1]][lineCount-1] = srfPieceDataList[3][path[columnCount][0]][path[columnCount][1]][lineCount-1] + (((column)/3600000) + ((nextCellValue(columnCount, rowCount))*(-1)/3600000))/srfArea
+                elif key[columnCount] == 5:
+                    pass
+                elif key[columnCount] == 6:
+                    if duplicate == False: windowBeamEnergy.Add(((column)/3600000)/srfArea, p)
+                    else:
+                        if pieceCount == 1: srfPieceDataList[5][path[columnCount][0]][path[columnCount][1]].append((column/3600000)/srfArea)
+                        else: srfPieceDataList[5][path[columnCount][0]][path[columnCount][1]][lineCount-1] = srfPieceDataList[5][path[columnCount][0]][path[columnCount][1]][lineCount-1] + (column/3600000)/srfArea
+                elif key[columnCount] == 7:
+                    if duplicate == False: windowDiffEnergy.Add(((column)/3600000)/srfArea, p)
+                    else:
+                        if pieceCount == 1: srfPieceDataList[6][path[columnCount][0]][path[columnCount][1]].append((column/3600000)/srfArea)
+                        else: srfPieceDataList[6][path[columnCount][0]][path[columnCount][1]][lineCount-1] = srfPieceDataList[6][path[columnCount][0]][path[columnCount][1]][lineCount-1] + (column/3600000)/srfArea
+                elif key[columnCount] == 8:
+                    if duplicate == False:
+                        windowTotalSolarEnergy.Add(((column)/3600000)/srfArea, p)
+                    else:
+                        if pieceCount == 1:
+                            srfPieceDataList[7][path[columnCount][0]][path[columnCount][1]].append((column/3600000)/srfArea)
                         else:
-                            path.append([glzTransmiss])
-                            duplicateList.append(False)
-                            pieceNumList.append(1)
-                            makeHeader(windowTransmissivity, int(path[columnCount]), srfName, column.split('(')[-1].split(')')[0], "Surface Window System Solar Transmittance", "Fraction")
-                            glzTransmiss += 1
-                        key.append(10)
-                        dataTypeList[8] = True
-                    
+                            srfPieceDataList[7][path[columnCount][0]][path[columnCount][1]][lineCount-1] = \
+                                srfPieceDataList[7][path[columnCount][0]][path[columnCount][1]][lineCount-1] + (column/3600000)/srfArea
+                elif key[columnCount] == 10:
+                    if duplicate == False:
+                        windowTransmissivity.Add(column, p)
                     else:
-                        key.append(-1)
-                        path.append(-1)
-                        duplicateList.append(-1)
-                        pieceNumList.append(-1)
-            else:
-                for columnCount, column in enumerate(line.split(',')):
-                    if path[columnCount] != -1:
-                        if gotSrfData == True and key[columnCount] != 9:
-                            duplicate = duplicateList[columnCount]
-                            pieceCount = pieceNumList[columnCount]
-                            p = GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
-                            if normBySrf == True:
-                                try: srfArea = zoneSrfAreaList[int(path[columnCount][0])][int(path[columnCount][1])]
-                                except:
-                                    srfArea = 1
-                                    normAreaWorked = False
-                            else: srfArea = 1
-                        elif gotSrfData == True and key[columnCount] == 9:
-                            p = GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
-                            srfArea = 1
+                        if pieceCount == 1:
+                            srfPieceDataList[8][path[columnCount][0]][path[columnCount][1]].append(column)
                         else:
-                            p = GH_Path(int(path[columnCount][0]))
-                            srfArea = 1
-                        
-                        if key[columnCount] == 1:
-                            if duplicate == False:
-                                surfaceIndoorTemp.Add(float(column), p)
-                            else:
-                                if pieceCount == 1:
-                                    srfPieceDataList[0][path[columnCount][0]][path[columnCount][1]].append(float(column))
-                                else:
-                                    srfPieceDataList[0][path[columnCount][0]][path[columnCount][1]][lineCount-1] = \
-                                        (srfPieceDataList[0][path[columnCount][0]][path[columnCount][1]][lineCount-1] + float(column))/2
-                        elif key[columnCount] == 2:
-                            if duplicate == False:
-                                surfaceOutdoorTemp.Add(float(column), p)
-                            else:
-                                if pieceCount == 1:
-                                    srfPieceDataList[1][path[columnCount][0]][path[columnCount][1]].append(float(column))
-                                else:
-                                    srfPieceDataList[1][path[columnCount][0]][path[columnCount][1]][lineCount-1] = \
-                                        (srfPieceDataList[1][path[columnCount][0]][path[columnCount][1]][lineCount-1] + float(column))/2
-                        elif key[columnCount] == 3:
-                            if duplicate == False: opaqueEnergyFlow.Add((float(column)/3600000)/srfArea, p)
-                            else:
-                                if pieceCount == 1: srfPieceDataList[2][path[columnCount][0]][path[columnCount][1]].append((float(column)/3600000)/srfArea)
-                                else: srfPieceDataList[2][path[columnCount][0]][path[columnCount][1]][lineCount-1] = srfPieceDataList[2][path[columnCount][0]][path[columnCount][1]][lineCount-1] + (float(column)/3600000)/srfArea
-                        elif key[columnCount] == 4:
-                            if duplicate == False: glazEnergyFlow.Add((((float(column))/3600000) + ((float( line.split(',')[columnCount+1] ))*(-1)/3600000))/srfArea, p)
-                            else:
-                                if pieceCount == 1: srfPieceDataList[3][path[columnCount][0]][path[columnCount][1]].append((((float(column))/3600000) + ((float( line.split(',')[columnCount+1] ))*(-1)/3600000))/srfArea)
-                                else: srfPieceDataList[3][path[columnCount][0]][path[columnCount][1]][lineCount-1] = srfPieceDataList[3][path[columnCount][0]][path[columnCount][1]][lineCount-1] + (((float(column))/3600000) + ((float( line.split(',')[columnCount+1] ))*(-1)/3600000))/srfArea
-                        elif key[columnCount] == 5:
-                            pass
-                        elif key[columnCount] == 6:
-                            if duplicate == False: windowBeamEnergy.Add(((float(column))/3600000)/srfArea, p)
-                            else:
-                                if pieceCount == 1: srfPieceDataList[5][path[columnCount][0]][path[columnCount][1]].append((float(column)/3600000)/srfArea)
-                                else: srfPieceDataList[5][path[columnCount][0]][path[columnCount][1]][lineCount-1] = srfPieceDataList[5][path[columnCount][0]][path[columnCount][1]][lineCount-1] + (float(column)/3600000)/srfArea
-                        elif key[columnCount] == 7:
-                            if duplicate == False: windowDiffEnergy.Add(((float(column))/3600000)/srfArea, p)
-                            else:
-                                if pieceCount == 1: srfPieceDataList[6][path[columnCount][0]][path[columnCount][1]].append((float(column)/3600000)/srfArea)
-                                else: srfPieceDataList[6][path[columnCount][0]][path[columnCount][1]][lineCount-1] = srfPieceDataList[6][path[columnCount][0]][path[columnCount][1]][lineCount-1] + (float(column)/3600000)/srfArea
-                        elif key[columnCount] == 8:
-                            if duplicate == False:
-                                windowTotalSolarEnergy.Add(((float(column))/3600000)/srfArea, p)
-                            else:
-                                if pieceCount == 1:
-                                    srfPieceDataList[7][path[columnCount][0]][path[columnCount][1]].append((float(column)/3600000)/srfArea)
-                                else:
-                                    srfPieceDataList[7][path[columnCount][0]][path[columnCount][1]][lineCount-1] = \
-                                        srfPieceDataList[7][path[columnCount][0]][path[columnCount][1]][lineCount-1] + (float(column)/3600000)/srfArea
-                        elif key[columnCount] == 10:
-                            if duplicate == False:
-                                windowTransmissivity.Add(float(column), p)
-                            else:
-                                if pieceCount == 1:
-                                    srfPieceDataList[8][path[columnCount][0]][path[columnCount][1]].append(float(column))
-                                else:
-                                    srfPieceDataList[8][path[columnCount][0]][path[columnCount][1]][lineCount-1] = (srfPieceDataList[8][path[columnCount][0]][path[columnCount][1]][lineCount-1] + float(column))/2
-                    
+                            srfPieceDataList[8][path[columnCount][0]][path[columnCount][1]][lineCount-1] = (srfPieceDataList[8][path[columnCount][0]][path[columnCount][1]][lineCount-1] + column)/2
+        
         parseSuccess = True
     except Exception as e:
         print e
@@ -566,8 +599,6 @@ if _resultFileAddress and gotZoneData == True and gotSrfData == True:
                   'If you report this bug of reading the output on the GH forums, we should be able to fix this component to accept the output soon.'
         print warn
         ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warn)
-    finally:
-        result.close()
         
     
 #Check to make sure that the normalization by surface worked.
@@ -40,11 +40,11 @@ Provided by Honeybee 0.0.66
 """
 ghenv.Component.Name = "Honeybee_Read Hourly Results from Annual Daylight Study"
 ghenv.Component.NickName = 'readDSHourlyResults'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "04 | Daylight | Daylight"
-#compatibleHBVersion = VER 0.0.56\nFEB_01_2015
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nFEB_01_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "0"
 except: pass
@@ -52,12 +52,33 @@ except: pass
 
 
 import os
+import scriptcontext as sc
 from System import Object
 import Grasshopper.Kernel as gh
 from Grasshopper import DataTree
 from Grasshopper.Kernel.Data import GH_Path
 from pprint import pprint
 
+w = gh.GH_RuntimeMessageLevel.Warning
+
+#Honeybee check.
+hbCheck = True
+if not sc.sticky.has_key('honeybee_release') == True:
+    hbCheck = False
+    print "You should first let Honeybee fly..."
+    ghenv.Component.AddRuntimeMessage(w, "You should first let Honeybee fly...")
+else:
+    try:
+        if not sc.sticky['honeybee_release'].isCompatible(ghenv.Component): hbCheck = False
+    except:
+        hbCheck = False
+        warning = "You need a newer version of Honeybee to use this compoent." + \
+        "Use updateHoneybee component to update userObjects.\n" + \
+        "If you have already updated userObjects drag Honeybee_Honeybee component " + \
+        "into canvas and try again."
+        ghenv.Component.AddRuntimeMessage(w, warning)
+
+
 
 def convertIllFileDaraTreeIntoSortedDictionary(illFilesAddress):
     
@@ -165,6 +186,7 @@ def main(illFilesAddress, testPoints, HOY, annualProfiles):
         ghenv.Component.AddRuntimeMessage(w, tempmsg)
     
     illFileSets = convertIllFileDaraTreeIntoSortedDictionary(illFilesAddress)
+    hb_illFileIndex = sc.sticky["honeybee_IllFileIndex"]
         
     # read the data for hour of the year and multiply it with the shading
     numOfPts = testPoints.DataCount
@@ -191,20 +213,14 @@ def main(illFilesAddress, testPoints, HOY, annualProfiles):
         for stateCount, resultFiles in enumerate(illFileSets[shadingGroupCount]):
             
             for resultFile in resultFiles:
-                result = open(resultFile, 'r')
-                for lineCount, line in enumerate(result):
-                    if lineCount == int(HOY-1):
-                       line = line.replace('\n', '', 10)
-                       lineSeg = line.Split(' ')
-                       for hourLuxValue in lineSeg[4:]:
-                           illuminanceValues[shadingGroupCount][stateCount].append(float(hourLuxValue))
-                           
-                result.close()
+                # read the line of the hour from the indexed copy of the ill file
+                illFileIndex = hb_illFileIndex(resultFile)
+                illuminanceValues[shadingGroupCount][stateCount].extend(illFileIndex.getHour(int(HOY-1)))
     
     return msg, illuminanceValues, shadingProfiles
 
 
-if _HOY!=None and _illFilesAddress.DataCount!=0 and _illFilesAddress.Branch(0)[0]!=None and _testPoints:
+if hbCheck and _HOY!=None and _illFilesAddress.DataCount!=0 and _illFilesAddress.Branch(0)[0]!=None and _testPoints:
     
     _testPoints.SimplifyPaths()
     _illFilesAddress.SimplifyPaths()
@@ -21,19 +21,19 @@
 
 
 """
-This component reads the results of an Adaptive Indoor Comfort Analysis.  Note that this usually takes about a minute
+This component reads the results of an Adaptive Indoor Comfort Analysis.  Binary matrix files (.hbmtx) are read in a few seconds.  Note that CSV result files usually take about a minute
 -
 Provided by Honeybee 0.0.66
     
     Args:
-        _comfResultFileAddress: Any one of the result file addresses that comes out of the 'Honeybee_Microclimate Map Analysis' component or the 'Honeybee_Thermal Comfort Autonomy Analysis' component.
+        _comfResultFileAddress: Any one of the result file addresses that comes out of the 'Honeybee_Microclimate Map Analysis' component or the 'Honeybee_Thermal Comfort Autonomy Analysis' component.  Both binary matrix files and CSV files are recognized automatically.
     Returns:
         comfResultsMtx: A matrix of comfort data that can be plugged into the "Visualize Comfort Results" component.
 """
 
 ghenv.Component.Name = "Honeybee_Read Microclimate Matrix"
 ghenv.Component.NickName = 'readMicroclimateMtx'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -41,11 +41,36 @@ ghenv.Component.AdditionalHelpFromDocStrings = "6"
 
 
 import Grasshopper.Kernel as gh
+import scriptcontext as sc
+
+
+def readMatrixFile(resultFileAddress):
+    #Check if the file is a binary matrix file written by the Microclimate Map Analysis component.
+    try:
+        with open(resultFileAddress, 'rb') as inf: fileTag = inf.read(4)
+    except: return None
+    if fileTag != 'HBCM': return None
+    if not sc.sticky.has_key('honeybee_release'):
+        warn = "You should let Honeybee fly first to read binary matrix files..."
+        print warn
+        ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warn)
+        return []
+    hb_matrixFile = sc.sticky["honeybee_ComfortMatrixFile"]
+    return hb_matrixFile(resultFileAddress).read()
 
 
 comfResultsMtx = []
 
 if _comfResultFileAddress:
+    try: comfResultsMtx = readMatrixFile(_comfResultFileAddress)
+    except:
+        comfResultsMtx = []
+        warn = 'Failed to read the binary matrix file.  The file might have been written by another version of Honeybee.  Try re-running your simulation.'
+        print warn
+        ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warn)
+
+if _comfResultFileAddress and comfResultsMtx == None:
+    comfResultsMtx = []
     try:
         result = open(_comfResultFileAddress, 'r')
         
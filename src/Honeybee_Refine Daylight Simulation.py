@@ -43,11 +43,11 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Refine Daylight Simulation"
 ghenv.Component.NickName = 'refineDaylightAnalysis'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "04 | Daylight | Daylight"
-#compatibleHBVersion = VER 0.0.56\nFEB_01_2015
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nFEB_01_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "0"
 except: pass
@@ -157,6 +157,12 @@ def main(octFile, analysisRecipe, numOfCPUs, thisRunName, runIt):
             hb_writeRADAUX.copyFile(ambFile, newambFile)
             break
     
+    # read the center of the windows if any to split the test points by their estimated cost
+    for fileName in fileNames:
+        if fileName.lower().endswith(".glz"):
+            hb_writeRAD.readGlazingCenters(os.path.join(workingDir, fileName))
+            break
+    
     # export mesh
     hb_writeRADAUX.exportTestMesh(subWorkingDir, radFileName)
     
@@ -172,6 +178,10 @@ def main(octFile, analysisRecipe, numOfCPUs, thisRunName, runIt):
     # except image-based simulation
     testPtsEachCPU, lenOfPts = hb_writeRAD.writeTestPtFile(subWorkingDir, \
                                     radFileName, numOfCPUs, analysisRecipe)
+    
+    # grid-based studies can be split into more point files than CPUs
+    maxPRuns = numOfCPUs
+    if len(testPtsEachCPU)!=0: numOfCPUs = len(testPtsEachCPU)
             
     ######################## WRITE BATCH FILES #######################
     # if analysis type is annual this function will write hea files too
@@ -183,7 +193,7 @@ def main(octFile, analysisRecipe, numOfCPUs, thisRunName, runIt):
     
     if runIt:
         hb_writeRAD.runBatchFiles(initBatchFileName, batchFilesName, \
-                                  fileNames, pcompBatchFile, waitingTime)
+                                  fileNames, pcompBatchFile, waitingTime, maxPRuns = maxPRuns, GHComponent = ghenv.Component)
         
         results = hb_writeRAD.collectResults(subWorkingDir, radFileName, \
                                 numOfCPUs, analysisRecipe, expectedResultFiles)
@@ -54,11 +54,11 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Run Daylight Simulation"
 ghenv.Component.NickName = 'runDaylightAnalysis'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "04 | Daylight | Daylight"
-#compatibleHBVersion = VER 0.0.56\nDEC_21_2015
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nFEB_01_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "1"
 except: pass
@@ -196,8 +196,10 @@ def main(north, originalHBObjects, analysisRecipe, runRad, numOfCPUs, workingDir
     # except image-based simulation
     testPtsEachCPU, lenOfPts = hb_writeRAD.writeTestPtFile(subWorkingDir, radFileName, numOfCPUs, analysisRecipe)
     
+    # grid-based studies can be split into more point files than CPUs
+    maxPRuns = numOfCPUs
     if len(testPtsEachCPU)!=0: # make sure it is a grid based analysis
-        numOfCPUs = len(testPtsEachCPU) #in case number of CPUs are more than number of test points
+        numOfCPUs = len(testPtsEachCPU) #number of point files
     
     ######################## WRITE BATCH FILES #######################
     # if analysis type is annual this function will write hea files too
@@ -209,7 +211,7 @@ def main(north, originalHBObjects, analysisRecipe, runRad, numOfCPUs, workingDir
     
     if runRad:
         hb_writeRAD.runBatchFiles(initBatchFileName, batchFilesName, \
-                                  fileNames, pcompBatchFile, waitingTime, runRad > 1)
+                                  fileNames, pcompBatchFile, waitingTime, runRad > 1, maxPRuns, ghenv.Component)
         
         results = hb_writeRAD.collectResults(subWorkingDir, radFileName, \
                                 numOfCPUs, analysisRecipe, expectedResultFiles)
@@ -40,7 +40,7 @@ Provided by Honeybee 0.0.66
 """
 ghenv.Component.Name = "Honeybee_Solve Adjacencies"
 ghenv.Component.NickName = 'solveAdjc'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "00 | Honeybee"
@@ -54,6 +54,7 @@ import Rhino as rc
 import scriptcontext as sc
 import Grasshopper.Kernel as gh
 import uuid
+import math
 
 def shootIt(rayList, geometry, tol = 0.01, bounce =1):
    # shoot a list of rays from surface to geometry
@@ -186,6 +187,88 @@ def notTheSameZone(targetZone, testZone):
         return targetZone.name != testZone.name
     
 
+def isParallel(surface, srf):
+    # same normal check that is used to accept two surfaces as adjacent
+    normalAngle = abs(rc.Geometry.Vector3d.VectorAngle(surface.normalVector, srf.normalVector))
+    revNormalAngle = abs(rc.Geometry.Vector3d.VectorAngle(surface.normalVector, -srf.normalVector))
+    return normalAngle==0  or revNormalAngle <= sc.doc.ModelAngleToleranceRadians
+
+
+class SurfaceHash(object):
+    """
+    A spatial hash of the bounding boxes of all zone surfaces.
+    
+    Surfaces that can't be closer than the tolerance to a surface are never
+    returned as candidates so only coplanar, facing and overlapping surfaces are
+    checked with the exact ray and closest point tests.
+    """
+    
+    def __init__(self, HBZoneObjects, tol):
+        # test points are moved back for half of the tolerance and then have to
+        # be within the tolerance of the adjacent surface.
+        self.margin = 1.5 * tol + sc.doc.ModelAbsoluteTolerance
+        self.surfaces = []
+        self.bounds = []
+        self.srfIndex = {}
+        for zoneCount, zone in enumerate(HBZoneObjects):
+            for srf in zone.surfaces:
+                bb = srf.geometry.GetBoundingBox(True)
+                self.srfIndex[id(srf)] = len(self.surfaces)
+                self.surfaces.append((zoneCount, zone, srf))
+                self.bounds.append((bb.Min.X, bb.Min.Y, bb.Min.Z, bb.Max.X, bb.Max.Y, bb.Max.Z))
+        
+        # use the median size of the surfaces for the cells so most of them only
+        # end up in a handful of cells.
+        sizes = sorted(max(b[3]-b[0], b[4]-b[1], b[5]-b[2]) for b in self.bounds)
+        if len(sizes) != 0: self.cellSize = max(sizes[len(sizes)//2], 2 * self.margin)
+        else: self.cellSize = 1
+        
+        self.cells = {}
+        for srfCount, b in enumerate(self.bounds):
+            for key in self.cellKeys(b, self.margin):
+                try: self.cells[key].append(srfCount)
+                except KeyError: self.cells[key] = [srfCount]
+    
+    def cellKeys(self, b, margin):
+        c = self.cellSize
+        xs = range(int(math.floor((b[0] - margin)/c)), int(math.floor((b[3] + margin)/c)) + 1)
+        ys = range(int(math.floor((b[1] - margin)/c)), int(math.floor((b[4] + margin)/c)) + 1)
+        zs = range(int(math.floor((b[2] - margin)/c)), int(math.floor((b[5] + margin)/c)) + 1)
+        return [(x, y, z) for x in xs for y in ys for z in zs]
+    
+    def overlaps(self, b1, b2):
+        m = self.margin
+        return b1[0] - m <= b2[3] and b2[0] - m <= b1[3] and \
+               b1[1] - m <= b2[4] and b2[1] - m <= b1[4] and \
+               b1[2] - m <= b2[5] and b2[2] - m <= b1[5]
+    
+    def isOnPlane(self, surface, srf):
+        # planar surfaces have to be on the same plane to touch each other
+        if not (surface.isPlanar and srf.isPlanar): return True
+        offset = surface.cenPt - srf.cenPt
+        return abs(offset * srf.normalVector) <= self.margin * srf.normalVector.Length
+    
+    def candidates(self, testZone, srf):
+        """Return a list of (targetZone, [surfaces]) in the order of the zones."""
+        b = self.bounds[self.srfIndex[id(srf)]]
+        
+        found = set()
+        for key in self.cellKeys(b, 0):
+            found.update(self.cells.get(key, ()))
+        
+        byZone = {}
+        for i in sorted(found):
+            zoneCount, targetZone, surface = self.surfaces[i]
+            if not self.overlaps(b, self.bounds[i]): continue
+            if not notTheSameZone(targetZone, testZone): continue
+            if not isParallel(surface, srf): continue
+            if not self.isOnPlane(surface, srf): continue
+            try: byZone[zoneCount][1].append(surface)
+            except KeyError: byZone[zoneCount] = (targetZone, [surface])
+        
+        return [byZone[zoneCount] for zoneCount in sorted(byZone.keys())]
+
+
 def main(HBZones, altConstruction, altWinConstr, altBC, tol, remCurrent):
     
     # import the classes
@@ -235,6 +318,10 @@ def main(HBZones, altConstruction, altWinConstr, altBC, tol, remCurrent):
                     srf.setBC('OUTDOORS')
                     srf.setBCObjectToOutdoors()
     
+    # index the surfaces so each surface is only tested against the surfaces that
+    # are parallel to it and within the tolerance of it.
+    surfaceHash = SurfaceHash(HBZoneObjects, tol)
+    
     # solve it zone by zone
     for testZone in HBZoneObjects:
         # mesh each surface and test if it will be adjacent to any surface
@@ -242,6 +329,9 @@ def main(HBZones, altConstruction, altWinConstr, altBC, tol, remCurrent):
         for srf in testZone.surfaces:
             #print srf.type, srf.BC 
             if srf.BC.upper() == 'OUTDOORS' or srf.BC.upper() == 'GROUND' or srf.BC.upper() == 'ADIABATIC':
+                candidates = surfaceHash.candidates(testZone, srf)
+                if len(candidates) == 0: continue
+                
                 #Create a mesh of surface to use center points as test points
                 meshPar = rc.Geometry.MeshingParameters.Default
                 BrepMesh = rc.Geometry.Mesh.CreateFromBrep(srf.geometry, meshPar)[0]
@@ -260,33 +350,24 @@ def main(HBZones, altConstruction, altWinConstr, altBC, tol, remCurrent):
                     
                     raysDict[meshSrfCen] = rc.Geometry.Ray3d(meshSrfCen, srfNormal)
                 
-                for targetZone in HBZoneObjects:
-                    if notTheSameZone(targetZone, testZone):
-                        # check ray intersection to see if this zone is next to the surface
-                        if shootIt(raysDict.values(), [targetZone.geometry], tol + sc.doc.ModelAbsoluteTolerance):
-                            for surface in targetZone.surfaces:
-                                # check if z value of center points matches
-                                #print abs(surface.cenPt.Z - srf.cenPt.Z)
-                                #if abs(surface.cenPt.Z - srf.cenPt.Z) < tol:
-                                # check distance with the nearest point on each surface
-                                for pt in raysDict.keys():
-                                    if surface.geometry.ClosestPoint(pt).DistanceTo(pt) <= tol:
-                                        # extra check for normal direction
-                                        normalAngle = abs(rc.Geometry.Vector3d.VectorAngle(surface.normalVector, srf.normalVector))
-                                        revNormalAngle = abs(rc.Geometry.Vector3d.VectorAngle(surface.normalVector, -srf.normalVector))
-                                        #print normalAngle
-                                        #print revNormalAngle
-                                        if normalAngle==0  or revNormalAngle <= sc.doc.ModelAngleToleranceRadians:
-                                            print 'Surface ' + srf.name + ' which is a ' + srf.srfType[srf.type] + \
-                                                  '\t-> is adjacent to <-\t' + surface.name + ' which is a ' + \
-                                                  surface.srfType[surface.type] + '.'
-                                            
-                                            updateAdj(srf, surface, altConstruction, altBC, altWinConstr, tol)                                        
-                                            if surface.type == 4:
-                                                flowRate = updateZoneMixing(surface, testZone, targetZone)
-                                                print "Air has been mixed between " + testZone.name + " and " + targetZone.name + " with a flow rate of " + str(flowRate) + " m3/s."
-                                            
-                                            break
+                for targetZone, targetSurfaces in candidates:
+                    # check ray intersection to see if this zone is next to the surface
+                    if shootIt(raysDict.values(), [targetZone.geometry], tol + sc.doc.ModelAbsoluteTolerance):
+                        for surface in targetSurfaces:
+                            # check distance with the nearest point on each surface
+                            # candidates are already parallel to the surface
+                            for pt in raysDict.keys():
+                                if surface.geometry.ClosestPoint(pt).DistanceTo(pt) <= tol:
+                                    print 'Surface ' + srf.name + ' which is a ' + srf.srfType[srf.type] + \
+                                          '\t-> is adjacent to <-\t' + surface.name + ' which is a ' + \
+                                          surface.srfType[surface.type] + '.'
+                                    
+                                    updateAdj(srf, surface, altConstruction, altBC, altWinConstr, tol)                                        
+                                    if surface.type == 4:
+                                        flowRate = updateZoneMixing(surface, testZone, targetZone)
+                                        print "Air has been mixed between " + testZone.name + " and " + targetZone.name + " with a flow rate of " + str(flowRate) + " m3/s."
+                                    
+                                    break
     
     # add zones to memory
     ModifiedHBZones  = hb_hive.addToHoneybeeHive(HBZoneObjects, ghenv.Component)
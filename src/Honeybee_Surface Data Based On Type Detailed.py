@@ -44,11 +44,11 @@ Provided by Honeybee 0.0.66
 """
 ghenv.Component.Name = "Honeybee_Surface Data Based On Type Detailed"
 ghenv.Component.NickName = 'srfDataByTypeDetailed'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
-#compatibleHBVersion = VER 0.0.56\nFEB_01_2015
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nFEB_01_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "0"
 except: pass
@@ -115,7 +115,7 @@ def getSrfNames(HBZones):
         # call the objects from the lib
         hb_hive = sc.sticky["honeybee_Hive"]()
         
-        zone = hb_hive.callFromHoneybeeHive([zone])[0]
+        zone = hb_hive.callFromHoneybeeHive([zone], readOnly = True)[0]
         
         for srf in zone.surfaces:
             # WALL
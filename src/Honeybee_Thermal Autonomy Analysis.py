@@ -64,11 +64,11 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Thermal Autonomy Analysis"
 ghenv.Component.NickName = 'ThermalAutonomy'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
-#compatibleHBVersion = VER 0.0.56\nFEB_01_2015
+#compatibleHBVersion = VER 0.0.66\nOCT_18_2026
 #compatibleLBVersion = VER 0.0.59\nFEB_01_2015
 try: ghenv.Component.AdditionalHelpFromDocStrings = "6"
 except: pass
@@ -114,7 +114,7 @@ def recallHBZoneProperties(HOYs, occupancyThere):
     HBScheduleList = sc.sticky["honeybee_ScheduleLib"].keys()
     
     for zoneCount, HZone in enumerate(_HBZones):
-        zone = hb_hive.callFromHoneybeeHive([HZone])[0]
+        zone = hb_hive.callFromHoneybeeHive([HZone], readOnly = True)[0]
         zoneNames.append(zone.name)
         values = []
         if occupancyThere == False:
@@ -128,7 +128,7 @@ def recallHBZoneProperties(HOYs, occupancyThere):
                     checkZones = False
                 else:
                     readSchedules = sc.sticky["honeybee_ReadSchedules"](zoneOccSched, 0)
-                    values  = readSchedules.getScheduleValues()
+                    values  = readSchedules.compileSchedule()
             elif zoneOccSched.lower().endswith(".csv"):
                 # check if csv file exists.
                 if not os.path.isfile(zoneOccSched):
@@ -413,6 +413,52 @@ def checkTheInputs():
     return checkData, fileName, workingDir, _viewFactorMesh, analysisPeriod, totEnergyHeaders, totEnergyNumbersFinal, zoneNames, occupancySchList, comfortType, occupancyThreshold
 
 
+def faceCentroid(mesh, face):
+    #Area-weighted centroid of the face's triangles, which is the same point that AreaMassProperties returns for a planar face.
+    ptA = rc.Geometry.Point3d(mesh.Vertices[face.A])
+    ptB = rc.Geometry.Point3d(mesh.Vertices[face.B])
+    ptC = rc.Geometry.Point3d(mesh.Vertices[face.C])
+    if not face.IsQuad: return rc.Geometry.Point3d((ptA.X+ptB.X+ptC.X)/3, (ptA.Y+ptB.Y+ptC.Y)/3, (ptA.Z+ptB.Z+ptC.Z)/3)
+    ptD = rc.Geometry.Point3d(mesh.Vertices[face.D])
+    area1 = rc.Geometry.Vector3d.CrossProduct(ptB - ptA, ptC - ptA).Length
+    area2 = rc.Geometry.Vector3d.CrossProduct(ptC - ptA, ptD - ptA).Length
+    if area1 + area2 == 0: return rc.Geometry.Point3d((ptA.X+ptB.X+ptC.X+ptD.X)/4, (ptA.Y+ptB.Y+ptC.Y+ptD.Y)/4, (ptA.Z+ptB.Z+ptC.Z+ptD.Z)/4)
+    w1 = area1 / (3 * (area1 + area2))
+    w2 = area2 / (3 * (area1 + area2))
+    return rc.Geometry.Point3d((ptA.X+ptB.X+ptC.X)*w1 + (ptA.X+ptC.X+ptD.X)*w2, (ptA.Y+ptB.Y+ptC.Y)*w1 + (ptA.Y+ptC.Y+ptD.Y)*w2, (ptA.Z+ptB.Z+ptC.Z)*w1 + (ptA.Z+ptC.Z+ptD.Z)*w2)
+
+def matchPointsToZones(points, zones):
+    #Returns the index of the first zone containing each point, or len(zones) for outdoor points.
+    outdoorIndex = len(zones)
+    if len(zones) == 0: return [outdoorIndex for pt in points]
+    
+    #Index the zone bounding boxes on a plan grid so that each point is only tested against the zones it can fall inside.
+    boxes = []
+    for zone in zones:
+        bb = zone.GetBoundingBox(True)
+        bb.Inflate(tol)
+        boxes.append(bb)
+    cellSize = sum([(bb.Max.X - bb.Min.X) + (bb.Max.Y - bb.Min.Y) for bb in boxes]) / (2 * len(boxes))
+    cellSize = max(cellSize, 100 * tol)
+    planGrid = {}
+    for zoneCount, bb in enumerate(boxes):
+        for i in range(int(math.floor(bb.Min.X / cellSize)), int(math.floor(bb.Max.X / cellSize)) + 1):
+            for j in range(int(math.floor(bb.Min.Y / cellSize)), int(math.floor(bb.Max.Y / cellSize)) + 1):
+                try: planGrid[(i, j)].append(zoneCount)
+                except: planGrid[(i, j)] = [zoneCount]
+    
+    pointZoneList = []
+    for pt in points:
+        pointZone = outdoorIndex
+        for zoneCount in planGrid.get((int(math.floor(pt.X / cellSize)), int(math.floor(pt.Y / cellSize))), []):
+            if boxes[zoneCount].Contains(pt) and zones[zoneCount].IsPointInside(pt, tol, False) == True:
+                pointZone = zoneCount
+                break
+        pointZoneList.append(pointZone)
+    
+    return pointZoneList
+
+
 def main(viewFactorMesh, analysisPeriod, totEnergyHeaders, totEnergyNumbers, zoneNames, occupancySchList, comfortType, occupancyThreshold):
     #Set up matrices to be filled.
     occTCP_Mtx = [comfortType + ' Occupied Thermal Comfort Percent;' + str(analysisPeriod[0]) + ";" + str(analysisPeriod[1])]
@@ -443,23 +489,11 @@ def main(viewFactorMesh, analysisPeriod, totEnergyHeaders, totEnergyNumbers, zon
             totEnergyNumbersMatched.append(additionalENumList)
     
     #Match each of the test points with a zone using the viewFacorMesh.
-    pointZoneList = []
-    outDoorPtsCount = 0
+    testPts = []
     for mesh in viewFactorMesh:
-        for face in mesh.Faces:
-            zoneFound = False
-            if face.IsQuad:
-                faceBrep = rc.Geometry.Brep.CreateFromCornerPoints(rc.Geometry.Point3d(mesh.Vertices[face.A]), rc.Geometry.Point3d(mesh.Vertices[face.B]), rc.Geometry.Point3d(mesh.Vertices[face.C]), rc.Geometry.Point3d(mesh.Vertices[face.D]), sc.doc.ModelAbsoluteTolerance)
-            if face.IsTriangle:
-                faceBrep = rc.Geometry.Brep.CreateFromCornerPoints(rc.Geometry.Point3d(mesh.Vertices[face.A]), rc.Geometry.Point3d(mesh.Vertices[face.B]), rc.Geometry.Point3d(mesh.Vertices[face.C]), sc.doc.ModelAbsoluteTolerance)
-            centPt = rc.Geometry.AreaMassProperties.Compute(faceBrep).Centroid
-            for zoneCount, zone in enumerate(_HBZones):
-                if zone.IsPointInside(centPt, tol, False) == True:
-                    zoneFound = True
-                    pointZoneList.append(zoneCount)
-            if zoneFound == False:
-                outDoorPtsCount += 1
-                pointZoneList.append(len(_HBZones))
+        for face in mesh.Faces: testPts.append(faceCentroid(mesh, face))
+    pointZoneList = matchPointsToZones(testPts, _HBZones)
+    outDoorPtsCount = pointZoneList.count(len(_HBZones))
     
     #If there are outdoor points, append values for full-time occupancy and use of passive strategies.
     if outDoorPtsCount > 0:
@@ -471,58 +505,56 @@ def main(viewFactorMesh, analysisPeriod, totEnergyHeaders, totEnergyNumbers, zon
         occupancySchList.append(additionalOccSchList)
         totEnergyNumbersMatched.append(additionalENumList)
     
+    #Evaluate the occupancy and conditioning of each zone once for every hour.  The points only look these flags up by their zone.
+    zoneOccupied = [[val > occupancyThreshold for val in occSch] for occSch in occupancySchList]
+    zoneConditioned = [[val > 0 for val in eNums] for eNums in totEnergyNumbersMatched]
+    
     #Make a list that tracks the total occupied hours for each of the points.
-    occHrsNum = []
-    for point in pointZoneList: occHrsNum.append(0)
+    hourCount = len(occupancySchList[0])
+    validHours = max(0, min(hourCount, len(_comfResultsMtx) - 1))
+    zoneOccHrs = [occ[:validHours].count(True) for occ in zoneOccupied]
+    occHrsNum = [zoneOccHrs[pointZone] for pointZone in pointZoneList]
     
-    #Finally, compute the matrices for each hour and point.
+    #Hours where no zone is occupied all share the same row of zeros.
+    unoccupiedRow = [0.0] * len(pointZoneList)
+    
+    #Finally, compute the matrices for each hour as operations over whole rows of points.
     def calcComf(count):
-        occTCP = []
-        TA = []
-        OverHeated = []
-        UnderHeated = []
-        for pointCount, pointZone in enumerate(pointZoneList):
-            try:
-                _comfResultsMtx[count + 1][pointCount]
-                #Check to see if the point's zone is occupied.  Otheriswe, it does not count for anything.
-                if occupancySchList[pointZone][count] > occupancyThreshold:
-                    occHrsNum[pointCount] += 1
-                    #Check to see if the point is comfortable.
-                    if _comfResultsMtx[count + 1][pointCount] > 0:
-                        occTCP.append(1)
-                        OverHeated.append(0)
-                        UnderHeated.append(0)
-                        #Check to see if the point's zone is being conditioned.
-                        if totEnergyNumbersMatched[pointZone][count] > 0: TA.append(0)
-                        else: TA.append(1)
-                    else:
-                        occTCP.append(0)
-                        TA.append(0)
-                        if _degOrPMVMtx[count + 1][pointCount] > 0:
-                            OverHeated.append(1)
-                            UnderHeated.append(0)
-                        else:
-                            OverHeated.append(0)
-                            UnderHeated.append(1)
-                else:
-                    occTCP.append(0.0)
-                    TA.append(0.0)
-                    OverHeated.append(0.0)
-                    UnderHeated.append(0.0)
-            except:
-                pass
+        try:
+            comfRow = _comfResultsMtx[count + 1]
+            degRow = _degOrPMVMtx[count + 1]
+        except:
+            occTCP_Mtx[count+1] = []
+            TA_Mtx[count+1] = []
+            OverHeatedMtx[count+1] = []
+            UnderHeatedMtx[count+1] = []
+            return
+        
+        #Check to see if the zones are occupied.  Otheriswe, the points do not count for anything.
+        zoneOcc = [occ[count] for occ in zoneOccupied]
+        if True not in zoneOcc:
+            occTCP_Mtx[count+1] = unoccupiedRow
+            TA_Mtx[count+1] = unoccupiedRow
+            OverHeatedMtx[count+1] = unoccupiedRow
+            UnderHeatedMtx[count+1] = unoccupiedRow
+            return
+        zoneCond = [cond[count] for cond in zoneConditioned]
+        occRow = [zoneOcc[pointZone] for pointZone in pointZoneList]
+        condRow = [zoneCond[pointZone] for pointZone in pointZoneList]
+        comfRow = [val > 0 for val in comfRow]
+        warmRow = [val > 0 for val in degRow]
         
-        occTCP_Mtx[count+1] = occTCP
-        TA_Mtx[count+1] = TA
-        OverHeatedMtx[count+1] = OverHeated
-        UnderHeatedMtx[count+1] = UnderHeated
-    
-    #Run through every hour of the analysis to fill up the matrices.
-    #if parallel_ == True and len(occupancySchList[0]) != 1:
-    #    tasks.Parallel.ForEach(range(len(occupancySchList[0])), calcComf)
-    #else:
-    for hour in range(len(occupancySchList[0])):
-        calcComf(hour)
+        occTCP_Mtx[count+1] = [(1 if comf else 0) if occ else 0.0 for occ, comf in zip(occRow, comfRow)]
+        TA_Mtx[count+1] = [((0 if cond else 1) if comf else 0) if occ else 0.0 for occ, comf, cond in zip(occRow, comfRow, condRow)]
+        OverHeatedMtx[count+1] = [(0 if comf else (1 if warm else 0)) if occ else 0.0 for occ, comf, warm in zip(occRow, comfRow, warmRow)]
+        UnderHeatedMtx[count+1] = [(0 if comf else (0 if warm else 1)) if occ else 0.0 for occ, comf, warm in zip(occRow, comfRow, warmRow)]
+    
+    #Run through every hour of the analysis to fill up the matrices.  Each hour only writes to its own row so the hours can run in parallel.
+    if parallel_ == True and hourCount > 1:
+        tasks.Parallel.ForEach(range(hourCount), calcComf)
+    else:
+        for hour in range(hourCount):
+            calcComf(hour)
     
     # Add the total occupied hours to the matrix (to be used to help calculate comfort autonomy).
     occTCP_Mtx.append(occHrsNum)
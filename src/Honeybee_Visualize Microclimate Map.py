@@ -49,7 +49,7 @@ Provided by Honeybee 0.0.66
 
 ghenv.Component.Name = "Honeybee_Visualize Microclimate Map"
 ghenv.Component.NickName = 'VisualizeMicroclimate'
-ghenv.Component.Message = 'VER 0.0.66\nJUL_07_2020'
+ghenv.Component.Message = 'VER 0.0.66\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "HB-Legacy"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -68,6 +68,7 @@ from Grasshopper.Kernel.Data import GH_Path
 import Rhino as rc
 import scriptcontext as sc
 import math
+import array
 
 
 w = gh.GH_RuntimeMessageLevel.Warning
@@ -178,6 +179,101 @@ def restoreInputOutput():
         ghenv.Component.Params.Input[input].Description = inputsDict[input][1]
 
 
+#The cumulative sums take 12 bytes for each value of the matrix so they are only kept for matrices up to this size.
+comfPrefixIndexMaxValues = 5000000
+
+def removeComfPrefixIndex():
+    indexKey = 'honeybee_ComfPrefixIndex_' + ghenv.Component.InstanceGuid.ToString()
+    if sc.sticky.has_key(indexKey): del sc.sticky[indexKey]
+
+def getComfPrefixIndex(comfResultsMtx, dataRowCount, occDataType):
+    #Reuse the index if the same matrix is still connected (e.g. when only the analysis period has changed).
+    indexKey = 'honeybee_ComfPrefixIndex_' + ghenv.Component.InstanceGuid.ToString()
+    if sc.sticky.has_key(indexKey):
+        prefixIndex = sc.sticky[indexKey]
+        if prefixIndex['header'] == comfResultsMtx[0] and prefixIndex['rowCount'] == dataRowCount and prefixIndex['occDataType'] == occDataType \
+            and prefixIndex['firstRow'] is comfResultsMtx[1] and prefixIndex['lastRow'] is comfResultsMtx[dataRowCount]:
+            return prefixIndex
+        #Free the index of the matrix that was connected before building a new one.
+        del sc.sticky[indexKey]
+    
+    pointCount = len(comfResultsMtx[1])
+    if pointCount * dataRowCount > comfPrefixIndexMaxValues: return None
+    
+    #Cumulative sums of each point's values (and occupied hours) up to each row of the matrix.
+    valSums = [array.array('d', [0]) * pointCount]
+    occSums = [array.array('i', [0]) * pointCount]
+    for row in comfResultsMtx[1:dataRowCount + 1]:
+        valSums.append(array.array('d', [total + val for total, val in zip(valSums[-1], row)]))
+        if occDataType == True:
+            occSums.append(array.array('i', [total + isinstance(val, int) for total, val in zip(occSums[-1], row)]))
+    
+    prefixIndex = {'header': comfResultsMtx[0], 'rowCount': dataRowCount, 'occDataType': occDataType,
+                   'firstRow': comfResultsMtx[1], 'lastRow': comfResultsMtx[dataRowCount],
+                   'valSums': valSums, 'occSums': occSums}
+    sc.sticky[indexKey] = prefixIndex
+    return prefixIndex
+
+def getRowSegments(rows, dataRowCount):
+    #Split the rows of the analysis period into contiguous (start, end) segments.
+    segments = []
+    for row in sorted(set(rows)):
+        if row < 1 or row > dataRowCount: continue
+        if len(segments) > 0 and segments[-1][1] == row - 1: segments[-1][1] = row
+        else: segments.append([row, row])
+    return segments
+
+def sumSegments(cumSums, segments):
+    totals = [0] * len(cumSums[0])
+    for start, end in segments:
+        totals = [total + endSum - startSum for total, endSum, startSum in zip(totals, cumSums[end], cumSums[start - 1])]
+    return totals
+
+def sumSegmentRows(comfResultsMtx, segments, countOccupied):
+    #Sum the rows of the segments one by one without keeping any cumulative sums.
+    valTotals = [0.0] * len(comfResultsMtx[1])
+    occTotals = [0] * len(comfResultsMtx[1])
+    for start, end in segments:
+        for row in comfResultsMtx[start:end + 1]:
+            valTotals = [total + val for total, val in zip(valTotals, row)]
+            if countOccupied == True:
+                occTotals = [total + isinstance(val, int) for total, val in zip(occTotals, row)]
+    return valTotals, occTotals
+
+def computePeriodValues(comfResultsMtx, rows, occDataType, percentOrTotal, totalAble):
+    #The last row of the special matrices is the number of occupied hours and is not part of the data.
+    dataRowCount = len(comfResultsMtx) - 1
+    if occDataType == True: dataRowCount -= 1
+    segments = getRowSegments(rows, dataRowCount)
+    if len(segments) == 0: return []
+    
+    if segments == [[1, dataRowCount]]:
+        #The whole matrix is summed once so the cumulative sums are not needed.
+        removeComfPrefixIndex()
+        prefixIndex = None
+    else:
+        prefixIndex = getComfPrefixIndex(comfResultsMtx, dataRowCount, occDataType)
+    
+    if prefixIndex == None:
+        valTotals, occTotals = sumSegmentRows(comfResultsMtx, segments, occDataType == True and segments != [[1, dataRowCount]])
+    else:
+        valTotals = sumSegments(prefixIndex['valSums'], segments)
+        if occDataType == True: occTotals = sumSegments(prefixIndex['occSums'], segments)
+    
+    if percentOrTotal == False and totalAble == True:
+        return valTotals
+    elif occDataType == False:
+        #Compute the total percentage of comfortable hours.  The sums are floats so the result is never truncated.
+        hourCount = sum([end - start + 1 for start, end in segments])
+        return [total / hourCount for total in valTotals]
+    elif segments == [[1, dataRowCount]]:
+        #The occupied hours of the whole matrix are its last row.
+        return [total / occHours for total, occHours in zip(valTotals, comfResultsMtx[-1])]
+    else:
+        #If the dataType is meant to be divided by occupied hours, use the occupied hours of the analysis period.
+        return [total / occHours for total, occHours in zip(valTotals, occTotals)]
+
+
 def computeComfValues(comfResultsMtx, analysisP, comfMtxAnalysisP, stepOfSimulation, annualData, simStepPossible, occDataType, percentOrTotal, totalAble, lb_preparation):
     #Create a list to be filled with values of comfort.
     comfortFactorVals = []
@@ -188,35 +284,8 @@ def computeComfValues(comfResultsMtx, analysisP, comfMtxAnalysisP, stepOfSimulat
         #Get the HOYs of the analysis period
         HOYS, months, days = lb_preparation.getHOYsBasedOnPeriod(analysisP, 1)
         
-        #Pick out just the hours that are in the analysis period.
-        newcomfResultsMtx = []
-        for lineCount, line in enumerate(comfResultsMtx):
-            if lineCount in HOYS: newcomfResultsMtx.append(line)
-        
-        #Transpose the matrix
-        newcomfResultsMtx2 = zip(*newcomfResultsMtx)
-        
-        if percentOrTotal == False and totalAble == True:
-            for lineCount, line in enumerate(newcomfResultsMtx2):
-                comfortFactorVals.append(sum(line))
-        else:
-            #If the dataType is meant to be divided by occupie hours, recompute the occupied hours for the analysis period.
-            occMtxInit = []
-            for val in comfResultsMtx[1]: occMtxInit.append(0)
-            if occDataType == True:
-                for line in newcomfResultsMtx:
-                    for ptCt, pointVal in enumerate(line):
-                        if isinstance(pointVal, int): occMtxInit[ptCt] += 1
-            occMtx = [occMtxInit]
-            
-            #Compute the total percentage of comfortable hours.
-            if occDataType == False:
-                for lineCount, line in enumerate(newcomfResultsMtx2):
-                    comfortFactorVals.append(sum(line)/len(line))
-            else:
-                occMtx2 = zip(*occMtx)
-                for lineCount, line in enumerate(newcomfResultsMtx2):
-                    comfortFactorVals.append(sum(line)/occMtx2[lineCount][0])
+        #Sum the hours of the analysis period from the cumulative sums of each point.
+        comfortFactorVals = computePeriodValues(comfResultsMtx, HOYS, occDataType, percentOrTotal, totalAble)
     elif len(analysisP) > 0 and analysisP != comfMtxAnalysisP and annualData == False and simStepPossible == True:
         #Check the data anlysis period and subtract the start day from each of the HOYs.
         HOYS, months, days = lb_preparation.getHOYsBasedOnPeriod(analysisP, 1)
@@ -236,56 +305,11 @@ def computeComfValues(comfResultsMtx, analysisP, comfMtxAnalysisP, stepOfSimulat
             print warning
             ghenv.Component.AddRuntimeMessage(w, warning)
         else:
-            
-            #Pick out just the hours that are in the analysis period.
-            newcomfResultsMtx = []
-            for lineCount, line in enumerate(comfResultsMtx):
-                if lineCount in HOYS:
-                    newcomfResultsMtx.append(line)
-            
-            #Transpose the matrix
-            newcomfResultsMtx2 = zip(*newcomfResultsMtx)
-            
-            if percentOrTotal == False and totalAble == True:
-                for lineCount, line in enumerate(newcomfResultsMtx2):
-                    comfortFactorVals.append(sum(line))
-            else:
-                #If the dataType is meant to be divided by occupie hours, recompute the occupied hours for the analysis period.
-                occMtxInit = []
-                for val in comfResultsMtx[1]: occMtxInit.append(0)
-                if occDataType == True:
-                    for line in newcomfResultsMtx:
-                        for ptCt, pointVal in enumerate(line):
-                            if isinstance(pointVal, int): occMtxInit[ptCt] += 1
-                occMtx = [occMtxInit]
-                
-                #Compute the total percentage of comfortable hours.
-                if occDataType == False:
-                    for lineCount, line in enumerate(newcomfResultsMtx2):
-                        comfortFactorVals.append(sum(line)/len(line))
-                else:
-                    occMtx2 = zip(*occMtx)
-                    for lineCount, line in enumerate(newcomfResultsMtx2):
-                        comfortFactorVals.append(sum(line)/occMtx2[lineCount][0])
+            #Sum the hours of the analysis period from the cumulative sums of each point.
+            comfortFactorVals = computePeriodValues(comfResultsMtx, HOYS, occDataType, percentOrTotal, totalAble)
     else:
-        #Transpose the matrix
-        if occDataType == False: newcomfResultsMtx1 = comfResultsMtx[1:]
-        else: newcomfResultsMtx1 = comfResultsMtx[1:-1]
-        newcomfResultsMtx2 = zip(*newcomfResultsMtx1)
-        
-        if percentOrTotal == False and totalAble == True:
-            for lineCount, line in enumerate(newcomfResultsMtx2):
-                comfortFactorVals.append(sum(line))
-        else:
-            #Compute the average across the hours.
-            if occDataType == False:
-                for lineCount, line in enumerate(newcomfResultsMtx2):
-                    comfortFactorVals.append(sum(line)/len(line))
-            else:
-                occMtx = [comfResultsMtx[-1]]
-                occMtx2 = zip(*occMtx)
-                for lineCount, line in enumerate(newcomfResultsMtx2):
-                    comfortFactorVals.append(sum(line)/occMtx2[lineCount][0])
+        #Use all of the hours of the matrix.
+        comfortFactorVals = computePeriodValues(comfResultsMtx, range(1, len(comfResultsMtx)), occDataType, percentOrTotal, totalAble)
     
     
     return comfortFactorVals